@@ -0,0 +1,143 @@
+"""Struct-of-arrays deck for batched simulation.
+
+BatchDeck holds B independent decks as NumPy index arrays over a shared
+card-definition table (card.CARD_DEFS ids), and advances all of them with
+one vectorized operation per step. It follows the same rules as deck.Deck
+(draw from the top, reshuffle the discard pile when the draw pile runs
+out, burn the unplayed row) but is meant for bulk headless runs; the
+object-per-card Deck stays the interactive implementation.
+
+NumPy is only needed when this module is used.
+"""
+
+import numpy as np
+from card import CARD_DEFS
+from deck import Zone
+from vector_ai import STAT_COLUMNS, TYPE_CODES
+
+def def_stat_table(definitions=None):
+    """(D, 4) base stat vectors for definitions, indexed by CardDef id"""
+    definitions = CARD_DEFS if definitions is None else definitions
+    table = np.zeros((len(definitions), STAT_COLUMNS), dtype=np.int16)
+    for definition in definitions:
+        table[definition.id] = (max(1, definition.speed), max(0, definition.damage),
+                                max(1, definition.stability), TYPE_CODES[definition.type])
+    return table
+
+class BatchDeck:
+    def __init__(self, def_ids, rng=None, max_hand=8):
+        """def_ids: (B, N) CardDef ids, one row of N cards per fight.
+
+        rng is a numpy Generator (seeded per batch for reproducibility).
+        All cards start in the draw pile in the given order, top card last.
+        """
+        self.def_ids = np.array(def_ids, dtype=np.int32, ndmin=2)
+        self.batch, self.size = self.def_ids.shape
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.max_hand = max_hand
+        self._rows = np.arange(self.batch)
+
+        # zone[b, i] is the Zone of card i in fight b
+        self.zone = np.full((self.batch, self.size), Zone.DRAW, dtype=np.int8)
+        # Draw pile as card indices; pile[b, :pile_len[b]] is live, top at the end
+        self.pile = np.tile(np.arange(self.size, dtype=np.int32), (self.batch, 1))
+        self.pile_len = np.full(self.batch, self.size, dtype=np.int32)
+        # Hand as card indices, -1 for empty slots
+        self.hand = np.full((self.batch, max_hand), -1, dtype=np.int32)
+        self.hand_len = np.zeros(self.batch, dtype=np.int32)
+
+    @classmethod
+    def from_decks(cls, decks, rng=None, max_hand=8):
+        """Build from scalar Decks of equal size (their draw + discard cards)"""
+        def_ids = [[card.definition.id for card in deck.get_all_cards()] for deck in decks]
+        return cls(def_ids, rng, max_hand)
+
+    def _all(self, mask):
+        return np.ones(self.batch, dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+
+    def shuffle(self, mask=None):
+        """Shuffle the live draw pile of every fight in mask"""
+        rows = self._rows[self._all(mask)]
+        if not len(rows):
+            return
+        keys = self.rng.random((len(rows), self.size))
+        # Dead positions sort after the live pile
+        keys[np.arange(self.size) >= self.pile_len[rows, None]] = 2.0
+        order = np.argsort(keys, axis=1)
+        self.pile[rows] = np.take_along_axis(self.pile[rows], order, axis=1)
+
+    def _reshuffle_discard(self, mask):
+        """Move each masked fight's discard pile into its empty draw pile, shuffled"""
+        discarding = self.zone == Zone.DISCARD
+        rows = self._rows[mask & discarding.any(axis=1)]
+        if not len(rows):
+            return
+        keys = self.rng.random((len(rows), self.size))
+        keys[~discarding[rows]] = 2.0
+        # Sorting card positions by key gathers the discards, in random order, first
+        self.pile[rows] = np.argsort(keys, axis=1)
+        self.pile_len[rows] = discarding[rows].sum(axis=1)
+        self.zone[rows] = np.where(discarding[rows], Zone.DRAW, self.zone[rows])
+
+    def draw(self, count=1, mask=None):
+        """Draw up to count cards into the hand of every fight in mask"""
+        mask = self._all(mask)
+        for _ in range(count):
+            self._reshuffle_discard(mask & (self.pile_len == 0))
+            rows = self._rows[mask & (self.pile_len > 0) & (self.hand_len < self.max_hand)]
+            if not len(rows):
+                break
+            top = self.pile_len[rows] - 1
+            cards = self.pile[rows, top]
+            self.hand[rows, self.hand_len[rows]] = cards
+            self.zone[rows, cards] = Zone.HAND
+            self.pile_len[rows] = top
+            self.hand_len[rows] += 1
+
+    def burn_hand(self, mask=None):
+        """Burn every card in hand"""
+        mask = self._all(mask)
+        held = (self.hand >= 0) & mask[:, None]
+        rows, slots = np.nonzero(held)
+        self.zone[rows, self.hand[rows, slots]] = Zone.BURNED
+        self.hand[mask] = -1
+        self.hand_len[mask] = 0
+
+    def draw_row(self, size=4, mask=None):
+        """Burn the current row and draw a fresh one"""
+        self.burn_hand(mask)
+        self.draw(size, mask)
+
+    def discard_from_hand(self, slots):
+        """Discard the card in hand slot slots[b] for each fight (-1 skips).
+
+        Like Deck.discard, the last card of the row moves into the freed slot.
+        """
+        slots = np.asarray(slots, dtype=np.int32)
+        rows = self._rows[(slots >= 0) & (slots < self.hand_len)]
+        if not len(rows):
+            return
+        slot = slots[rows]
+        last = self.hand_len[rows] - 1
+        self.zone[rows, self.hand[rows, slot]] = Zone.DISCARD
+        self.hand[rows, slot] = self.hand[rows, last]
+        self.hand[rows, last] = -1
+        self.hand_len[rows] = last
+
+    def hand_def_ids(self):
+        """(B, max_hand) CardDef ids of the current rows, -1 for empty slots"""
+        ids = np.take_along_axis(self.def_ids, np.maximum(self.hand, 0), axis=1)
+        return np.where(self.hand >= 0, ids, -1)
+
+    def hand_stats(self, stat_table, width=4):
+        """(B, width, 4) base stat vectors of the rows plus a validity mask"""
+        ids = self.hand_def_ids()[:, :width]
+        mask = ids >= 0
+        stats = stat_table[np.maximum(ids, 0)]
+        stats[~mask] = 0
+        return stats, mask
+
+    def zone_counts(self):
+        """(B, 4) card counts in the draw, hand, discard and burned zones"""
+        return np.stack([(self.zone == zone).sum(axis=1)
+                         for zone in (Zone.DRAW, Zone.HAND, Zone.DISCARD, Zone.BURNED)], axis=1)
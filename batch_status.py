@@ -0,0 +1,56 @@
+"""Status effects for batched simulation.
+
+BatchStatusEffects holds the status slots of B combatants (one per
+fight) as (B, len(Status)) NumPy arrays and follows the same rules as
+status.StatusEffects: applying a status replaces the active one, and
+ticking deals bleed damage and counts every active status down a beat.
+
+NumPy is only needed when this module is used.
+"""
+
+import numpy as np
+from status import STATUSES, Status, StatusEffects
+
+class BatchStatusEffects:
+    def __init__(self, batch):
+        self.batch = batch
+        self.amount = np.zeros((batch, len(STATUSES)), dtype=np.int16)
+        self.duration = np.zeros((batch, len(STATUSES)), dtype=np.int16)
+
+    @classmethod
+    def from_effects(cls, effects):
+        """Stack a list of StatusEffects"""
+        batch = cls(len(effects))
+        for row, single in enumerate(effects):
+            batch.amount[row] = single.amount
+            batch.duration[row] = single.duration
+        return batch
+
+    def row(self, index):
+        """One combatant's statuses as a StatusEffects"""
+        effects = StatusEffects()
+        effects.amount = self.amount[index].tolist()
+        effects.duration = self.duration[index].tolist()
+        return effects
+
+    def add(self, status, amount, duration, mask=None):
+        """Apply a status in the fights selected by mask (all by default).
+
+        amount and duration are scalars or (B,) arrays.
+        """
+        if mask is None:
+            mask = np.ones(self.batch, dtype=bool)
+        self.amount[mask, status] = np.broadcast_to(amount, self.batch)[mask]
+        self.duration[mask, status] = np.broadcast_to(duration, self.batch)[mask]
+
+    def get(self, status):
+        """(B,) amounts of a status, 0 where it isn't active"""
+        return np.where(self.duration[:, status] > 0, self.amount[:, status], 0)
+
+    def tick(self):
+        """End of beat for every fight; returns the (B,) bleed damage to take"""
+        damage = self.get(Status.BLEED)
+        active = self.duration > 0
+        self.duration[active] -= 1
+        self.amount[active & (self.duration == 0)] = 0
+        return damage
@@ -1,5 +1,7 @@
-from enum import Enum
-import pygame
+import re
+from enum import Enum, IntEnum
+from cache import LRUCache
+from text_render import get_text_renderer
 
 class CardType(Enum):
     ATTACK = "Attack"
@@ -11,19 +13,185 @@ class CardType(Enum):
     PREP = "Prep"
     SKILL = "Skill"
 
+class EffectOp(IntEnum):
+    """Opcodes for compiled card text; each op is a tuple (opcode, args...)"""
+    # Effect line
+    GUARD = 1           # (GUARD, amount) - prevent damage this beat
+    STUN = 2            # (STUN,) - grapple stuns the foe
+    HEAL = 3            # (HEAL, amount)
+    BLEED = 4           # (BLEED, amount, beats)
+    # Read line
+    READ_DAMAGE = 10    # (READ_DAMAGE, amount)
+    READ_SPEED = 11     # (READ_SPEED, amount)
+    READ_BLEED = 12     # (READ_BLEED, amount)
+    # Clash line
+    CLASH_DAMAGE = 20   # (CLASH_DAMAGE, amount) - both sides take damage
+
+DEFAULT_BLEED_BEATS = 2
+DEFAULT_HEAL = 2
+
+_PREVENT_RE = re.compile(r'prevent\s+(\d+)')
+_BLEED_RE = re.compile(r'bleed\s+(\d+)(?:\s*\((\d+) beats?\))?')
+_HEAL_RE = re.compile(r'heal\s+(\d+)')
+_READ_BLEED_RE = re.compile(r'\+bleed\s*(\d+)')
+_CLASH_RE = re.compile(r'both take (\d+)')
+
+def compile_effect(card_type, text):
+    """Compile an effect line into a tuple of ops, in resolution order"""
+    text = text.lower()
+    ops = []
+    
+    # Guard cards always grant guard, even without an explicit amount
+    guard_match = _PREVENT_RE.search(text)
+    if card_type == CardType.GUARD or guard_match:
+        ops.append((EffectOp.GUARD, int(guard_match.group(1)) if guard_match else 0))
+    
+    if card_type == CardType.GRAPPLE:
+        ops.append((EffectOp.STUN,))
+    
+    if card_type == CardType.PREP and "heal" in text:
+        heal_match = _HEAL_RE.search(text)
+        ops.append((EffectOp.HEAL, int(heal_match.group(1)) if heal_match else DEFAULT_HEAL))
+    
+    bleed_match = _BLEED_RE.search(text)
+    if bleed_match:
+        beats = int(bleed_match.group(2)) if bleed_match.group(2) else DEFAULT_BLEED_BEATS
+        ops.append((EffectOp.BLEED, int(bleed_match.group(1)), beats))
+    
+    return tuple(ops)
+
+def compile_read(text):
+    """Compile a Read line into a tuple of ops"""
+    ops = []
+    if "+1 dmg" in text:
+        ops.append((EffectOp.READ_DAMAGE, 1))
+    if "+1 Speed" in text:
+        ops.append((EffectOp.READ_SPEED, 1))
+    if "+Bleed" in text:
+        bleed_match = _READ_BLEED_RE.search(text.lower())
+        ops.append((EffectOp.READ_BLEED, int(bleed_match.group(1)) if bleed_match else 1))
+    return tuple(ops)
+
+def compile_clash(text):
+    """Compile a Clash line into a tuple of ops"""
+    match = _CLASH_RE.search(text.lower())
+    if match:
+        return ((EffectOp.CLASH_DAMAGE, int(match.group(1))),)
+    return ()
+
+class CardDef:
+    """Immutable definition of a card, shared by every copy of it.
+
+    Definitions are interned through define_card, so identical cards
+    (e.g. the 2-3 copies in a starter or enemy deck) share one object
+    holding the strings, base stats and compiled rules text.
+    """
+    __slots__ = ("id", "name", "type", "speed", "damage", "stability", "effect", "read", "clash",
+                 "effect_ops", "read_ops", "clash_ops", "ignores_guard")
+
+    def __init__(self, def_id, name, card_type, speed, damage, stability, effect, read, clash):
+        fields = {
+            "id": def_id,
+            "name": name,
+            "type": card_type,
+            "speed": speed,
+            "damage": damage,
+            "stability": stability,
+            "effect": effect,
+            "read": read,
+            "clash": clash,
+            # Rules text compiled once; combat runs these instead of the strings
+            "effect_ops": compile_effect(card_type, effect),
+            "read_ops": compile_read(read),
+            "clash_ops": compile_clash(clash),
+            "ignores_guard": "ignore guard" in effect.lower(),
+        }
+        for field, value in fields.items():
+            object.__setattr__(self, field, value)
+
+    def __setattr__(self, field, value):
+        raise AttributeError("CardDef is immutable")
+
+    def key(self):
+        """The constructor arguments that identify this definition"""
+        return (self.name, self.type, self.speed, self.damage, self.stability,
+                self.effect, self.read, self.clash)
+
+    def __reduce__(self):
+        # Re-intern on unpickle so worker processes share definitions too
+        return (define_card, self.key())
+
+    def __repr__(self):
+        return f"CardDef({self.id}, {self.name!r})"
+
+# Registry of every definition; a definition's id is its index here
+CARD_DEFS = []
+_DEFS_BY_KEY = {}
+
+# Callables that define a fixed card list, run just before the first new
+# definition so their cards always take the lowest ids (see add_card_source)
+_CARD_SOURCES = []
+
+def add_card_source(register):
+    """Queue register() to define its cards ahead of any other new definition.
+
+    Modules with a static card list use this instead of defining the cards
+    at import: nothing is built until a card is needed, and ids (and so the
+    row order the AI solvers see) don't depend on which card comes first.
+    """
+    _CARD_SOURCES.append(register)
+
+def register_pending_cards():
+    """Run the queued card sources, in the order they were added"""
+    while _CARD_SOURCES:
+        _CARD_SOURCES.pop(0)()
+
+def define_card(name, card_type, speed, damage, stability, effect="", read="", clash=""):
+    """Get the shared CardDef for these stats, registering it on first use"""
+    key = (name, card_type, speed, damage, stability, effect, read, clash)
+    definition = _DEFS_BY_KEY.get(key)
+    if definition is None and _CARD_SOURCES:
+        register_pending_cards()
+        definition = _DEFS_BY_KEY.get(key)
+    if definition is None:
+        definition = CardDef(len(CARD_DEFS), *key)
+        CARD_DEFS.append(definition)
+        _DEFS_BY_KEY[key] = definition
+    return definition
+
+def get_card_def(def_id):
+    """Look up a definition by id"""
+    return CARD_DEFS[def_id]
+
+# Composed card images keyed by visible state (see Card.draw)
+CARD_SURFACE_CACHE = LRUCache(maxsize=128)
+
+class CardView:
+    """UI-only state of a card copy, created the first time it is drawn"""
+    __slots__ = ("rect", "selected", "highlighted")
+
+    def __init__(self):
+        self.rect = None
+        self.selected = False
+        self.highlighted = False
+
 class Card:
+    """One copy of a card: a shared CardDef plus this copy's runtime state"""
+    __slots__ = ("definition", "speed_modifier", "damage_modifier", "stability_modifier",
+                 "stunned", "read_triggered", "handle", "_view")
+
     def __init__(self, name, card_type, speed, damage, stability, effect="", read="", clash=""):
-        self.name = name
-        self.type = card_type
-        self.speed = speed
-        self.base_speed = speed
-        self.damage = damage
-        self.base_damage = damage
-        self.stability = stability
-        self.base_stability = stability
-        self.effect = effect
-        self.read = read
-        self.clash = clash
+        self._init_state(define_card(name, card_type, speed, damage, stability, effect, read, clash))
+
+    @classmethod
+    def from_def(cls, definition):
+        """Create a new copy of a registered definition"""
+        card = cls.__new__(cls)
+        card._init_state(definition)
+        return card
+
+    def _init_state(self, definition):
+        self.definition = definition
         
         # Runtime modifiers
         self.speed_modifier = 0
@@ -31,33 +199,124 @@ class Card:
         self.stability_modifier = 0
         self.stunned = False
         self.read_triggered = False
+        self.handle = None  # Index in the owning Deck, assigned when the card joins one
         
-        # Visual properties
-        self.rect = None
-        self.selected = False
-        self.highlighted = False
+        # Visual properties live in a CardView, only for cards that get drawn
+        self._view = None
+    
+    # Definition fields
+    @property
+    def name(self):
+        return self.definition.name
+    
+    @property
+    def type(self):
+        return self.definition.type
+    
+    @property
+    def base_speed(self):
+        return self.definition.speed
+    
+    @property
+    def base_damage(self):
+        return self.definition.damage
+    
+    @property
+    def base_stability(self):
+        return self.definition.stability
+    
+    speed = base_speed
+    damage = base_damage
+    stability = base_stability
+    
+    @property
+    def effect(self):
+        return self.definition.effect
+    
+    @property
+    def read(self):
+        return self.definition.read
+    
+    @property
+    def clash(self):
+        return self.definition.clash
+    
+    @property
+    def effect_ops(self):
+        return self.definition.effect_ops
+    
+    @property
+    def read_ops(self):
+        return self.definition.read_ops
+    
+    @property
+    def clash_ops(self):
+        return self.definition.clash_ops
+    
+    @property
+    def ignores_guard(self):
+        return self.definition.ignores_guard
+    
+    # UI state
+    @property
+    def view(self):
+        if self._view is None:
+            self._view = CardView()
+        return self._view
+    
+    @property
+    def rect(self):
+        return self._view.rect if self._view is not None else None
+    
+    @rect.setter
+    def rect(self, value):
+        self.view.rect = value
+    
+    @property
+    def selected(self):
+        return self._view is not None and self._view.selected
+    
+    @selected.setter
+    def selected(self, value):
+        self.view.selected = value
+    
+    @property
+    def highlighted(self):
+        return self._view is not None and self._view.highlighted
+    
+    @highlighted.setter
+    def highlighted(self, value):
+        self.view.highlighted = value
     
     def get_effective_speed(self):
-        return max(1, self.base_speed + self.speed_modifier)
+        return max(1, self.definition.speed + self.speed_modifier)
     
     def get_effective_damage(self):
-        return max(0, self.base_damage + self.damage_modifier)
+        return max(0, self.definition.damage + self.damage_modifier)
     
     def get_effective_stability(self):
-        return max(1, self.base_stability + self.stability_modifier)
+        return max(1, self.definition.stability + self.stability_modifier)
     
     def apply_read_bonus(self):
-        """Apply the read bonus if prediction was correct"""
+        """Apply the read bonus if prediction was correct.
+
+        Damage and speed bonuses modify this card; a bleed bonus goes to
+        the target when the card resolves (see read_bleed).
+        """
         if not self.read_triggered and self.read:
-            if "+1 dmg" in self.read:
-                self.damage_modifier += 1
-            if "+1 Speed" in self.read:
-                self.speed_modifier += 1
-            if "+Bleed" in self.read:
-                # Handle bleed bonus (implementation depends on status system)
-                pass
+            for op in self.read_ops:
+                if op[0] == EffectOp.READ_DAMAGE:
+                    self.damage_modifier += op[1]
+                elif op[0] == EffectOp.READ_SPEED:
+                    self.speed_modifier += op[1]
             self.read_triggered = True
     
+    def read_bleed(self):
+        """Extra bleed this card applies once its read bonus has triggered"""
+        if not self.read_triggered:
+            return 0
+        return sum(op[1] for op in self.read_ops if op[0] == EffectOp.READ_BLEED)
+    
     def reset_modifiers(self):
         """Reset all temporary modifiers"""
         self.speed_modifier = 0
@@ -89,16 +348,35 @@ class Card:
         return colors.get(self.type, (128, 128, 128))
     
     def draw(self, surface, x, y, width, height, font, selected=False, highlighted=False):
-        """Draw the card on the surface"""
+        """Draw the card on the surface.
+
+        Fully composed card images are cached by everything that is
+        visible on them, so an unchanged card costs a single blit.
+        """
+        import pygame  # Imported lazily so headless combat never loads SDL
+
+        key = (self.definition.id, self.get_effective_speed(),
+               self.get_effective_damage(), self.get_effective_stability(),
+               selected, highlighted, width, height, font)
+        image = CARD_SURFACE_CACHE.get(key)
+        if image is None:
+            image = self._compose(width, height, font, selected, highlighted)
+            CARD_SURFACE_CACHE.put(key, image)
+
+        self.rect = pygame.Rect(x, y, width, height)
+        surface.blit(image, self.rect)
+
+    def _compose(self, width, height, font, selected, highlighted):
+        """Render the complete card image at the origin"""
+        import pygame
+        renderer = get_text_renderer()
+
         # Basic background with type tint
-        bg = pygame.Surface((width, height), pygame.SRCALPHA)
-        bg.fill((245, 245, 245))
+        image = pygame.Surface((width, height), pygame.SRCALPHA)
+        image.fill((245, 245, 245))
         tint = pygame.Surface((width, height), pygame.SRCALPHA)
         tint.fill(self.get_type_color() + (60,))
-        bg.blit(tint, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
-
-        self.rect = pygame.Rect(x, y, width, height)
-        surface.blit(bg, self.rect)
+        image.blit(tint, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
 
         # Border to show selection/highlight
         border_color = (255, 255, 255)
@@ -106,67 +384,73 @@ class Card:
             border_color = (255, 215, 0)  # Gold when selected
         elif highlighted:
             border_color = (255, 255, 0)  # Yellow when predicting
-        pygame.draw.rect(surface, border_color, self.rect, 4)
+        pygame.draw.rect(image, border_color, image.get_rect(), 4)
 
         # Use a larger font for the card name
-        name_font = pygame.font.Font(None, font.get_height() + 8)
-        name_text = name_font.render(self.name, True, (0, 0, 0))
-        text_rect = name_text.get_rect(centerx=x + width//2, top=y + 15)
-        surface.blit(name_text, text_rect)
+        name_font = renderer.font(font.get_height() + 8)
+        name_text = renderer.render(self.name, name_font, (0, 0, 0))
+        text_rect = name_text.get_rect(centerx=width//2, top=15)
+        image.blit(name_text, text_rect)
 
         # Body font for stats and effects
         body_font = font
 
         # Speed indicator
-        speed_text = body_font.render(f"S{self.get_effective_speed()}", True, (0, 0, 0))
-        surface.blit(speed_text, (x + 10, y + 15))
+        speed_text = renderer.render(f"S{self.get_effective_speed()}", body_font, (0, 0, 0))
+        image.blit(speed_text, (10, 15))
 
         # Damage (if any)
         if self.get_effective_damage() > 0:
-            dmg_text = body_font.render(f"{self.get_effective_damage()}", True, (0, 0, 0))
-            surface.blit(dmg_text, (x + width - dmg_text.get_width() - 10, y + 15))
+            dmg_text = renderer.render(f"{self.get_effective_damage()}", body_font, (0, 0, 0))
+            image.blit(dmg_text, (width - dmg_text.get_width() - 10, 15))
 
         # Stability
-        stab_text = body_font.render(f"Stab{self.get_effective_stability()}", True, (0, 0, 0))
-        surface.blit(stab_text, (x + 10, y + height - stab_text.get_height() - 10))
+        stab_text = renderer.render(f"Stab{self.get_effective_stability()}", body_font, (0, 0, 0))
+        image.blit(stab_text, (10, height - stab_text.get_height() - 10))
 
         # Type
-        type_text = body_font.render(self.type.value, True, (0, 0, 0))
-        type_rect = type_text.get_rect(centerx=x + width//2, y=y + 60)
-        surface.blit(type_text, type_rect)
+        type_text = renderer.render(self.type.value, body_font, (0, 0, 0))
+        type_rect = type_text.get_rect(centerx=width//2, y=60)
+        image.blit(type_text, type_rect)
 
         # Effect (truncated if too long)
         if self.effect:
             effect_lines = self.wrap_text(self.effect, body_font, width - 20)
             for i, line in enumerate(effect_lines[:3]):  # Max 3 lines
-                effect_text = body_font.render(line, True, (0, 0, 0))
-                surface.blit(effect_text, (x + 10, y + 100 + i * 20))
+                effect_text = renderer.render(line, body_font, (0, 0, 0))
+                image.blit(effect_text, (10, 100 + i * 20))
+
+        # The finished card is opaque; match the display format for fast blits
+        if pygame.display.get_surface() is not None:
+            image = image.convert()
+        return image
     
     def wrap_text(self, text, font, max_width):
         """Wrap text to fit within max_width"""
-        words = text.split()
-        lines = []
-        current_line = ""
-        
-        for word in words:
-            test_line = current_line + (" " if current_line else "") + word
-            if font.size(test_line)[0] <= max_width:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word
-        
-        if current_line:
-            lines.append(current_line)
-        
-        return lines
+        return list(get_text_renderer().wrap(text, font, max_width))
     
     def contains_point(self, point):
         """Check if point is within the card's rect"""
         return self.rect and self.rect.collidepoint(point)
     
     def copy(self):
-        """Create a copy of this card"""
-        return Card(self.name, self.type, self.base_speed, self.base_damage,
-                    self.base_stability, self.effect, self.read, self.clash)
+        """Create a fresh copy of this card (sharing its definition)"""
+        return Card.from_def(self.definition)
+
+    def clone(self):
+        """Copy of this card with its runtime modifiers and handle (for copy-on-write decks)"""
+        card = Card.__new__(Card)
+        card.definition = self.definition
+        card.speed_modifier = self.speed_modifier
+        card.damage_modifier = self.damage_modifier
+        card.stability_modifier = self.stability_modifier
+        card.stunned = self.stunned
+        card.read_triggered = self.read_triggered
+        card.handle = self.handle
+        card._view = None
+        return card
+
+    def is_modified(self):
+        """Whether any runtime modifier differs from a fresh copy"""
+        return bool(self.speed_modifier or self.damage_modifier or self.stability_modifier
+                    or self.stunned or self.read_triggered)
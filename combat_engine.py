@@ -0,0 +1,412 @@
+"""Headless combat rules.
+
+CombatEngine owns all beat resolution state and logic and never touches
+pygame, so fights can be resolved on machines without SDL. The pygame
+Combat screen in combat.py is a thin adapter over it.
+"""
+
+import random
+from enum import Enum
+from card import DEFAULT_BLEED_BEATS, CardType, EffectOp
+from status import Status, StatusEffects
+
+class CombatPhase(Enum):
+    SHOW = 1      # Drawing cards face-up
+    SCHEME = 2    # Player selecting card and prediction
+    COMMIT = 3    # Enemy AI choosing
+    REVEAL = 4    # Showing choices and resolving
+    CLEANUP = 5   # End of beat effects
+
+class CombatEngine:
+    def __init__(self, player_deck, enemy):
+        self.player_deck = player_deck
+        self.enemy = enemy
+        self.phase = CombatPhase.SHOW
+
+        # Player state
+        self.player_hp = 75
+        self.player_max_hp = 75
+        self.player_focus = 0
+        self.player_guard = 0
+        self.player_status_effects = StatusEffects()
+
+        # Beat state
+        self.player_selected_card = None
+        self.player_selected_slot = None  # Row slot of the card as committed (before any Feint swap)
+        self.player_prediction_slot = None  # 0-3 for enemy slots A-D
+        self.enemy_chosen_card = None
+        self.enemy_chosen_slot = None
+
+        # Resolution state
+        self.resolution_log = []
+        self.beat_number = 1
+        self.read_correct = False
+        self.resolution_order = None  # "player", "enemy" or "clash" once resolved
+        self.player_stunned = False
+        self.beat_start_hp = (self.player_hp, enemy.hp)
+
+        # Observers (e.g. telemetry.BeatLogWriter) notified with
+        # on_beat_resolved(engine) after the reveal and on_beat_end(engine)
+        # after end-of-beat effects
+        self.listeners = []
+
+        # Start first beat
+        self._start_new_beat()
+
+    def fork(self, rng=None):
+        """Independent copy of this fight for lookahead search.
+
+        Both decks are forked copy-on-write and card definitions are never
+        copied, so the cost is a few attribute copies plus whatever the
+        fork (or this engine) later changes. The fork has no listeners.
+        Its random draws (enemy AI, reshuffles) come from rng when given;
+        otherwise from copies of the current streams, so a fork fed the
+        same inputs plays out exactly like this engine would.
+        """
+        copies = {}
+
+        def stream(source):
+            if rng is not None:
+                return rng
+            if not isinstance(source, random.Random):
+                return source  # The global random module can't be copied
+            copy = copies.get(id(source))
+            if copy is None:
+                copy = copies[id(source)] = random.Random.__new__(random.Random)
+                copy.setstate(source.getstate())
+            return copy
+
+        engine = CombatEngine.__new__(CombatEngine)
+        engine.__dict__.update(self.__dict__)
+        engine.player_deck = self.player_deck.fork(stream(self.player_deck.rng))
+        enemy_deck = self.enemy.deck.fork(stream(self.enemy.deck.rng))
+        engine.enemy = self.enemy.fork(enemy_deck, stream(self.enemy.rng))
+        engine.player_status_effects = self.player_status_effects.copy()
+        engine.resolution_log = list(self.resolution_log)
+        engine.listeners = []
+        return engine
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self.listeners.remove(listener)
+
+    def step(self, player_card, prediction_slot):
+        """Play a full beat headlessly: commit, resolve and clean up.
+
+        Returns the combat outcome ("victory", "defeat") or None if the
+        fight continues.
+        """
+        self.select_card(player_card)
+        self.predict(prediction_slot)
+        self.commit()
+        self.cleanup()
+        return self.outcome
+
+    def select_card(self, card):
+        """Choose the player's card for this beat"""
+        if self.phase == CombatPhase.SCHEME:
+            self.player_selected_card = card
+
+    def predict(self, slot):
+        """Place the player's prediction on an enemy slot (0-3)"""
+        if self.phase == CombatPhase.SCHEME:
+            self.player_prediction_slot = slot
+
+    def can_commit(self):
+        """Check if the player has picked both a card and a prediction"""
+        return (self.phase == CombatPhase.SCHEME and self.player_selected_card is not None
+                and self.player_prediction_slot is not None)
+
+    def commit(self):
+        """Move to commit phase - enemy AI chooses, then the beat resolves"""
+        self.phase = CombatPhase.COMMIT
+        if self.player_selected_card:
+            self.player_selected_slot = self.player_deck.hand_slot(self.player_selected_card)
+
+        # Enemy AI chooses card
+        self.enemy_chosen_card = self.enemy.choose_card(self.player_deck.hand)
+        if self.enemy_chosen_card:
+            self.enemy_chosen_slot = self.enemy.deck.hand_slot(self.enemy_chosen_card)
+
+        self.phase = CombatPhase.REVEAL
+        self._resolve_beat()
+        for listener in self.listeners:
+            listener.on_beat_resolved(self)
+
+    def cleanup(self):
+        """Clean up after beat resolution"""
+        self.phase = CombatPhase.CLEANUP
+
+        # Discard played cards
+        if self.player_selected_card:
+            self.player_deck.discard(self.player_selected_card)
+        if self.enemy_chosen_card:
+            self.enemy.deck.discard(self.enemy_chosen_card)
+
+        # Burn remaining cards
+        self.player_deck.burn_hand()
+        self.enemy.deck.burn_hand()
+
+        # Apply status effects
+        self._apply_end_beat_status_effects()
+        for listener in self.listeners:
+            listener.on_beat_end(self)
+
+        # Check win/loss conditions
+        if self.player_hp <= 0:
+            self.resolution_log.append("DEFEAT!")
+            return
+        elif self.enemy.hp <= 0:
+            self.resolution_log.append("VICTORY!")
+            return
+
+        # Start next beat
+        self.beat_number += 1
+        self._start_new_beat()
+
+    @property
+    def outcome(self):
+        """"victory" or "defeat" once the fight is over, otherwise None"""
+        if self.player_hp <= 0:
+            return "defeat"
+        if self.enemy.hp <= 0:
+            return "victory"
+        return None
+
+    def is_over(self):
+        """Check if either side has been defeated"""
+        return self.outcome is not None
+
+    def _start_new_beat(self):
+        """Start a new combat beat"""
+        self.phase = CombatPhase.SHOW
+
+        # Reset beat effects
+        self.player_guard = 0
+        self.enemy.reset_beat_effects()
+
+        # Draw new rows
+        self.player_deck.draw_row(4)
+        self.enemy.deck.draw_row(4)
+
+        # Clear selections
+        self.player_selected_card = None
+        self.player_selected_slot = None
+        self.player_prediction_slot = None
+        self.enemy_chosen_card = None
+        self.enemy_chosen_slot = None
+        self.read_correct = False
+        self.resolution_order = None
+        self.player_stunned = False
+        self.beat_start_hp = (self.player_hp, self.enemy.hp)
+
+        # Clear resolution log
+        self.resolution_log.clear()
+
+        self.phase = CombatPhase.SCHEME
+
+    def _resolve_beat(self):
+        """Resolve the combat beat"""
+        if not self.player_selected_card or not self.enemy_chosen_card:
+            return
+
+        # Check for correct prediction
+        read_bonus = False
+        if self.player_prediction_slot == self.enemy_chosen_slot:
+            read_bonus = True
+            self.read_correct = True
+            self.player_selected_card = self.player_deck.own(self.player_selected_card)
+            self.player_selected_card.apply_read_bonus()
+            self.resolution_log.append("✓ Correct prediction! Read bonus applied.")
+        else:
+            self.resolution_log.append("✗ Incorrect prediction.")
+
+        # Apply Feint swaps first (before speed comparison)
+        self._handle_feints()
+
+        # Determine resolution order by speed
+        player_speed = self.player_selected_card.get_effective_speed()
+        enemy_speed = self.enemy_chosen_card.get_effective_speed()
+
+        if player_speed > enemy_speed:
+            self.resolution_order = "player"
+            self._resolve_card_effects(True)  # Player first
+        elif enemy_speed > player_speed:
+            self.resolution_order = "enemy"
+            self._resolve_card_effects(False)  # Enemy first
+        else:
+            # Speed tie - handle clash
+            self.resolution_order = "clash"
+            self._resolve_clash()
+
+    def _handle_feints(self):
+        """Handle Feint card swaps"""
+        if self.player_selected_card.name == "Feint":
+            # Allow player to swap with an unplayed card (simplified for now)
+            unplayed = [c for c in self.player_deck.hand if c != self.player_selected_card]
+            if unplayed:
+                # For now, just swap with first unplayed card
+                swap_card = self.player_deck.own(unplayed[0])
+                self.player_selected_card = swap_card
+                swap_card.speed_modifier = max(0, 5 - swap_card.base_speed)  # Resolves at S5
+                self.resolution_log.append(f"Feint: Swapped to {swap_card.name} (S5)")
+
+    def _resolve_card_effects(self, player_first):
+        """Resolve card effects in speed order"""
+        if player_first:
+            self._resolve_player_card()
+            if not self.enemy.stunned:
+                self._resolve_enemy_card()
+        else:
+            self._resolve_enemy_card()
+            if not self._is_player_stunned():
+                self._resolve_player_card()
+
+    def _resolve_player_card(self):
+        """Resolve player's selected card"""
+        card = self.player_selected_card
+
+        # Check if card can counter/intercept enemy
+        if card.type == CardType.COUNTER and self.enemy_chosen_card.type == CardType.ATTACK:
+            if card.get_effective_speed() >= self.enemy_chosen_card.get_effective_speed():
+                self.enemy.stunned = True
+                self.resolution_log.append(f"Counter: {card.name} cancels {self.enemy_chosen_card.name}")
+
+        if card.type == CardType.DODGE:
+            if self.enemy_chosen_card.type in [CardType.ATTACK, CardType.GRAPPLE]:
+                self.resolution_log.append(f"Dodge: {card.name} avoids {self.enemy_chosen_card.name}")
+                return  # Dodge successful, no damage taken
+
+        # Apply card effects
+        damage = card.get_effective_damage()
+        if damage > 0:
+            if card.ignores_guard:
+                self.enemy.hp = max(0, self.enemy.hp - damage)
+                actual_damage = damage
+                self.resolution_log.append(f"Player deals {actual_damage} damage (ignores guard)")
+            else:
+                actual_damage = self.enemy.take_damage(damage)
+                self.resolution_log.append(f"Player deals {actual_damage} damage")
+
+            # Check if damage stuns enemy
+            if actual_damage >= self.enemy_chosen_card.get_effective_stability():
+                self.enemy.stunned = True
+                self.resolution_log.append("Enemy stunned!")
+
+        # Handle special effects
+        self._apply_card_special_effects(card, True)
+
+    def _resolve_enemy_card(self):
+        """Resolve enemy's chosen card"""
+        card = self.enemy_chosen_card
+
+        # Apply card effects
+        damage = card.get_effective_damage()
+        if damage > 0:
+            ignore_guard = card.ignores_guard
+            if not ignore_guard and self.player_guard > 0:
+                blocked = min(self.player_guard, damage)
+                damage -= blocked
+                self.player_guard -= blocked
+                if blocked > 0:
+                    self.resolution_log.append(f"Blocked {blocked} damage")
+
+            if damage > 0:
+                self.player_hp -= damage
+                self.player_hp = max(0, self.player_hp)
+                if ignore_guard:
+                    self.resolution_log.append(f"Enemy deals {damage} damage (ignores guard)")
+                else:
+                    self.resolution_log.append(f"Enemy deals {damage} damage")
+
+                # Check if damage stuns player
+                if damage >= self.player_selected_card.get_effective_stability():
+                    self.player_stunned = True
+                    self.resolution_log.append("Player stunned!")
+
+        # Handle special effects
+        self._apply_card_special_effects(card, False)
+
+    def _apply_card_special_effects(self, card, is_player):
+        """Apply special card effects beyond basic damage"""
+        read_bleed = card.read_bleed()
+        for op in card.effect_ops:
+            code = op[0]
+
+            # Guard or Prevent
+            if code == EffectOp.GUARD:
+                guard_amount = op[1]
+                if is_player:
+                    self.player_guard += guard_amount
+                    self.resolution_log.append(f"Player gains {guard_amount} guard")
+                else:
+                    self.enemy.add_guard(guard_amount)
+                    self.resolution_log.append(f"Enemy gains {guard_amount} guard")
+
+            # Grapple always stuns
+            elif code == EffectOp.STUN:
+                if is_player:
+                    self.enemy.stunned = True
+                    self.resolution_log.append("Grapple: Enemy stunned")
+                else:
+                    self.player_stunned = True
+                    self.resolution_log.append("Grapple: Player stunned")
+
+            # Simple healing prep cards
+            elif code == EffectOp.HEAL:
+                heal_amount = op[1]
+                if is_player:
+                    self.player_hp = min(self.player_max_hp, self.player_hp + heal_amount)
+                    self.resolution_log.append(f"Player heals {heal_amount} HP")
+                else:
+                    self.enemy.heal(heal_amount)
+                    self.resolution_log.append(f"Enemy heals {heal_amount} HP")
+
+            # Bleed effects, raised by a bleed read bonus
+            elif code == EffectOp.BLEED:
+                self._apply_bleed(op[1] + read_bleed, op[2], is_player)
+                read_bleed = 0
+
+        # A bleed read bonus on a card without its own bleed
+        if read_bleed:
+            self._apply_bleed(read_bleed, DEFAULT_BLEED_BEATS, is_player)
+
+    def _apply_bleed(self, amount, duration, is_player):
+        """Bleed the side the card's owner targets"""
+        if is_player:
+            self.enemy.add_status_effect(Status.BLEED, amount, duration)
+            self.resolution_log.append(f"Enemy gains Bleed {amount}")
+        else:
+            self.player_status_effects.add(Status.BLEED, amount, duration)
+            self.resolution_log.append(f"Player gains Bleed {amount}")
+
+    def _resolve_clash(self):
+        """Handle speed tie with clash rules"""
+        for op in self.player_selected_card.clash_ops:
+            if op[0] == EffectOp.CLASH_DAMAGE:
+                clash_damage = op[1]
+                self.player_hp -= clash_damage
+                self.enemy.take_damage(clash_damage)
+                self.resolution_log.append(f"Clash: Both take {clash_damage} damage")
+
+        # Both cards still resolve their effects
+        self._resolve_player_card()
+        self._resolve_enemy_card()
+
+    def _is_player_stunned(self):
+        """Whether the enemy's card stunned the player this beat"""
+        return self.player_stunned
+
+    def _apply_end_beat_status_effects(self):
+        """Apply status effects at end of beat"""
+        # Both sides tick the same way; bleed isn't blocked by guard
+        bleed_dmg = self.player_status_effects.tick()
+        if bleed_dmg:
+            self.player_hp = max(0, self.player_hp - bleed_dmg)
+            self.resolution_log.append(f"Player bleeds for {bleed_dmg}")
+
+        bleed_dmg = self.enemy.apply_status_effects()
+        if bleed_dmg:
+            self.resolution_log.append(f"Enemy bleeds for {bleed_dmg}")
@@ -1,118 +1,330 @@
 import random
-from collections import deque
+from enum import IntEnum
+
+class Zone(IntEnum):
+    DRAW = 0
+    HAND = 1
+    DISCARD = 2
+    BURNED = 3
+    REMOVED = 4  # Taken out of the deck for good (card removal)
+
+# Zones whose order matters (see Deck)
+_ORDERED_ZONES = (Zone.DRAW, Zone.DISCARD)
 
 class Deck:
-    def __init__(self, cards=None):
-        self.cards = list(cards) if cards else []
+    """A combatant's cards, split into draw pile, hand, discard and burned zones.
+
+    Each card gets a handle (its index in this deck) when it joins. The deck
+    keeps a zone tag and slot index per handle, so moving a card between
+    zones is O(1): it is swapped out of its slot instead of searched for.
+    Order inside the hand and burned zones is therefore not stable across
+    removals. The draw and discard piles keep their order, since it decides
+    what is drawn and what a reshuffle produces: taking a card out of the
+    middle shifts the cards above it down a slot, as list.remove did.
+
+    fork() makes a copy-on-write duplicate: both decks keep sharing their
+    zone arrays until one of them moves a card, and share Card objects
+    until one of them changes a card's modifiers (see own()).
+    """
+
+    def __init__(self, cards=None, rng=None):
+        self.cards = []         # Draw pile; the top card is the last element
         self.hand = []
         self.discard_pile = []
         self.burned_pile = []  # Cards that are permanently removed from combat
-        
+        self.rng = rng if rng is not None else random  # random.Random-like shuffle source
+
+        # Handle-indexed zone bookkeeping
+        self._by_handle = []
+        self._zone = []
+        self._slot = []
+        self._by_name = {}  # name -> handles of every copy in this deck
+        self._zones = {
+            Zone.DRAW: self.cards,
+            Zone.HAND: self.hand,
+            Zone.DISCARD: self.discard_pile,
+            Zone.BURNED: self.burned_pile,
+        }
+
+        # Copy-on-write state (see fork)
+        self._arrays_shared = False  # Zone and handle lists are shared with a fork
+        self._cards_shared = False   # Card objects are shared with a fork...
+        self._owned = set()          # ...except these handles, cloned since
+
+        for card in cards or []:
+            self._register(card, Zone.DRAW)
+
+    def _register(self, card, zone):
+        """Give a card a handle in this deck and place it in a zone"""
+        self._unshare()
+        handle = len(self._by_handle)
+        card.handle = handle
+        self._owned.add(handle)
+        self._by_handle.append(card)
+        self._zone.append(Zone.REMOVED)
+        self._slot.append(-1)
+        self._by_name.setdefault(card.name, []).append(handle)
+        self._push(card, zone)
+
+    def export_zones(self):
+        """Cards in handle order with their zone and slot (for snapshots)"""
+        return list(self._by_handle), list(self._zone), list(self._slot)
+
+    @classmethod
+    def from_zones(cls, cards, zones, slots, rng=None):
+        """Rebuild a deck from export_zones() output"""
+        deck = cls(rng=rng)
+        for zone, pile in deck._zones.items():
+            pile.extend([None] * zones.count(zone))
+        for handle, (card, zone, slot) in enumerate(zip(cards, zones, slots)):
+            card.handle = handle
+            deck._by_handle.append(card)
+            deck._zone.append(zone)
+            deck._slot.append(slot)
+            deck._by_name.setdefault(card.name, []).append(handle)
+            if zone != Zone.REMOVED:
+                deck._zones[zone][slot] = card
+        return deck
+
+    def fork(self, rng=None):
+        """Copy-on-write duplicate of this deck, O(1) to create.
+
+        rng is the fork's shuffle source (default: shared with this deck).
+        """
+        deck = Deck.__new__(Deck)
+        deck.__dict__.update(self.__dict__)
+        if rng is not None:
+            deck.rng = rng
+        for shared in (self, deck):
+            shared._arrays_shared = True
+            shared._cards_shared = True
+            shared._owned = set()
+        return deck
+
+    def _unshare(self):
+        """Take private copies of the zone and handle lists before changing them"""
+        if not self._arrays_shared:
+            return
+        self._arrays_shared = False
+        self.cards = self.cards[:]
+        self.hand = self.hand[:]
+        self.discard_pile = self.discard_pile[:]
+        self.burned_pile = self.burned_pile[:]
+        self._by_handle = self._by_handle[:]
+        self._zone = self._zone[:]
+        self._slot = self._slot[:]
+        self._by_name = {name: handles[:] for name, handles in self._by_name.items()}
+        self._zones = {
+            Zone.DRAW: self.cards,
+            Zone.HAND: self.hand,
+            Zone.DISCARD: self.discard_pile,
+            Zone.BURNED: self.burned_pile,
+        }
+
+    def own(self, card):
+        """The object to modify for one of this deck's cards.
+
+        While Card objects are shared with a fork, the first call for a card
+        swaps a private clone into its handle and slot. Callers must use the
+        returned card from then on.
+        """
+        if not self._cards_shared or card.handle in self._owned or not self._owns(card):
+            return card
+        self._unshare()
+        handle = card.handle
+        clone = card.clone()
+        self._by_handle[handle] = clone
+        zone = self._zone[handle]
+        if zone != Zone.REMOVED:
+            self._zones[zone][self._slot[handle]] = clone
+        self._owned.add(handle)
+        return clone
+
+    def _reset(self, card):
+        """Clear a card's modifiers, cloning it first only if there is anything to clear"""
+        if card.is_modified():
+            card = self.own(card)
+            card.reset_modifiers()
+        return card
+
+    def card_at(self, handle):
+        """The card with a given handle"""
+        return self._by_handle[handle]
+
+    def _owns(self, card):
+        handle = card.handle
+        return handle is not None and handle < len(self._by_handle) and self._by_handle[handle] is card
+
+    def zone_of(self, card):
+        """Zone a card is in, or None if it isn't part of this deck"""
+        return self._zone[card.handle] if self._owns(card) else None
+
+    def hand_slot(self, card):
+        """Row position of a card in hand (what the UI labels A-D)"""
+        return self._slot[card.handle] if self.zone_of(card) == Zone.HAND else None
+
+    def _push(self, card, zone):
+        """Append a card to a zone's list"""
+        self._unshare()
+        pile = self._zones[zone]
+        self._zone[card.handle] = zone
+        self._slot[card.handle] = len(pile)
+        pile.append(card)
+
+    def _pull(self, card):
+        """Take a card out of its zone.
+
+        The draw and discard piles keep their order and renumber the cards
+        above the slot; other zones swap their last card into it.
+        """
+        self._unshare()
+        handle = card.handle
+        zone = self._zone[handle]
+        pile = self._zones[zone]
+        slot = self._slot[handle]
+        if zone in _ORDERED_ZONES:
+            del pile[slot]
+            for i in range(slot, len(pile)):
+                self._slot[pile[i].handle] = i
+        else:
+            last = pile.pop()
+            if last is not card:
+                pile[slot] = last
+                self._slot[last.handle] = slot
+        self._zone[handle] = Zone.REMOVED
+        self._slot[handle] = -1
+
+    def _move_all(self, source, zone):
+        """Move every card of one zone to the end of another"""
+        self._unshare()
+        pile = self._zones[source]
+        target = self._zones[zone]
+        base = len(target)
+        for i, card in enumerate(pile):
+            self._zone[card.handle] = zone
+            self._slot[card.handle] = base + i
+        target.extend(pile)
+        pile.clear()
+
+    def _reindex(self, zone):
+        """Refresh slot indices after a zone's list was reordered"""
+        for i, card in enumerate(self._zones[zone]):
+            self._slot[card.handle] = i
+
     def shuffle(self):
         """Shuffle the deck"""
-        random.shuffle(self.cards)
-    
+        self._unshare()
+        self.rng.shuffle(self.cards)
+        self._reindex(Zone.DRAW)
+
     def draw(self, count=1):
         """Draw cards from deck to hand"""
         drawn = []
         for _ in range(count):
             if not self.cards:
                 self._reshuffle_discard()
-            
+
             if self.cards:
+                self._unshare()
                 card = self.cards.pop()
-                self.hand.append(card)
+                self._push(card, Zone.HAND)
                 drawn.append(card)
-        
+
         return drawn
-    
+
     def draw_row(self, size=4):
         """Draw a new row of cards, burning any existing hand cards"""
         # Burn existing hand (default behavior)
         self.burn_hand()
-        
+
         # Draw new row
         return self.draw(size)
-    
+
     def discard(self, card):
         """Move card from hand to discard pile"""
-        if card in self.hand:
-            self.hand.remove(card)
-            card.reset_modifiers()  # Reset any temporary modifiers
-            self.discard_pile.append(card)
-    
+        if self.zone_of(card) == Zone.HAND:
+            card = self._reset(card)  # Reset any temporary modifiers
+            self._pull(card)
+            self._push(card, Zone.DISCARD)
+
     def discard_hand(self):
         """Discard all cards in hand"""
-        for card in self.hand[:]:  # Copy to avoid modification during iteration
-            self.discard(card)
-    
+        for card in self.hand:
+            self._reset(card)
+        self._move_all(Zone.HAND, Zone.DISCARD)
+
     def burn(self, card):
         """Permanently remove card from combat (exile)"""
-        if card in self.hand:
-            self.hand.remove(card)
-        elif card in self.discard_pile:
-            self.discard_pile.remove(card)
-        elif card in self.cards:
-            self.cards.remove(card)
-        
-        card.reset_modifiers()
-        self.burned_pile.append(card)
-    
+        zone = self.zone_of(card)
+        if zone is None:
+            # Cards from outside the deck are still exiled here
+            self._register(card, Zone.BURNED)
+            card.reset_modifiers()
+            return
+
+        card = self._reset(card)
+        if zone in (Zone.HAND, Zone.DISCARD, Zone.DRAW):
+            self._pull(card)
+            self._push(card, Zone.BURNED)
+
     def burn_hand(self):
         """Burn all cards currently in hand"""
-        for card in self.hand[:]:  # Copy to avoid modification during iteration
-            self.burn(card)
-    
+        for card in self.hand:
+            self._reset(card)
+        self._move_all(Zone.HAND, Zone.BURNED)
+
     def _reshuffle_discard(self):
         """Shuffle discard pile back into deck"""
         if self.discard_pile:
-            self.cards.extend(self.discard_pile)
-            self.discard_pile.clear()
+            self._move_all(Zone.DISCARD, Zone.DRAW)
             self.shuffle()
-    
+
     def get_hand_size(self):
         """Get current hand size"""
         return len(self.hand)
-    
+
     def get_deck_size(self):
         """Get remaining cards in deck"""
         return len(self.cards)
-    
+
     def get_discard_size(self):
         """Get cards in discard pile"""
         return len(self.discard_pile)
-    
+
     def get_total_cards(self):
         """Get total cards available (deck + discard, excluding burned)"""
         return len(self.cards) + len(self.discard_pile)
-    
+
     def add_card(self, card):
         """Add a new card to the deck (for card rewards)"""
-        self.discard_pile.append(card)
-    
+        self._register(card, Zone.DISCARD)
+
+    def count_copies(self, card_name):
+        """Number of copies of a card in the deck (draw + discard)"""
+        return sum(1 for handle in self._by_name.get(card_name, ())
+                   if self._zone[handle] in (Zone.DRAW, Zone.DISCARD))
+
     def remove_card(self, card_name):
         """Permanently remove a card from the deck (for card removal)"""
-        # Try to remove from deck first
-        for card in self.cards[:]:
-            if card.name == card_name:
-                self.cards.remove(card)
-                return True
-        
-        # Then try discard pile
-        for card in self.discard_pile[:]:
-            if card.name == card_name:
-                self.discard_pile.remove(card)
+        handles = self._by_name.get(card_name, ())
+
+        # Try to remove from deck first, then discard pile; the copy nearest
+        # the bottom goes, as the first match in the list would
+        for zone in (Zone.DRAW, Zone.DISCARD):
+            in_zone = [handle for handle in handles if self._zone[handle] == zone]
+            if in_zone:
+                self._pull(self._by_handle[min(in_zone, key=self._slot.__getitem__)])
                 return True
-        
+
         return False
-    
+
     def get_all_cards(self):
         """Get all cards in deck + discard (excluding burned)"""
         return self.cards + self.discard_pile
-    
+
     def peek_next(self, count=1):
         """Peek at next cards without drawing them"""
         if len(self.cards) < count:
             self._reshuffle_discard()
-        
-        return self.cards[-count:] if self.cards else []
\ No newline at end of file
+
+        return self.cards[-count:] if self.cards else []
@@ -0,0 +1,40 @@
+"""Dirty-region tracking for the retained-mode render loop."""
+
+class DirtyRegions:
+    """Screen areas that changed since the last frame was presented.
+
+    A screen marks either specific rects or the whole screen; the main
+    loop redraws only when something is dirty and pushes just those rects.
+    """
+
+    def __init__(self):
+        self.full = True  # Nothing has been drawn yet
+        self.rects = []
+
+    def mark(self, rect=None):
+        """Mark a rect as changed, or the whole screen when rect is None"""
+        if rect is None:
+            self.full = True
+        elif not self.full:
+            self.rects.append(rect)
+
+    def merge(self, other):
+        """Take over another tracker's pending regions"""
+        if other.full:
+            self.full = True
+        else:
+            self.rects.extend(other.rects)
+        other.clear()
+
+    def is_dirty(self):
+        return self.full or bool(self.rects)
+
+    def clear(self):
+        self.full = False
+        self.rects = []
+
+    def take(self):
+        """Return (full, rects) and reset for the next frame"""
+        full, rects = self.full, self.rects
+        self.clear()
+        return full, rects
@@ -1,7 +1,7 @@
 """Enemy templates for different acts and encounter types."""
 
 import random
-from card import Card, CardType
+from card import Card, CardType, add_card_source, define_card, register_pending_cards
 from deck import Deck
 from enemy import Enemy
 
@@ -264,20 +264,83 @@ ENEMY_TEMPLATES = {
     },
 }
 
-def create_enemy(act, elite=False, boss=False):
-    """Create an enemy instance for the given act and encounter type."""
+def find_template(name, act=None):
+    """Look up an enemy template by name, optionally restricted to one act."""
+    register_pending_cards()
+    acts = [act] if act is not None else sorted(ENEMY_TEMPLATES)
+    for act_num in acts:
+        for templates in ENEMY_TEMPLATES.get(act_num, {}).values():
+            for template in templates:
+                if template["name"] == name:
+                    return template
+    return None
+
+def _register_template_cards():
+    """Define every template card, in template order.
+
+    Queued with add_card_source instead of run at import, so the cards are
+    defined on first use yet still take ids 0..n-1 in every process. Their
+    payoffs are tabulated when the first enemy is built (see
+    payoff_table.get_payoff_table).
+    """
+    for act_templates in ENEMY_TEMPLATES.values():
+        for templates in act_templates.values():
+            for template in templates:
+                for card_spec in template["deck"]:
+                    define_card(*card_spec)
+
+add_card_source(_register_template_cards)
+
+# Opponent-model depth per encounter tier: elites and bosses read the player deeper
+LEVEL_K_BY_TIER = {"basic": 0, "elite": 2, "boss": 3}
+# Bosses play the equilibrium of each beat's row game instead
+STRATEGY_BY_TIER = {"basic": "level_k", "elite": "level_k", "boss": "nash"}
+
+def template_tier(template):
+    """Encounter tier ("basic", "elite" or "boss") a template is listed under"""
+    for act_templates in ENEMY_TEMPLATES.values():
+        for tier, templates in act_templates.items():
+            if any(t is template for t in templates):
+                return tier
+    return "basic"
+
+def template_act(template):
+    """Act a template is listed under (1 if it isn't listed)"""
+    for act, act_templates in ENEMY_TEMPLATES.items():
+        for templates in act_templates.values():
+            if any(t is template for t in templates):
+                return act
+    return 1
+
+def create_enemy(act, elite=False, boss=False, rng=None):
+    """Create an enemy instance for the given act and encounter type.
+
+    rng is the run's RunRng; without one the global random module is used.
+    """
+    register_pending_cards()
     act_templates = ENEMY_TEMPLATES.get(act, ENEMY_TEMPLATES[1])
+    chooser = rng.encounters if rng is not None else random
     if boss:
-        template = random.choice(act_templates["boss"])
+        template = chooser.choice(act_templates["boss"])
     elif elite:
-        template = random.choice(act_templates["elite"])
+        template = chooser.choice(act_templates["elite"])
     else:
-        template = random.choice(act_templates["basic"])
+        template = chooser.choice(act_templates["basic"])
+
+    return create_enemy_from_template(template, rng)
 
+def create_enemy_from_template(template, rng=None):
+    """Build a fresh enemy (3 copies of each deck card) from a template."""
     enemy_cards = []
-    for name, card_type, speed, damage, stability, effect, read, clash in template["deck"]:
+    for card_spec in template["deck"]:
+        definition = define_card(*card_spec)
         for _ in range(3):
-            enemy_cards.append(Card(name, card_type, speed, damage, stability, effect, read, clash))
+            enemy_cards.append(Card.from_def(definition))
 
-    enemy_deck = Deck(enemy_cards)
-    return Enemy(template["name"], template["hp"], enemy_deck, template.get("archetype", "Neutral"))
+    enemy_deck = Deck(enemy_cards, rng=rng.shuffle if rng is not None else None)
+    enemy = Enemy(template["name"], template["hp"], enemy_deck, template.get("archetype", "Neutral"),
+                  rng=rng.ai if rng is not None else None)
+    tier = template_tier(template)
+    enemy.strategy = STRATEGY_BY_TIER[tier]
+    enemy.level_k = LEVEL_K_BY_TIER[tier]
+    return enemy
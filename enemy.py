@@ -1,9 +1,13 @@
 from deck import Deck
 import random
 import math
+from opponent_model import get_level_k_solver
+from nash import get_nash_solver
+from payoff_table import get_payoff_table
+from status import StatusEffects
 
 class Enemy:
-    def __init__(self, name, hp, deck, archetype="Neutral"):
+    def __init__(self, name, hp, deck, archetype="Neutral", rng=None):
         self.name = name
         self.max_hp = hp
         self.hp = hp
@@ -14,15 +18,29 @@ class Enemy:
         self.temperature = 0.8  # Controls randomness (lower = more predictable)
         self.last_played_card = None
         self.anti_repeat_penalty = 0.3
+        self.rng = rng if rng is not None else random  # random.Random-like AI stream
+        self.use_vector_ai = False  # Use the NumPy path in vector_ai (same choices, level 0 only)
+        self.strategy = "level_k"  # "level_k" (opponent_model.py) or "nash" (nash.py)
+        self.level_k = 0  # Opponent-model depth for the level_k strategy
+        self._payoffs = get_payoff_table()
         
         # Status effects
         self.focus = 0
-        self.status_effects = {}  # e.g., {"bleed": 2, "slow": 1}
+        self.status_effects = StatusEffects()
         
         # Combat state
         self.guard_amount = 0  # Damage prevention this beat
         self.stunned = False
         
+    def fork(self, deck, rng):
+        """Copy of this enemy for lookahead, playing from deck (a fork of self.deck) with AI stream rng"""
+        enemy = Enemy.__new__(Enemy)
+        enemy.__dict__.update(self.__dict__)
+        enemy.deck = deck
+        enemy.rng = rng
+        enemy.status_effects = self.status_effects.copy()
+        return enemy
+    
     def take_damage(self, amount):
         """Take damage, accounting for guard"""
         if self.guard_amount > 0:
@@ -48,30 +66,14 @@ class Enemy:
         self.stunned = False
     
     def apply_status_effects(self):
-        """Apply ongoing status effects at end of beat"""
-        damage_taken = 0
-        
-        if "bleed" in self.status_effects:
-            bleed_damage = self.status_effects["bleed"]
-            damage_taken += self.take_damage(bleed_damage)
-        
-        # Reduce status effect durations (simplified - using turn counters)
-        for effect in list(self.status_effects.keys()):
-            if effect.endswith("_duration"):
-                self.status_effects[effect] -= 1
-                if self.status_effects[effect] <= 0:
-                    # Remove the effect
-                    base_effect = effect.replace("_duration", "")
-                    if base_effect in self.status_effects:
-                        del self.status_effects[base_effect]
-                    del self.status_effects[effect]
-        
+        """Apply ongoing status effects at end of beat; returns the damage taken"""
+        damage_taken = self.status_effects.tick()
+        self.hp = max(0, self.hp - damage_taken)
         return damage_taken
     
-    def add_status_effect(self, effect, amount, duration=2):
-        """Add a status effect"""
-        self.status_effects[effect] = amount
-        self.status_effects[f"{effect}_duration"] = duration
+    def add_status_effect(self, status, amount, duration=2):
+        """Add a status effect (a status.Status)"""
+        self.status_effects.add(status, amount, duration)
     
     def is_alive(self):
         """Check if enemy is still alive"""
@@ -83,26 +85,18 @@ class Enemy:
         if not available_cards:
             return None
         
-        # Calculate payoff matrix
-        payoffs = []
-        for enemy_card in available_cards:
-            card_payoffs = []
-            for player_card in player_hand:
-                payoff = self._calculate_payoff(enemy_card, player_card)
-                card_payoffs.append(payoff)
-            
-            # Average payoff assuming player uses mixed strategy
-            avg_payoff = sum(card_payoffs) / len(card_payoffs)
-            payoffs.append(avg_payoff)
+        if self.use_vector_ai and self.strategy == "level_k" and self.level_k == 0:
+            from vector_ai import choose_cards_batch
+            width = max(len(available_cards), len(player_hand))
+            return choose_cards_batch([self], [player_hand], width)[0]
         
-        # Apply anti-repeat penalty
-        if self.last_played_card:
-            for i, card in enumerate(available_cards):
-                if card.name == self.last_played_card.name:
-                    payoffs[i] -= self.anti_repeat_penalty
-        
-        # Convert to softmax distribution
-        probabilities = self._softmax(payoffs, self.temperature)
+        if self.strategy == "nash":
+            # Equilibrium mix of the zero-sum row game
+            probabilities = get_nash_solver().strategy(self, available_cards, player_hand)
+        else:
+            # Mixed strategy assuming a level-k player (level 0: uniform over their row),
+            # with the anti-repeat penalty and softmax applied by the solver
+            probabilities = get_level_k_solver().strategy(self, available_cards, player_hand, self.level_k)
         
         # Sample from distribution
         chosen_index = self._weighted_random_choice(probabilities)
@@ -112,36 +106,12 @@ class Enemy:
         return chosen_card
     
     def _calculate_payoff(self, my_card, opponent_card):
-        """Calculate expected payoff for playing my_card vs opponent_card"""
-        payoff = 0
-        
-        # Base damage value
-        if my_card.get_effective_damage() > 0:
-            payoff += my_card.get_effective_damage()
-        
-        # Speed advantage bonus
-        if my_card.get_effective_speed() > opponent_card.get_effective_speed():
-            payoff += 1  # Acting first is valuable
-        
-        # Counter/defensive bonuses
-        if my_card.can_counter(opponent_card):
-            payoff += 2  # Successfully countering is valuable
-        
-        # Type matchup bonuses
-        if opponent_card.type.value in ["Attack", "Grapple"] and my_card.type.value == "Guard":
-            payoff += 1
-        
-        # Survival considerations
-        expected_incoming_damage = opponent_card.get_effective_damage()
-        if expected_incoming_damage >= my_card.get_effective_stability():
-            payoff -= 2  # Getting stunned is bad
-        
-        # HP-based adjustments
-        if self.hp < self.max_hp * 0.3:  # Low HP, play more defensively
-            if my_card.type.value in ["Guard", "Dodge"]:
-                payoff += 1
-        
-        return payoff
+        """Calculate expected payoff for playing my_card vs opponent_card.
+
+        Scores come from the shared payoff table (see payoff_table.score for
+        the formula); below 30% HP guards and dodges score one higher.
+        """
+        return self._payoffs.payoff(my_card, opponent_card, self.hp < self.max_hp * 0.3)
     
     def _softmax(self, values, temperature):
         """Convert values to probability distribution using softmax"""
@@ -157,7 +127,7 @@ class Enemy:
     
     def _weighted_random_choice(self, probabilities):
         """Choose index based on probability weights"""
-        r = random.random()
+        r = self.rng.random()
         cumulative = 0
         
         for i, prob in enumerate(probabilities):
@@ -169,12 +139,4 @@ class Enemy:
     
     def get_status_display(self):
         """Get string representation of status effects"""
-        if not self.status_effects:
-            return ""
-        
-        statuses = []
-        for effect, value in self.status_effects.items():
-            if not effect.endswith("_duration"):
-                statuses.append(f"{effect.title()}: {value}")
-        
-        return " | ".join(statuses)
\ No newline at end of file
+        return self.status_effects.describe()
\ No newline at end of file
@@ -1,10 +1,17 @@
 import pygame
 from enum import Enum
 from combat import Combat
+from combat_engine import CombatPhase
 from card import Card, CardType
 from deck import Deck
 from enemies import create_enemy
 from map_system import MapSystem, NodeType
+from player_cards import create_starting_deck
+from rng import RunRng
+from run import RunRecording
+from snapshot import load_state, save_state
+from text_render import get_text_renderer
+from dirty import DirtyRegions
 
 class GameState(Enum):
     MENU = 1
@@ -16,7 +23,7 @@ class GameState(Enum):
     TREASURE = 7
 
 class Game:
-    def __init__(self, screen, width, height):
+    def __init__(self, screen, width, height, seed=None, telemetry=None):
         self.screen = screen
         self.width = width
         self.height = height
@@ -31,43 +38,54 @@ class Game:
         self.GREEN = (100, 255, 100)
         self.YELLOW = (255, 255, 100)
         
-        # Font
-        self.font = pygame.font.Font(None, 24)
-        self.big_font = pygame.font.Font(None, 36)
+        # Cached text rendering shared with the other screens; fonts load on first draw
+        self.text = get_text_renderer()
         
-        # Initialize game systems
+        # Initialize game systems (seed is an exported seed code, or None for a fresh run)
+        self.rng = RunRng.from_seed_string(seed) if seed else RunRng()
         self._init_starting_deck()
-        self.map_system = MapSystem()
+        self.map_system = MapSystem(self.rng)
         self.combat = None
+        self.telemetry = telemetry  # Optional telemetry.BeatLogWriter recording every fight
+        self.recording = RunRecording(self.rng.export_seed())  # Inputs for replay.py
+        
+        # Regions to repaint on the next draw (starts fully dirty)
+        self.dirty = DirtyRegions()
+    
+    @property
+    def font(self):
+        return self.text.font(24)
+    
+    @property
+    def big_font(self):
+        return self.text.font(36)
+    
+    def save_snapshot(self):
+        """Binary snapshot of the run (map, deck, current fight, RNG) for resuming later"""
+        engine = self.combat.engine if self.combat else None
+        return save_state(self.rng, self.player_deck, self.map_system, engine,
+                          recording=self.recording, screen=self.state.value)
+    
+    def load_snapshot(self, data):
+        """Resume a run saved with save_snapshot"""
+        state = load_state(data)
+        self.rng = state.rng
+        self.player_deck = state.player_deck
+        self.map_system = state.map_system
+        self.recording = state.recording
+        self.state = GameState(state.screen)
+        self.combat = None
+        if state.engine is not None:
+            self.combat = Combat(self.player_deck, state.engine.enemy, engine=state.engine)
+            self.combat.engine.add_listener(self.recording)
+            if self.telemetry:
+                self.telemetry.act = self.map_system.current_act
+                self.telemetry.attach(self.combat.engine)
+        self.dirty.mark()
     
     def _init_starting_deck(self):
         """Create the starting deck based on Appendix A"""
-        cards = []
-        
-        # Create 2 copies of each starter card
-        starter_cards = [
-            ("Quick Jab", CardType.ATTACK, 5, 1, 1, "Deal 1", "Read: +1 dmg", "Clash: both take 1"),
-            ("Heavy Swing", CardType.ATTACK, 2, 4, 3, "Deal 4", "", "Clash: both take 2"),
-            ("Lunge", CardType.ATTACK, 4, 2, 2, "Deal 2; if first, +1 dmg", "", ""),
-            ("Guard Wall", CardType.GUARD, 1, 0, 4, "Prevent 4; if not hit, next beat +1 Speed", "", ""),
-            ("Parry", CardType.COUNTER, 4, 2, 2, "If foe Attack and first, cancel it; deal 2", "", ""),
-            ("Sidestep", CardType.DODGE, 6, 0, 1, "If foe Attack/Grapple, misses; Charge", "", "Clash: no effect"),
-            ("Grapple", CardType.GRAPPLE, 3, 2, 2, "Deal 2; Stun even if dmg < Stability", "", ""),
-            ("Choke Chain", CardType.GRAPPLE, 2, 1, 3, "Deal 1; Slow 1 next beat", "", ""),
-            ("Disrupt", CardType.TRICK, 5, 1, 1, "Foe Slow 2 this beat; deal 1", "", ""),
-            ("Focus", CardType.PREP, 2, 0, 3, "Heal 2; next beat +1 Stability", "Effect: heal", ""),
-            ("Ignite", CardType.SKILL, 3, 1, 2, "Deal 1; Bleed 1 (2 beats)", "Read: +Bleed 1", ""),
-            ("Feint", CardType.TRICK, 6, 1, 1, "After reveal, swap with unplayed; resolves S5", "Read: +1 dmg", ""),
-            ("Piercing Strike", CardType.ATTACK, 3, 3, 2, "Deal 3; Ignore guard", "", ""),
-            ("Deep Cut", CardType.ATTACK, 4, 1, 2, "Deal 1; Bleed 2 (3 beats)", "Read: +1 dmg", ""),
-            ("Reinforce", CardType.GUARD, 2, 0, 4, "Prevent 6", "", "")
-        ]
-        
-        for name, card_type, speed, damage, stability, effect, read, clash in starter_cards:
-            for _ in range(2):  # 2 copies each
-                cards.append(Card(name, card_type, speed, damage, stability, effect, read, clash))
-        
-        self.player_deck = Deck(cards)
+        self.player_deck = create_starting_deck(self.rng)
     
     def _init_combat(self):
         """Initialize combat with a basic enemy"""
@@ -90,6 +108,16 @@ class Game:
         self.combat = Combat(self.player_deck, enemy)
     
     def handle_event(self, event):
+        before = (self.state, self.combat, self.map_system.get_act_progress())
+        self._dispatch_event(event)
+        
+        # Screen switches and map moves repaint everything; combat tracks its own regions
+        if before != (self.state, self.combat, self.map_system.get_act_progress()):
+            self.dirty.mark()
+        elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.VIDEORESIZE):
+            self.dirty.mark()
+    
+    def _dispatch_event(self, event):
         # Global escape key handling
         if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
             if self.state in [GameState.SHOP, GameState.CAMP, GameState.EVENT, GameState.TREASURE]:
@@ -103,26 +131,29 @@ class Game:
     def _handle_map_event(self, event):
         """Handle events on the map screen"""
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            # Check if player clicked on one of the 3 node choices
+            # Check if player clicked on one of the reachable nodes
             choices = self.map_system.get_current_choices()
             if choices:
-                # Simple button layout - 3 buttons centered
-                button_width = 200
-                button_height = 80
-                button_spacing = 20
-                start_x = (self.width - (3 * button_width + 2 * button_spacing)) // 2
-                start_y = self.height // 2
-                
                 for i, node in enumerate(choices):
-                    button_x = start_x + i * (button_width + button_spacing)
-                    button_rect = pygame.Rect(button_x, start_y, button_width, button_height)
+                    button_rect = self._choice_rect(i, len(choices))
                     
                     if button_rect.collidepoint(event.pos):
                         self._choose_node(i)
                         break
     
+    def _choice_rect(self, index, count):
+        """Button for one of the map choices (simple layout - buttons centered)"""
+        button_width = 200
+        button_height = 80
+        button_spacing = 20
+        start_x = (self.width - (count * button_width + (count - 1) * button_spacing)) // 2
+        start_y = self.height // 2
+        return pygame.Rect(start_x + index * (button_width + button_spacing), start_y,
+                           button_width, button_height)
+    
     def _choose_node(self, node_index):
         """Player chooses a node from the map"""
+        self.recording.node(node_index)
         chosen_node = self.map_system.choose_node(node_index)
         if chosen_node:
             # Handle different node types
@@ -144,14 +175,24 @@ class Game:
     def _start_combat(self, elite=False, boss=False):
         """Start a combat encounter"""
         act = self.map_system.current_act
-        enemy = create_enemy(act, elite, boss)
+        enemy = create_enemy(act, elite, boss, self.rng)
         self.combat = Combat(self.player_deck, enemy)
+        self.combat.engine.add_listener(self.recording)
+        if self.telemetry:
+            self.telemetry.act = act
+            self.telemetry.attach(self.combat.engine)
         self.state = GameState.COMBAT
     
     def _end_combat(self):
         """Handle end of combat, return to map"""
+        engine = self.combat.engine
+        if engine.phase == CombatPhase.REVEAL:
+            # The deciding beat was never cleaned up (no ENTER before the timer);
+            # finish it as CombatEngine.step does, so replays see the same decks
+            engine.cleanup()
         self.state = GameState.MAP
         self.combat = None
+        self.dirty.mark()
     
     def update(self, dt):
         if self.state == GameState.COMBAT and self.combat:
@@ -167,7 +208,32 @@ class Game:
                 else:
                     self.combat_end_timer = 2.0  # 2 second delay
     
+    def is_animating(self):
+        """Whether the next frames change on their own and need full-rate ticks"""
+        if self.state == GameState.COMBAT and self.combat:
+            # The post-combat delay counts down in update()
+            return self.combat.engine.is_over() or self.combat.is_animating()
+        return False
+    
     def draw(self):
+        """Repaint what changed since the last frame.
+
+        Returns the list of screen rects to push with
+        pygame.display.update, or an empty list when nothing changed and
+        the frame can be skipped.
+        """
+        if self.state == GameState.COMBAT and self.combat:
+            self.dirty.merge(self.combat.dirty)
+        if not self.dirty.is_dirty():
+            return []
+        
+        full, rects = self.dirty.take()
+        if full:
+            rects = [self.screen.get_rect()]
+        else:
+            # Everything is still drawn, but blits outside the clip are nearly free
+            self.screen.set_clip(rects[0].unionall(rects[1:]))
+        
         self.screen.fill(self.BLACK)
         
         if self.state == GameState.COMBAT and self.combat:
@@ -179,34 +245,32 @@ class Game:
         
         # Draw debug info
         debug_text = f"State: {self.state.name}"
-        debug_surface = self.font.render(debug_text, True, self.WHITE)
+        debug_surface = self.text.render(debug_text, self.font, self.WHITE)
         self.screen.blit(debug_surface, (10, 10))
+        
+        self.screen.set_clip(None)
+        return rects
     
     def _draw_map(self):
-        """Draw the map screen with 3 node choices"""
+        """Draw the map screen with the reachable node choices"""
         # Title
-        title_text = self.big_font.render("Choose Your Path", True, self.WHITE)
+        title_text = self.text.render("Choose Your Path", self.big_font, self.WHITE)
         title_rect = title_text.get_rect(centerx=self.width//2, y=50)
         self.screen.blit(title_text, title_rect)
         
         # Progress indicator
         act, floor, total_floors = self.map_system.get_act_progress()
-        progress_text = self.font.render(f"Act {act} - Floor {floor}/{total_floors}", True, self.WHITE)
+        progress_text = self.text.render(f"Act {act} - Floor {floor}/{total_floors}", self.font, self.WHITE)
         progress_rect = progress_text.get_rect(centerx=self.width//2, y=100)
         self.screen.blit(progress_text, progress_rect)
         
-        # Draw the 3 node choices
+        # Draw the node choices reachable from the last one
         choices = self.map_system.get_current_choices()
         if choices:
-            button_width = 200
-            button_height = 80
-            button_spacing = 20
-            start_x = (self.width - (3 * button_width + 2 * button_spacing)) // 2
-            start_y = self.height // 2
-            
             for i, node in enumerate(choices):
-                button_x = start_x + i * (button_width + button_spacing)
-                button_rect = pygame.Rect(button_x, start_y, button_width, button_height)
+                button_rect = self._choice_rect(i, len(choices))
+                button_x, start_y = button_rect.topleft
+                button_width = button_rect.width
                 
                 # Get node color based on type
                 node_color = self._get_node_color(node.type)
@@ -216,18 +280,29 @@ class Game:
                 pygame.draw.rect(self.screen, self.WHITE, button_rect, 2)
                 
                 # Draw icon
-                icon_text = self.big_font.render(node.get_icon(), True, self.WHITE)
+                icon_text = self.text.render(node.get_icon(), self.big_font, self.WHITE)
                 icon_rect = icon_text.get_rect(centerx=button_x + button_width//2, y=start_y + 10)
                 self.screen.blit(icon_text, icon_rect)
                 
                 # Draw node name
-                name_text = self.font.render(node.get_display_name(), True, self.WHITE)
+                name_text = self.text.render(node.get_display_name(), self.font, self.WHITE)
                 name_rect = name_text.get_rect(centerx=button_x + button_width//2, y=start_y + 50)
                 self.screen.blit(name_text, name_rect)
+                
+                # Path advice: what the rest of the act offers through this node
+                for line_number, line in enumerate(node.get_path_advice()):
+                    advice_text = self.text.render(line, self.font, self.GRAY)
+                    advice_rect = advice_text.get_rect(centerx=button_rect.centerx,
+                                                       y=button_rect.bottom + 10 + line_number * 22)
+                    self.screen.blit(advice_text, advice_rect)
         
         # Draw gold
-        gold_text = self.font.render(f"Gold: {self.map_system.gold}", True, self.YELLOW)
+        gold_text = self.text.render(f"Gold: {self.map_system.gold}", self.font, self.YELLOW)
         self.screen.blit(gold_text, (self.width - 100, 20))
+        
+        # Draw seed so runs can be shared and reproduced
+        seed_text = self.text.render(f"Seed: {self.rng.export_seed()}", self.font, self.GRAY)
+        self.screen.blit(seed_text, (10, self.height - 30))
     
     def _get_node_color(self, node_type):
         """Get color for different node types"""
@@ -245,12 +320,12 @@ class Game:
     def _draw_placeholder_screen(self):
         """Draw placeholder for unimplemented screens"""
         text = f"{self.state.name} - Not Implemented"
-        placeholder_text = self.big_font.render(text, True, self.WHITE)
+        placeholder_text = self.text.render(text, self.big_font, self.WHITE)
         text_rect = placeholder_text.get_rect(center=(self.width//2, self.height//2))
         self.screen.blit(placeholder_text, text_rect)
         
         # Return to map instruction
         instruction = "Press ESCAPE to return to map"
-        inst_text = self.font.render(instruction, True, self.WHITE)
+        inst_text = self.text.render(instruction, self.font, self.WHITE)
         inst_rect = inst_text.get_rect(center=(self.width//2, self.height//2 + 50))
         self.screen.blit(inst_text, inst_rect)
\ No newline at end of file
@@ -1,37 +1,88 @@
-import pygame
+import argparse
+import time
 import sys
-from game import Game
+from startup import StartupProfile
 
 def main():
-    pygame.init()
+    parser = argparse.ArgumentParser(description="No Turns, Only Vibes")
+    parser.add_argument("--seed", help="replay a run from an exported seed code")
+    parser.add_argument("--frame-stats", action="store_true", help="print frame pacing stats on exit")
+    parser.add_argument("--telemetry", metavar="PATH", help="append per-beat combat records to a beat log")
+    parser.add_argument("--record", metavar="PATH", help="save the run's seed and inputs for replay.py on exit")
+    parser.add_argument("--resume", metavar="PATH", help="resume a run from a snapshot file")
+    parser.add_argument("--save", metavar="PATH", help="snapshot the run to a file on exit")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print an import and boot phase breakdown once the first frame is up")
+    args = parser.parse_args()
+    
+    # Staged boot: import and initialize only what the first map frame needs,
+    # then present it; fonts, enemy payoffs and later acts load on first use
+    profile = StartupProfile(imports=args.profile_startup)
+    with profile.phase("import pygame"):
+        import pygame
+    with profile.phase("import game"):
+        from game import Game
+        from pacing import FramePacer
+        from telemetry import BeatLogWriter
+    
+    with profile.phase("display init"):
+        # The game has no sound or controller input, so mixer and joystick stay off
+        pygame.display.init()
+        pygame.font.init()
     
     # Game constants
     SCREEN_WIDTH = 1200
     SCREEN_HEIGHT = 800
-    FPS = 60
+    FPS = 60  # Only while something animates; idle frames block on input
     
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    pygame.display.set_caption("No Turns, Only Vibes - Simultaneous Deckbuilder")
-    clock = pygame.time.Clock()
+    with profile.phase("window"):
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("No Turns, Only Vibes - Simultaneous Deckbuilder")
+    pacer = FramePacer(active_fps=FPS)
     
-    game = Game(screen, SCREEN_WIDTH, SCREEN_HEIGHT)
+    with profile.phase("game"):
+        telemetry = BeatLogWriter(args.telemetry) if args.telemetry else None
+        game = Game(screen, SCREEN_WIDTH, SCREEN_HEIGHT, seed=args.seed, telemetry=telemetry)
+        if args.resume:
+            with open(args.resume, "rb") as f:
+                game.load_snapshot(f.read())
+    
+    with profile.phase("first frame"):
+        game.draw()
+        pygame.display.flip()
+    profile.finish()
+    if args.profile_startup:
+        print(profile.report())
     
     running = True
     while running:
-        dt = clock.tick(FPS) / 1000.0  # Delta time in seconds
+        events, dt = pacer.wait(game.is_animating())  # dt in seconds
         
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
             else:
                 game.handle_event(event)
         
         game.update(dt)
-        game.draw()
-        pygame.display.flip()
+        draw_start = time.perf_counter()
+        dirty_rects = game.draw()
+        if dirty_rects:  # Skip presenting entirely when nothing changed
+            pygame.display.update(dirty_rects)
+            pacer.record_present(time.perf_counter() - draw_start)
+    
+    if args.frame_stats:
+        print(pacer.summary())
+    if telemetry:
+        telemetry.close()
+    if args.record:
+        game.recording.save(args.record)
+    if args.save:
+        with open(args.save, "wb") as f:
+            f.write(game.save_snapshot())
     
     pygame.quit()
     sys.exit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
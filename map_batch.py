@@ -0,0 +1,317 @@
+"""Batched map generation for bulk seed analysis.
+
+generate() builds the node types and edges of one act for many run seeds
+at once with NumPy and gives exactly what map_system.Act builds for each
+seed (verify() checks this against the scalar generator). CPython's
+Mersenne Twister seeding and the first outputs of its first twist are
+reproduced vectorized across seeds; only the blake2b derivation of each
+act's stream seed stays in Python.
+
+MapBatchStats accumulates node-type histograms per act and floor, path
+extremes (fewest/most elites, shops and camps on any path) and
+degenerate-map constraint checks, and can collect clean seeds as
+candidates for daily runs.
+
+Example:
+    python map_batch.py --seeds 1000000 --verify 200 --daily 10
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from map_system import ACT_COUNT, ADVICE_TYPES, BRANCH_CHANCE, Act, NodeType
+from rng import RunRng, derive_seed
+
+NODE_TYPES = list(NodeType)
+EMPTY = -1  # Type code of a missing column on narrow floors
+WIDTH = 3  # Widest floor
+
+# Mersenne Twister parameters (as in CPython's _randommodule.c)
+_N = 624
+_M = 397
+_MATRIX_A = np.uint32(0x9908B0DF)
+_UPPER_MASK = np.uint32(0x80000000)
+_LOWER_MASK = np.uint32(0x7FFFFFFF)
+
+def _init_genrand(seed):
+    mt = [seed]
+    for i in range(1, _N):
+        mt.append((1812433253 * (mt[-1] ^ (mt[-1] >> 30)) + i) & 0xFFFFFFFF)
+    return np.array(mt, dtype=np.uint32)
+
+# init_by_array always starts from this state
+_GENRAND_BASE = _init_genrand(19650218)
+
+def _seed_states(seeds):
+    """MT states (624, B) of random.Random(seed) for non-negative 64-bit seeds"""
+    seeds = np.asarray(seeds, dtype=np.uint64)
+    low = (seeds & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+    high = (seeds >> np.uint64(32)).astype(np.uint32)
+    # CPython keys an int by its 32-bit words: one word below 2**32, else two.
+    # init_by_array adds key[j] + j, with j cycling over the key
+    even_add = low
+    odd_add = np.where(high != 0, high + np.uint32(1), low)
+
+    mt = np.repeat(_GENRAND_BASE[:, None], len(seeds), axis=1)
+    tmp = np.empty(len(seeds), dtype=np.uint32)
+    i = 1
+    for step in range(_N):  # max(N, key length) steps
+        np.right_shift(mt[i - 1], 30, out=tmp)
+        tmp ^= mt[i - 1]
+        tmp *= np.uint32(1664525)
+        mt[i] ^= tmp
+        mt[i] += odd_add if step & 1 else even_add
+        i += 1
+        if i >= _N:
+            mt[0] = mt[_N - 1]
+            i = 1
+    for _ in range(_N - 1):
+        np.right_shift(mt[i - 1], 30, out=tmp)
+        tmp ^= mt[i - 1]
+        tmp *= np.uint32(1566083941)
+        mt[i] ^= tmp
+        mt[i] -= np.uint32(i)
+        i += 1
+        if i >= _N:
+            mt[0] = mt[_N - 1]
+            i = 1
+    mt[0] = _UPPER_MASK
+    return mt
+
+def _random_doubles(mt, count):
+    """The first count random() results (count, B) of each freshly seeded state"""
+    words = 2 * count
+    if words > _N - _M:
+        raise ValueError(f"can only reproduce the first {(_N - _M) // 2} random() calls")
+    # First twist; for these indices it only reads words it hasn't rewritten yet
+    y = (mt[:words] & _UPPER_MASK) | (mt[1:words + 1] & _LOWER_MASK)
+    out = mt[_M:_M + words] ^ (y >> np.uint32(1)) ^ np.where(y & np.uint32(1), _MATRIX_A, np.uint32(0))
+    # Tempering
+    out ^= out >> np.uint32(11)
+    out ^= (out << np.uint32(7)) & np.uint32(0x9D2C5680)
+    out ^= (out << np.uint32(15)) & np.uint32(0xEFC60000)
+    out ^= out >> np.uint32(18)
+    a = (out[0::2] >> np.uint32(5)).astype(np.float64)
+    b = (out[1::2] >> np.uint32(6)).astype(np.float64)
+    return (a * 67108864.0 + b) * (1.0 / 9007199254740992.0)
+
+def _weighted_pick(r, weights):
+    """random.choices(range(n), weights)[0] per row, given each row's random() value.
+
+    Zero weights stand in for types already removed from the list.
+    """
+    cum = np.cumsum(weights, axis=-1)
+    target = r * cum[..., -1]
+    # bisect(cum_weights, target, 0, n - 1)
+    index = (cum[..., :-1] <= target[..., None]).sum(axis=-1)
+    last = weights.shape[-1] - 1 - np.argmax(weights[..., ::-1] > 0, axis=-1)
+    return np.minimum(index, last)
+
+def stream_seeds(seeds, act_number):
+    """Seeds of the act's map sub-stream for each run seed"""
+    return np.fromiter((derive_seed(int(seed), "map", act_number) for seed in seeds),
+                       dtype=np.uint64, count=len(seeds))
+
+def generate(seeds, act_number, floors_per_act=10):
+    """Node types and edges of one act for many run seeds.
+
+    Returns (types, edges), both (B, floors, WIDTH): types holds indices
+    into NODE_TYPES (EMPTY past a floor's last column) and edges holds
+    bitmasks of the next floor's columns each node leads to.
+    """
+    template = Act(act_number, floors_per_act)
+    count = len(seeds)
+    floors = []  # (floor, fixed nodes or None for a regular floor)
+    draws = 0
+    for floor in range(1, floors_per_act + 1):
+        fixed = floor >= floors_per_act - 2
+        floors.append((floor, template._generate_floor(floor, None) if fixed else None))
+        if not fixed:
+            draws += 2  # Two weighted picks besides the guaranteed combat
+    widths = [len(nodes) if nodes else WIDTH for _, nodes in floors]
+    for upper, lower in zip(widths, widths[1:]):
+        if lower > 1:
+            draws += sum(1 for column in range(upper) for neighbour in (column - 1, column + 1)
+                         if 0 <= neighbour < lower)
+
+    randoms = _random_doubles(_seed_states(stream_seeds(seeds, act_number)), draws)
+    draw = 0
+    types = np.full((count, floors_per_act, WIDTH), EMPTY, dtype=np.int8)
+    edges = np.zeros((count, floors_per_act, WIDTH), dtype=np.uint8)
+    rows = np.arange(count)
+
+    # Node types, floor by floor (Act._generate_floor_choices)
+    for index, (floor, nodes) in enumerate(floors):
+        if nodes is not None:
+            for column, node in enumerate(nodes):
+                types[:, index, column] = NODE_TYPES.index(node.type)
+            continue
+        weights = template._get_node_weights(floor)
+        available = [node_type for node_type in weights if node_type is not NodeType.COMBAT]
+        codes = np.array([NODE_TYPES.index(node_type) for node_type in available], dtype=np.int8)
+        remaining = np.tile(np.array([weights[t] for t in available], dtype=np.float64), (count, 1))
+        types[:, index, 0] = NODE_TYPES.index(NodeType.COMBAT)
+        for column in (1, 2):
+            pick = _weighted_pick(randoms[draw], remaining)
+            draw += 1
+            types[:, index, column] = codes[pick]
+            remaining[rows, pick] = 0
+
+    # Edges, floor by floor (Act._connect)
+    for index, (upper, lower) in enumerate(zip(widths, widths[1:])):
+        if lower == 1:
+            edges[:, index, :upper] = 1
+            continue
+        for column in range(upper):
+            mask = np.full(count, 1 << column if column < lower else 0, dtype=np.uint8)
+            for neighbour in (column - 1, column + 1):
+                if 0 <= neighbour < lower:
+                    mask |= (randoms[draw] < BRANCH_CHANCE).astype(np.uint8) << np.uint8(neighbour)
+                    draw += 1
+            mask[mask == 0] = 1 << (lower - 1)
+            edges[:, index, column] = mask
+    return types, edges
+
+def path_extremes(types, edges, node_type):
+    """Fewest and most nodes of a type on any path through each act, as (B,) arrays"""
+    count, floors, width = types.shape
+    exists = types != EMPTY
+    own = (types == NODE_TYPES.index(node_type)).astype(np.int16)
+    fewest = own[:, -1].copy()
+    most = own[:, -1].copy()
+    bits = np.arange(width, dtype=np.uint8)
+    big = np.int16(floors + 1)
+    for index in range(floors - 2, -1, -1):
+        adjacent = ((edges[:, index, :, None] >> bits) & 1).astype(bool)  # [seed, column, next column]
+        fewest = own[:, index] + np.where(adjacent, fewest[:, None, :], big).min(axis=-1)
+        most = own[:, index] + np.where(adjacent, most[:, None, :], -big).max(axis=-1)
+        fewest[~exists[:, index]] = big
+        most[~exists[:, index]] = -big
+    return fewest.min(axis=-1), most.max(axis=-1)
+
+def _forced(node_type, floors_per_act=10):
+    """Nodes of a type on every path (the single-node floors)"""
+    template = Act(1, floors_per_act)
+    return sum(1 for floor in range(floors_per_act - 2, floors_per_act + 1)
+               for node in template._generate_floor(floor, None) if node.type is node_type)
+
+def _extra_edges(types, edges):
+    """Edges per act beyond the one every node has"""
+    nodes_with_edges = (types[:, :-1] != EMPTY).sum(axis=(1, 2))
+    return np.unpackbits(edges[..., None], axis=-1).sum(axis=(1, 2, 3)) - nodes_with_edges
+
+# Degenerate-map checks: name -> test(types, edges, extremes) flagging bad acts,
+# where extremes maps each ADVICE_TYPES type to its (fewest, most) arrays
+CONSTRAINTS = {
+    "no reachable shop": lambda types, edges, extremes: extremes[NodeType.SHOP][1] == 0,
+    "no optional camp": lambda types, edges, extremes: (
+        extremes[NodeType.CAMP][1] <= _forced(NodeType.CAMP, types.shape[1])),
+    "no branching": lambda types, edges, extremes: _extra_edges(types, edges) == 0,
+}
+
+class MapBatchStats:
+    """Running histograms and constraint checks over batches of run seeds"""
+
+    def __init__(self, floors_per_act=10, daily_limit=0):
+        self.floors_per_act = floors_per_act
+        self.seeds = 0
+        self.type_counts = np.zeros((ACT_COUNT, floors_per_act, len(NODE_TYPES)), dtype=np.int64)
+        # [act, advice type, count] histograms of the fewest/most on any path
+        self.fewest = np.zeros((ACT_COUNT, len(ADVICE_TYPES), floors_per_act + 1), dtype=np.int64)
+        self.most = np.zeros_like(self.fewest)
+        self.failures = {name: np.zeros(ACT_COUNT, dtype=np.int64) for name in CONSTRAINTS}
+        self.clean = 0  # Seeds with no flagged act
+        self.daily_limit = daily_limit
+        self.daily_seeds = []
+
+    def add(self, seeds):
+        seeds = np.asarray(seeds, dtype=np.uint64)
+        clean = np.ones(len(seeds), dtype=bool)
+        for act in range(ACT_COUNT):
+            types, edges = generate(seeds, act + 1, self.floors_per_act)
+            for floor in range(self.floors_per_act):
+                codes = types[:, floor][types[:, floor] != EMPTY]
+                self.type_counts[act, floor] += np.bincount(codes, minlength=len(NODE_TYPES))
+            extremes = {}
+            for index, node_type in enumerate(ADVICE_TYPES):
+                fewest, most = extremes[node_type] = path_extremes(types, edges, node_type)
+                self.fewest[act, index] += np.bincount(fewest, minlength=self.floors_per_act + 1)
+                self.most[act, index] += np.bincount(most, minlength=self.floors_per_act + 1)
+            for name, check in CONSTRAINTS.items():
+                flagged = check(types, edges, extremes)
+                self.failures[name][act] += int(flagged.sum())
+                clean &= ~flagged
+        self.seeds += len(seeds)
+        self.clean += int(clean.sum())
+        wanted = self.daily_limit - len(self.daily_seeds)
+        if wanted > 0:
+            self.daily_seeds.extend(seeds[clean][:wanted].tolist())
+
+    def summary(self):
+        lines = [f"Seeds: {self.seeds}, clean (no flagged act): {self.clean / max(1, self.seeds):.2%}"]
+        for act in range(ACT_COUNT):
+            lines += ["", f"Act {act + 1} node mix per floor:"]
+            for floor in range(self.floors_per_act):
+                counts = self.type_counts[act, floor]
+                total = counts.sum()
+                mix = ", ".join(f"{NODE_TYPES[code].value} {counts[code] / total:.1%}"
+                                for code in np.flatnonzero(counts))
+                lines.append(f"  floor {floor + 1:>2}: {mix}")
+            lines.append(f"Act {act + 1} fewest-most on any path:")
+            for index, node_type in enumerate(ADVICE_TYPES):
+                for label, histogram in (("fewest", self.fewest), ("most", self.most)):
+                    values = histogram[act, index]
+                    shares = ", ".join(f"{value}: {values[value] / self.seeds:.1%}"
+                                       for value in np.flatnonzero(values))
+                    lines.append(f"  {node_type.value:<6} {label:<6} {shares}")
+        lines += ["", "Flagged acts:"]
+        for name, counts in self.failures.items():
+            rates = ", ".join(f"act {act + 1} {counts[act] / max(1, self.seeds):.2%}" for act in range(ACT_COUNT))
+            lines.append(f"  {name}: {rates}")
+        if self.daily_seeds:
+            lines += ["", "Clean seeds: " + " ".join(RunRng(seed).export_seed() for seed in self.daily_seeds)]
+        return "\n".join(lines)
+
+def verify(seeds, floors_per_act=10):
+    """Check generate() against the scalar Act for every seed and act"""
+    seeds = list(seeds)
+    for act_number in range(1, ACT_COUNT + 1):
+        types, edges = generate(seeds, act_number, floors_per_act)
+        for row, seed in enumerate(seeds):
+            act = Act(act_number, floors_per_act, RunRng(seed))
+            for index, nodes in enumerate(act._generate_act()):
+                expected_types = [NODE_TYPES.index(node.type) for node in nodes]
+                expected_edges = [sum(1 << column for column in node.edges) for node in nodes]
+                if (types[row, index, :len(nodes)].tolist() != expected_types
+                        or edges[row, index, :len(nodes)].tolist() != expected_edges):
+                    raise ValueError(f"seed {seed} act {act_number} floor {index + 1} differs from Act")
+
+def analyze(start, count, chunk=1 << 14, floors_per_act=10, daily_limit=0):
+    """Stats for run seeds start .. start + count - 1"""
+    stats = MapBatchStats(floors_per_act, daily_limit)
+    for offset in range(0, count, chunk):
+        stats.add(np.arange(start + offset, start + min(count, offset + chunk), dtype=np.uint64))
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate maps for many seeds and report on them")
+    parser.add_argument("--seeds", type=int, default=100000, help="number of consecutive run seeds")
+    parser.add_argument("--start", type=int, default=0, help="first run seed")
+    parser.add_argument("--chunk", type=int, default=1 << 14, help="seeds generated per batch")
+    parser.add_argument("--verify", type=int, default=0, help="check the first N seeds against Act")
+    parser.add_argument("--daily", type=int, default=0, help="list the first N clean seeds")
+    args = parser.parse_args()
+
+    if args.verify:
+        verify(range(args.start, args.start + args.verify))
+        print(f"Verified {args.verify} seeds against the scalar generator")
+    started = time.perf_counter()
+    stats = analyze(args.start, args.seeds, args.chunk, daily_limit=args.daily)
+    elapsed = time.perf_counter() - started
+    print(stats.summary())
+    print(f"\nElapsed: {elapsed:.2f}s ({args.seeds / elapsed:.0f} seeds/s)")
+
+if __name__ == "__main__":
+    main()
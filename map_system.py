@@ -1,5 +1,6 @@
 from enum import Enum
-import random
+from operator import add
+from rng import RunRng
 
 class NodeType(Enum):
     COMBAT = "Combat"
@@ -10,13 +11,29 @@ class NodeType(Enum):
     TREASURE = "Treasure"
     BOSS = "Boss"
 
+# Node types counted by the path statistics
+ADVICE_TYPES = (NodeType.ELITE, NodeType.SHOP, NodeType.CAMP)
+_ADVICE_INDEX = {node_type: i for i, node_type in enumerate(ADVICE_TYPES)}
+_NO_COUNTS = (0,) * len(ADVICE_TYPES)
+_OWN_COUNTS = {node_type: tuple(int(node_type is counted) for counted in ADVICE_TYPES)
+               for node_type in NodeType}
+
 class MapNode:
-    def __init__(self, node_type, floor, choices=None):
+    def __init__(self, node_type, floor, choices=None, column=0):
         self.type = node_type
         self.floor = floor
+        self.column = column  # Position on its floor
+        self.edges = []  # Columns on the next floor this node leads to
         self.completed = False
         self.choices = choices or []  # For events with multiple outcomes
         
+        # Path statistics from this node (inclusive) to the end of its act,
+        # filled in by Act._compute_path_stats; counts are per ADVICE_TYPES entry
+        self.paths = 1
+        self.fewest = _NO_COUNTS    # fewest on any path
+        self.most = _NO_COUNTS      # most on any path
+        self.expected = _NO_COUNTS  # expected count picking uniformly at random
+        
     def get_display_name(self):
         """Get user-friendly name for the node"""
         return self.type.value
@@ -33,43 +50,117 @@ class MapNode:
             NodeType.BOSS: "👑"
         }
         return icons.get(self.type, "?")
+    
+    def path_stats(self, node_type):
+        """(fewest, most, expected) nodes of an ADVICE_TYPES type on paths from here"""
+        i = _ADVICE_INDEX[node_type]
+        return self.fewest[i], self.most[i], self.expected[i]
+    
+    def get_path_advice(self):
+        """Short lines on what the paths through this node offer"""
+        lines = []
+        for node_type, fewest, most in zip(ADVICE_TYPES, self.fewest, self.most):
+            count = str(most) if fewest == most else f"{fewest}-{most}"
+            lines.append(f"{node_type.value}s {count}")
+        return lines
+
+ACT_COUNT = 3
+
+BRANCH_CHANCE = 0.5  # Chance of an extra edge to each neighbouring column
 
 class Act:
-    def __init__(self, act_number, floors_per_act=10):
+    """One act of the map: a DAG of floors, generated on first visit.
+
+    Every node on a floor leads to the node in its own column on the next
+    floor and, with BRANCH_CHANCE each, to the neighbouring columns; a
+    single-node floor gathers all paths. The whole act is drawn from its own
+    seed sub-stream (rng.substream("map", act_number)), node types first and
+    then edges, floor by floor, so it doesn't depend on when it is
+    generated. Path statistics are precomputed in one backward pass.
+    Floors already passed are dropped.
+    """
+
+    def __init__(self, act_number, floors_per_act=10, rng=None):
         self.act_number = act_number
+        self.rng = rng if rng is not None else RunRng()
         self.floors_per_act = floors_per_act
         self.current_floor = 0
-        self.nodes = self._generate_act()
+        self.position = None  # Node chosen on the previous floor
+        self.floors = None  # Node lists per floor, once generated
     
     def _generate_act(self):
-        """Generate a simple act with predetermined structure"""
-        nodes = []
-        
+        """Generate every floor, connect them and compute the path statistics"""
+        stream = self.rng.substream("map", self.act_number)
+        floors = [self._generate_floor(floor, stream) for floor in range(1, self.floors_per_act + 1)]
+        for upper, lower in zip(floors, floors[1:]):
+            self._connect(upper, lower, stream)
+        self._compute_path_stats(floors)
+        return floors
+    
+    def _generate_floor(self, floor, rng):
+        """Generate the nodes of one floor (1-based)"""
         # Simple structure for mobile-friendly gameplay:
         # Floors 1-7: Mix of Combat, Event, Shop, Camp, Treasure
         # Floor 8: Elite (forced)
         # Floor 9: Camp (rest before boss)
         # Floor 10: Boss
-        
-        for floor in range(1, self.floors_per_act + 1):
-            if floor == self.floors_per_act - 2:  # Floor 8
-                # Elite floor
-                nodes.append([MapNode(NodeType.ELITE, floor)])
-            elif floor == self.floors_per_act - 1:  # Floor 9  
-                # Pre-boss camp
-                nodes.append([MapNode(NodeType.CAMP, floor)])
-            elif floor == self.floors_per_act:  # Floor 10
-                # Boss floor
-                nodes.append([MapNode(NodeType.BOSS, floor)])
-            else:
-                # Regular floors - generate 3 choices
-                floor_nodes = self._generate_floor_choices(floor)
-                nodes.append(floor_nodes)
-        
+        if floor == self.floors_per_act - 2:  # Floor 8
+            # Elite floor
+            return [MapNode(NodeType.ELITE, floor)]
+        elif floor == self.floors_per_act - 1:  # Floor 9
+            # Pre-boss camp
+            return [MapNode(NodeType.CAMP, floor)]
+        elif floor == self.floors_per_act:  # Floor 10
+            # Boss floor
+            return [MapNode(NodeType.BOSS, floor)]
+        # Regular floors - 3 columns, reachable through the edges from the floor below
+        nodes = self._generate_floor_choices(floor, rng)
+        for column, node in enumerate(nodes):
+            node.column = column
         return nodes
     
-    def _generate_floor_choices(self, floor):
-        """Generate 3 node choices for a regular floor"""
+    def _connect(self, upper, lower, rng):
+        """Add edges from one floor to the next"""
+        if len(lower) == 1:
+            for node in upper:
+                node.edges = [0]
+            return
+        for node in upper:
+            column = node.column
+            edges = [column] if column < len(lower) else []
+            for neighbour in (column - 1, column + 1):
+                if 0 <= neighbour < len(lower) and rng.random() < BRANCH_CHANCE:
+                    edges.append(neighbour)
+            node.edges = sorted(edges) or [len(lower) - 1]
+    
+    def _compute_path_stats(self, floors):
+        """Backward pass: aggregate each node's statistics from its successors"""
+        for index in range(len(floors) - 1, -1, -1):
+            following = floors[index + 1] if index + 1 < len(floors) else None
+            for node in floors[index]:
+                own = _OWN_COUNTS[node.type]
+                if not following:
+                    node.paths = 1
+                    node.fewest = node.most = own
+                    node.expected = tuple(map(float, own))
+                    continue
+                children = [following[column] for column in node.edges]
+                if len(children) == 1:
+                    child = children[0]
+                    paths, fewest, most, expected = child.paths, child.fewest, child.most, child.expected
+                else:
+                    paths = sum(child.paths for child in children)
+                    fewest = map(min, *[child.fewest for child in children])
+                    most = map(max, *[child.most for child in children])
+                    expected = [total / len(children)
+                                for total in map(sum, zip(*[child.expected for child in children]))]
+                node.paths = paths
+                node.fewest = tuple(map(add, own, fewest))
+                node.most = tuple(map(add, own, most))
+                node.expected = tuple(map(add, own, expected))
+    
+    def _generate_floor_choices(self, floor, rng):
+        """Generate the 3 columns of a regular floor (a player only reaches those its edges lead to)"""
         # Weight different node types based on floor and act
         weights = self._get_node_weights(floor)
         
@@ -83,7 +174,7 @@ class Act:
         # Add 2 more varied choices
         for _ in range(2):
             if available_types:
-                node_type = random.choices(
+                node_type = rng.choices(
                     available_types, 
                     weights=[weights[t] for t in available_types]
                 )[0]
@@ -118,45 +209,63 @@ class Act:
         return base_weights
     
     def get_current_choices(self):
-        """Get the 3 choices for the current floor"""
-        if self.current_floor < len(self.nodes):
-            return self.nodes[self.current_floor]
-        return []
+        """Get the nodes reachable on the current floor"""
+        if self.current_floor >= self.floors_per_act:
+            return []
+        if self.floors is None:
+            self.floors = self._generate_act()
+        floor = self.floors[self.current_floor]
+        if self.position is None:
+            return floor
+        return [floor[column] for column in self.position.edges]
     
     def advance_floor(self, chosen_node):
         """Advance to next floor after completing chosen node"""
         chosen_node.completed = True
+        self.position = chosen_node
+        self.floors[self.current_floor] = None  # The finished floor is no longer needed
         self.current_floor += 1
-        return self.current_floor < len(self.nodes)  # Returns True if more floors exist
+        return self.current_floor < self.floors_per_act  # Returns True if more floors exist
+    
+    def resume(self, current_floor, column):
+        """Restore progress (for snapshots): the next floor and the column chosen before it"""
+        self.floors = self._generate_act()
+        self.current_floor = current_floor
+        self.position = self.floors[current_floor - 1][column] if current_floor else None
+        for floor in range(current_floor):
+            self.floors[floor] = None
 
 class MapSystem:
-    def __init__(self):
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else RunRng()
         self.current_act = 1
-        self.acts = {}
-        self.player_path = []  # Track which nodes player chose
+        self.player_path = []  # (act, floor, column, NodeType) per node chosen
         self.gold = 100  # Starting currency
         
-        # Initialize all acts
-        for act_num in range(1, 4):  # 3 acts total
-            self.acts[act_num] = Act(act_num)
+        # Only the act in progress is kept; it is created on first use
+        self._act = None
     
     def get_current_act(self):
         """Get the current act"""
-        return self.acts.get(self.current_act)
+        if self.current_act > ACT_COUNT:
+            return None
+        if self._act is None or self._act.act_number != self.current_act:
+            self._act = Act(self.current_act, rng=self.rng)
+        return self._act
     
     def get_current_choices(self):
-        """Get the 3 node choices for current position"""
+        """Get the nodes reachable from the current position (all of the first floor, then its edges)"""
         current_act = self.get_current_act()
         if current_act:
             return current_act.get_current_choices()
         return []
     
     def choose_node(self, node_index):
-        """Player chooses one of the 3 available nodes"""
+        """Player chooses one of the reachable nodes (an index into get_current_choices)"""
         choices = self.get_current_choices()
         if 0 <= node_index < len(choices):
             chosen_node = choices[node_index]
-            self.player_path.append(chosen_node)
+            self.player_path.append((self.current_act, chosen_node.floor, chosen_node.column, chosen_node.type))
             
             # Advance the current act
             current_act = self.get_current_act()
@@ -165,7 +274,8 @@ class MapSystem:
             # Check if act is complete
             if not has_more_floors:
                 self.current_act += 1
-                if self.current_act > 3:
+                self._act = None
+                if self.current_act > ACT_COUNT:
                     return None  # Run complete
             
             return chosen_node
@@ -173,7 +283,7 @@ class MapSystem:
     
     def is_run_complete(self):
         """Check if the entire run is finished"""
-        return self.current_act > 3
+        return self.current_act > ACT_COUNT
     
     def get_act_progress(self):
         """Get current act and floor for UI display"""
@@ -192,18 +302,18 @@ class MapSystem:
         }
         
         if node.type == NodeType.COMBAT:
-            rewards["gold"] = random.randint(10, 18)
+            rewards["gold"] = self.rng.rewards.randint(10, 18)
             rewards["card_choices"] = 1
         elif node.type == NodeType.ELITE:
-            rewards["gold"] = random.randint(25, 35) 
+            rewards["gold"] = self.rng.rewards.randint(25, 35) 
             rewards["card_choices"] = 1
             rewards["relic"] = True
         elif node.type == NodeType.BOSS:
-            rewards["gold"] = random.randint(40, 60)
+            rewards["gold"] = self.rng.rewards.randint(40, 60)
             rewards["card_choices"] = 1
             rewards["relic"] = True
         elif node.type == NodeType.TREASURE:
-            rewards["gold"] = random.randint(20, 30)
+            rewards["gold"] = self.rng.rewards.randint(20, 30)
             rewards["relic"] = True
         elif node.type == NodeType.CAMP:
             rewards["heal"] = 25  # Percentage heal
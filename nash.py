@@ -0,0 +1,129 @@
+"""Exact mixed-strategy equilibria for the per-beat card game.
+
+Each beat is treated as a zero-sum matrix game: the enemy picks a row
+card, the player picks a column card, and the enemy's payoff comes from
+Enemy._calculate_payoff (the player's is its negative). solve_zero_sum
+finds the equilibrium with a small dense simplex, which is exact up to
+float tolerance and fast for the 4x4 to 6x6 games rows produce.
+
+Enemies with strategy "nash" sample from the equilibrium mix. Results
+are cached per sorted pair of row signatures, so the same two rows in
+any order share one entry.
+"""
+
+from cache import LRUCache
+from opponent_model import card_signature
+
+EPSILON = 1e-9
+
+def solve_zero_sum(matrix):
+    """Solve a zero-sum game for the row player (maximizer).
+
+    matrix: list of rows of payoffs to the row player.
+    Returns (row_mix, column_mix, value).
+    """
+    rows = len(matrix)
+    cols = len(matrix[0])
+
+    # Shift payoffs positive so the game value is positive
+    shift = 1 - min(min(row) for row in matrix)
+    a = [[value + shift for value in row] for row in matrix]
+
+    # Column player's LP: maximize sum(w) s.t. a w <= 1, w >= 0.
+    # Tableau columns: w (cols), slacks (rows), right-hand side.
+    width = cols + rows + 1
+    tableau = []
+    for i in range(rows):
+        line = a[i] + [0.0] * rows + [1.0]
+        line[cols + i] = 1.0
+        tableau.append(line)
+    objective = [-1.0] * cols + [0.0] * (rows + 1)
+    basis = [cols + i for i in range(rows)]
+
+    while True:
+        # Bland's rule: lowest-index improving column, so the simplex can't cycle
+        entering = next((j for j in range(width - 1) if objective[j] < -EPSILON), None)
+        if entering is None:
+            break
+        leaving = None
+        best_ratio = None
+        for i in range(rows):
+            coefficient = tableau[i][entering]
+            if coefficient > EPSILON:
+                ratio = tableau[i][-1] / coefficient
+                if (best_ratio is None or ratio < best_ratio - EPSILON
+                        or (ratio < best_ratio + EPSILON and basis[i] < basis[leaving])):
+                    best_ratio = ratio
+                    leaving = i
+
+        pivot_row = tableau[leaving]
+        pivot = pivot_row[entering]
+        for j in range(width):
+            pivot_row[j] /= pivot
+        for line in tableau:
+            if line is not pivot_row:
+                factor = line[entering]
+                if factor:
+                    for j in range(width):
+                        line[j] -= factor * pivot_row[j]
+        factor = objective[entering]
+        for j in range(width):
+            objective[j] -= factor * pivot_row[j]
+        basis[leaving] = entering
+
+    total = objective[-1]  # sum(w) = 1 / shifted game value
+    column_mix = [0.0] * cols
+    for i, var in enumerate(basis):
+        if var < cols:
+            column_mix[var] = tableau[i][-1] / total
+    # The slack columns' reduced costs are the dual solution: the row player's mix
+    row_mix = [max(0.0, objective[cols + i]) / total for i in range(rows)]
+    return row_mix, column_mix, 1 / total - shift
+
+class NashSolver:
+    def __init__(self, maxsize=8192):
+        self.cache = LRUCache(maxsize)
+
+    def strategy(self, enemy, enemy_row, player_row):
+        """Equilibrium mix over enemy_row as a tuple of probabilities.
+
+        The anti-repeat penalty is part of the game: rows holding the card
+        played last beat pay that much less.
+        """
+        last_name = enemy.last_played_card.name if enemy.last_played_card else None
+        low_hp = enemy.hp < enemy.max_hp * 0.3
+        enemy_sigs = [(card_signature(card), card.name == last_name) for card in enemy_row]
+        order = sorted(range(len(enemy_row)), key=enemy_sigs.__getitem__)
+        player_sigs = sorted(card_signature(card) for card in player_row)
+        key = (tuple(enemy_sigs[i] for i in order), tuple(player_sigs), low_hp,
+               enemy.anti_repeat_penalty)
+
+        sorted_mix = self.cache.get(key)
+        if sorted_mix is None:
+            player_sorted = sorted(player_row, key=card_signature)
+            matrix = []
+            for i in order:
+                card = enemy_row[i]
+                penalty = enemy.anti_repeat_penalty if enemy_sigs[i][1] else 0
+                matrix.append([enemy._calculate_payoff(card, theirs) - penalty
+                               for theirs in player_sorted])
+            sorted_mix = tuple(solve_zero_sum(matrix)[0])
+            self.cache.put(key, sorted_mix)
+
+        # Un-permute from signature order back to row slots
+        mix = [0.0] * len(enemy_row)
+        for position, i in enumerate(order):
+            mix[i] = sorted_mix[position]
+        return tuple(mix)
+
+    def stats(self):
+        return self.cache.stats()
+
+_solver = None
+
+def get_nash_solver():
+    """The process-wide NashSolver, created on first use"""
+    global _solver
+    if _solver is None:
+        _solver = NashSolver()
+    return _solver
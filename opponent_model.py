@@ -0,0 +1,88 @@
+"""Level-k opponent modeling for the enemy AI (featurelist.md §6.2).
+
+A level-0 enemy assumes the player picks uniformly from their row. At
+level k the enemy assumes the player is a softmax best-responder to a
+level-(k-1) enemy, and softmax-best-responds to that belief in turn; the
+player's payoff is taken as the negative of the enemy's. Results are
+memoized per canonical (enemy row, player row, HP bucket, last card, k)
+key, so deeper levels only cost extra on the first occurrence of a row
+combination.
+"""
+
+import math
+from cache import LRUCache
+
+MAX_LEVEL = 3
+
+def softmax(values, temperature):
+    """Convert values to a probability distribution (same math as Enemy._softmax)"""
+    if not values:
+        return []
+    max_val = max(values)
+    exp_values = [math.exp((v - max_val) / temperature) for v in values]
+    sum_exp = sum(exp_values)
+    return [exp_val / sum_exp for exp_val in exp_values]
+
+def card_signature(card):
+    """Everything a payoff depends on: the definition plus effective stats"""
+    return (card.definition.id, card.get_effective_speed(),
+            card.get_effective_damage(), card.get_effective_stability())
+
+class LevelKSolver:
+    def __init__(self, maxsize=8192):
+        self.cache = LRUCache(maxsize)
+
+    def strategy(self, enemy, enemy_row, player_row, level):
+        """Enemy mixed strategy over enemy_row as a tuple of probabilities"""
+        level = max(0, min(MAX_LEVEL, level))
+        last_name = enemy.last_played_card.name if enemy.last_played_card else None
+        low_hp = enemy.hp < enemy.max_hp * 0.3
+        # The player row is only ever averaged over, so its order doesn't matter
+        key = (tuple(card_signature(card) for card in enemy_row),
+               tuple(sorted(card_signature(card) for card in player_row)),
+               low_hp, last_name, level, enemy.temperature, enemy.anti_repeat_penalty)
+        probabilities = self.cache.get(key)
+        if probabilities is None:
+            probabilities = self._solve(enemy, enemy_row, player_row, level, last_name)
+            self.cache.put(key, probabilities)
+        return probabilities
+
+    def _solve(self, enemy, enemy_row, player_row, level, last_name):
+        payoffs = [[enemy._calculate_payoff(mine, theirs) for theirs in player_row]
+                   for mine in enemy_row]
+        penalties = [enemy.anti_repeat_penalty if last_name is not None and card.name == last_name else 0
+                     for card in enemy_row]
+        temperature = enemy.temperature
+
+        # Level 0: the player is assumed uniform
+        belief = [1 / len(player_row)] * len(player_row)
+        mix = self._respond(payoffs, belief, penalties, temperature)
+        for _ in range(level):
+            # Player best-responds (softmax) to the previous enemy level, zero-sum
+            player_values = [-sum(mix[i] * payoffs[i][j] for i in range(len(enemy_row)))
+                             for j in range(len(player_row))]
+            belief = softmax(player_values, temperature)
+            mix = self._respond(payoffs, belief, penalties, temperature)
+        return tuple(mix)
+
+    def _respond(self, payoffs, belief, penalties, temperature):
+        """Enemy softmax response to a belief about the player's mix"""
+        if len(set(belief)) == 1:
+            # Uniform belief: plain average, exactly as Enemy.choose_card always did
+            values = [sum(row) / len(row) for row in payoffs]
+        else:
+            values = [sum(p * v for p, v in zip(belief, row)) for row in payoffs]
+        values = [value - penalty for value, penalty in zip(values, penalties)]
+        return softmax(values, temperature)
+
+    def stats(self):
+        return self.cache.stats()
+
+_solver = None
+
+def get_level_k_solver():
+    """The process-wide LevelKSolver, created on first use"""
+    global _solver
+    if _solver is None:
+        _solver = LevelKSolver()
+    return _solver
@@ -0,0 +1,88 @@
+"""Adaptive frame pacing for the main loop.
+
+The game is beat based, so most of the time nothing moves. While idle the
+loop blocks in pygame.event.wait and wakes only for input (or a periodic
+timeout); only while something animates does it tick at the full frame
+rate.
+"""
+
+import time
+import pygame
+
+class FramePacer:
+    def __init__(self, active_fps=60, idle_timeout_ms=1000):
+        self.active_fps = active_fps
+        self.idle_timeout_ms = idle_timeout_ms
+        self.clock = pygame.time.Clock()
+        self._last_time = time.perf_counter()
+
+        # Pacing stats
+        self.loops = 0
+        self.active_loops = 0
+        self.idle_wakeups = 0
+        self.idle_timeouts = 0
+        self.frames_presented = 0
+        self.active_time = 0.0
+        self.idle_time = 0.0
+        self.present_time = 0.0
+        self._started = self._last_time
+
+    def wait(self, animating):
+        """Wait for the next loop iteration.
+
+        Returns (events, dt): the pending events and seconds since the
+        previous iteration.
+        """
+        self.loops += 1
+        if animating:
+            self.active_loops += 1
+            self.clock.tick(self.active_fps)
+            events = pygame.event.get()
+        else:
+            # Block until input arrives; the timeout keeps the loop alive for housekeeping
+            first = pygame.event.wait(self.idle_timeout_ms)
+            if first.type == pygame.NOEVENT:
+                self.idle_timeouts += 1
+                events = []
+            else:
+                self.idle_wakeups += 1
+                events = [first] + pygame.event.get()
+            # Don't let the idle period count against the next active tick
+            self.clock.tick()
+
+        now = time.perf_counter()
+        dt = now - self._last_time
+        self._last_time = now
+        if animating:
+            self.active_time += dt
+        else:
+            self.idle_time += dt
+        return events, dt
+
+    def record_present(self, seconds):
+        """Count a frame that was drawn and pushed to the display"""
+        self.frames_presented += 1
+        self.present_time += seconds
+
+    def stats(self):
+        """Frame pacing counters and derived rates"""
+        elapsed = max(time.perf_counter() - self._started, 1e-9)
+        return {
+            "elapsed_s": elapsed,
+            "loops": self.loops,
+            "active_loops": self.active_loops,
+            "idle_wakeups": self.idle_wakeups,
+            "idle_timeouts": self.idle_timeouts,
+            "frames_presented": self.frames_presented,
+            "presented_fps": self.frames_presented / elapsed,
+            "avg_present_ms": 1000 * self.present_time / self.frames_presented if self.frames_presented else 0.0,
+            "active_fraction": self.active_time / elapsed,
+        }
+
+    def summary(self):
+        """One-line human-readable stats"""
+        s = self.stats()
+        return (f"{s['elapsed_s']:.1f}s: {s['loops']} loops ({s['active_loops']} active, "
+                f"{s['idle_wakeups']} input wakeups, {s['idle_timeouts']} idle timeouts), "
+                f"{s['frames_presented']} frames presented ({s['presented_fps']:.2f} fps, "
+                f"{s['avg_present_ms']:.2f} ms avg draw), active {s['active_fraction']:.0%} of the time")
@@ -0,0 +1,105 @@
+"""Precomputed card-vs-card payoffs for the enemy AI.
+
+Enemy._calculate_payoff scores an enemy card against a player card from
+their types and effective stats. Those only change through modifiers, so
+the scores for unmodified cards are tabulated once per pair of CardDef
+ids; modified cards are scored from the same formula and cached per
+modifier bucket. The low-HP adjustment depends only on the enemy card's
+type and is added on top.
+"""
+
+from card import CARD_DEFS, CardType
+from cache import LRUCache
+
+# Payoff from the type matchup alone: counters and dodges that beat the
+# opposing card (+2), guards against attacks and grapples (+1)
+_TYPE_BONUS = {}
+for _mine in CardType:
+    for _theirs in CardType:
+        _bonus = 0
+        if _mine == CardType.COUNTER and _theirs == CardType.ATTACK:
+            _bonus += 2
+        elif _mine == CardType.DODGE and _theirs in (CardType.ATTACK, CardType.GRAPPLE):
+            _bonus += 2
+        if _mine == CardType.GUARD and _theirs in (CardType.ATTACK, CardType.GRAPPLE):
+            _bonus += 1
+        _TYPE_BONUS[_mine, _theirs] = _bonus
+
+# Played defensively when the enemy is below 30% HP
+_LOW_HP_BONUS = {card_type: 1 if card_type in (CardType.GUARD, CardType.DODGE) else 0
+                 for card_type in CardType}
+
+def score(my_type, my_speed, my_damage, my_stability, their_type, their_speed, their_damage):
+    """Payoff of one card against another from types and effective stats (HP aside)"""
+    payoff = my_damage  # Base damage value
+    if my_speed > their_speed:
+        payoff += 1  # Acting first is valuable
+    payoff += _TYPE_BONUS[my_type, their_type]
+    if their_damage >= my_stability:
+        payoff -= 2  # Getting stunned is bad
+    return payoff
+
+def _base_stats(definition):
+    """Effective (speed, damage, stability) of an unmodified card"""
+    return max(1, definition.speed), max(0, definition.damage), max(1, definition.stability)
+
+class PayoffTable:
+    def __init__(self, maxsize=4096):
+        self.rows = []  # rows[my def id][their def id] -> payoff at zero modifiers
+        self.low_hp_bonus = []  # per def id
+        self._modified = LRUCache(maxsize)
+
+    def sync(self):
+        """Extend the table to cover every CardDef registered so far"""
+        size = len(CARD_DEFS)
+        old = len(self.rows)
+        if old == size:
+            return
+        stats = [_base_stats(definition) for definition in CARD_DEFS]
+        for my_id in range(size):
+            mine = CARD_DEFS[my_id]
+            speed, damage, stability = stats[my_id]
+            start = old if my_id < old else 0
+            if my_id >= old:
+                self.rows.append([])
+                self.low_hp_bonus.append(_LOW_HP_BONUS[mine.type])
+            row = self.rows[my_id]
+            for their_id in range(start, size):
+                theirs = CARD_DEFS[their_id]
+                their_speed, their_damage, _ = stats[their_id]
+                row.append(score(mine.type, speed, damage, stability,
+                                 theirs.type, their_speed, their_damage))
+
+    def payoff(self, my_card, their_card, low_hp=False):
+        """Payoff of my_card against their_card, as Enemy._calculate_payoff"""
+        my_id = my_card.definition.id
+        their_id = their_card.definition.id
+        if my_id >= len(self.rows) or their_id >= len(self.rows):
+            self.sync()
+
+        if (my_card.speed_modifier or my_card.damage_modifier or my_card.stability_modifier
+                or their_card.speed_modifier or their_card.damage_modifier):
+            key = (my_id, their_id, my_card.speed_modifier, my_card.damage_modifier,
+                   my_card.stability_modifier, their_card.speed_modifier, their_card.damage_modifier)
+            value = self._modified.get(key)
+            if value is None:
+                value = score(my_card.type, my_card.get_effective_speed(), my_card.get_effective_damage(),
+                              my_card.get_effective_stability(), their_card.type,
+                              their_card.get_effective_speed(), their_card.get_effective_damage())
+                self._modified.put(key, value)
+        else:
+            value = self.rows[my_id][their_id]
+
+        if low_hp:
+            value += self.low_hp_bonus[my_id]
+        return value
+
+_table = None
+
+def get_payoff_table():
+    """The process-wide PayoffTable, created (and synced) on first use"""
+    global _table
+    if _table is None:
+        _table = PayoffTable()
+        _table.sync()
+    return _table
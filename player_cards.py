@@ -0,0 +1,35 @@
+"""Player starting deck (Appendix A starter list plus a few extras)."""
+
+from card import Card, CardType, define_card
+from deck import Deck
+
+STARTER_CARDS = [
+    ("Quick Jab", CardType.ATTACK, 5, 1, 1, "Deal 1", "Read: +1 dmg", "Clash: both take 1"),
+    ("Heavy Swing", CardType.ATTACK, 2, 4, 3, "Deal 4", "", "Clash: both take 2"),
+    ("Lunge", CardType.ATTACK, 4, 2, 2, "Deal 2; if first, +1 dmg", "", ""),
+    ("Guard Wall", CardType.GUARD, 1, 0, 4, "Prevent 4; if not hit, next beat +1 Speed", "", ""),
+    ("Parry", CardType.COUNTER, 4, 2, 2, "If foe Attack and first, cancel it; deal 2", "", ""),
+    ("Sidestep", CardType.DODGE, 6, 0, 1, "If foe Attack/Grapple, misses; Charge", "", "Clash: no effect"),
+    ("Grapple", CardType.GRAPPLE, 3, 2, 2, "Deal 2; Stun even if dmg < Stability", "", ""),
+    ("Choke Chain", CardType.GRAPPLE, 2, 1, 3, "Deal 1; Slow 1 next beat", "", ""),
+    ("Disrupt", CardType.TRICK, 5, 1, 1, "Foe Slow 2 this beat; deal 1", "", ""),
+    ("Focus", CardType.PREP, 2, 0, 3, "Heal 2; next beat +1 Stability", "Effect: heal", ""),
+    ("Ignite", CardType.SKILL, 3, 1, 2, "Deal 1; Bleed 1 (2 beats)", "Read: +Bleed 1", ""),
+    ("Feint", CardType.TRICK, 6, 1, 1, "After reveal, swap with unplayed; resolves S5", "Read: +1 dmg", ""),
+    ("Piercing Strike", CardType.ATTACK, 3, 3, 2, "Deal 3; Ignore guard", "", ""),
+    ("Deep Cut", CardType.ATTACK, 4, 1, 2, "Deal 1; Bleed 2 (3 beats)", "Read: +1 dmg", ""),
+    ("Reinforce", CardType.GUARD, 2, 0, 4, "Prevent 6", "", "")
+]
+
+def create_starting_deck(rng=None):
+    """Create the starting deck with 2 copies of each starter card.
+
+    rng is the run's RunRng; its shuffle stream drives the deck.
+    """
+    cards = []
+    for card_spec in STARTER_CARDS:
+        definition = define_card(*card_spec)
+        for _ in range(2):  # 2 copies each
+            cards.append(Card.from_def(definition))
+    
+    return Deck(cards, rng=rng.shuffle if rng is not None else None)
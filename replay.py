@@ -0,0 +1,109 @@
+"""Deterministic replay of recorded runs.
+
+Replayer re-executes a RunRecording headlessly. Every snapshot_every
+beats it keeps a binary snapshot of the whole run (see snapshot.py), so
+seeking to beat N only replays the inputs after the nearest earlier
+snapshot.
+
+Example:
+    python replay.py run.json --beat 120
+"""
+
+import argparse
+import bisect
+import time
+
+from run import BEAT, Run, RunRecording
+from snapshot import load_run, save_run
+
+class Replayer:
+    def __init__(self, recording, snapshot_every=64):
+        self.recording = recording
+        self.snapshot_every = snapshot_every
+        # Parallel lists, ordered by beat: beats played, next input index, snapshot
+        self._snapshot_beats = [0]
+        self._snapshot_inputs = [0]
+        self._snapshots = [self._snapshot(Run(recording.seed))]
+
+    def _snapshot(self, run):
+        return save_run(run)
+
+    def _restore(self, snapshot):
+        return load_run(snapshot)
+
+    def _advance(self, run, position, stop_beat=None):
+        """Apply inputs from position until stop_beat beats are played (or the end).
+
+        Returns the next input position.
+        """
+        inputs = self.recording.inputs
+        while position < len(inputs):
+            if stop_beat is not None and run.beats_played >= stop_beat:
+                break
+            entry = inputs[position]
+            run.apply(entry)
+            position += 1
+            if entry[0] == BEAT and run.beats_played % self.snapshot_every == 0:
+                self._remember(run, position)
+        return position
+
+    def _remember(self, run, position):
+        index = bisect.bisect_left(self._snapshot_beats, run.beats_played)
+        if index < len(self._snapshot_beats) and self._snapshot_beats[index] == run.beats_played:
+            return
+        self._snapshot_beats.insert(index, run.beats_played)
+        self._snapshot_inputs.insert(index, position)
+        self._snapshots.insert(index, self._snapshot(run))
+
+    def seek(self, beat):
+        """The run right after its first `beat` beats (before any later input)"""
+        index = bisect.bisect_right(self._snapshot_beats, beat) - 1
+        run = self._restore(self._snapshots[index])
+        self._advance(run, self._snapshot_inputs[index], stop_beat=beat)
+        return run
+
+    def play(self):
+        """Replay the whole recording; returns the final Run"""
+        index = len(self._snapshots) - 1
+        run = self._restore(self._snapshots[index])
+        self._advance(run, self._snapshot_inputs[index])
+        return run
+
+def describe(run):
+    """One-paragraph state summary for bug reports"""
+    act, floor, floors = run.map_system.get_act_progress()
+    lines = [
+        f"Act {act}, floor {floor}/{floors}; {run.beats_played} beats played, "
+        f"{run.fights_won} fights won, {run.fights_lost} lost",
+    ]
+    engine = run.engine
+    if engine is not None:
+        lines.append(f"In combat vs {engine.enemy.name}: beat {engine.beat_number}, "
+                     f"player {engine.player_hp}/{engine.player_max_hp} HP, "
+                     f"enemy {engine.enemy.hp}/{engine.enemy.max_hp} HP")
+        lines.append("Player row: " + ", ".join(card.name for card in engine.player_deck.hand))
+        lines.append("Enemy row: " + ", ".join(card.name for card in engine.enemy.deck.hand))
+    deck = run.player_deck
+    lines.append(f"Deck: {deck.get_deck_size()} draw, {deck.get_discard_size()} discard, "
+                 f"{len(deck.burned_pile)} burned")
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded run headlessly")
+    parser.add_argument("recording", help="run recording (main.py --record)")
+    parser.add_argument("--beat", type=int, default=None, help="stop after this many beats")
+    parser.add_argument("--snapshot-every", type=int, default=64)
+    args = parser.parse_args()
+
+    recording = RunRecording.load(args.recording)
+    replayer = Replayer(recording, args.snapshot_every)
+    start = time.perf_counter()
+    run = replayer.play() if args.beat is None else replayer.seek(args.beat)
+    elapsed = time.perf_counter() - start
+
+    print(f"Seed: {recording.seed}")
+    print(describe(run))
+    print(f"Replayed {run.beats_played} beats in {elapsed * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
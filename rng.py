@@ -0,0 +1,120 @@
+"""Seeded random streams for a run.
+
+A run owns one RunRng. It splits the run seed into independent
+random.Random sub-streams (map layout, encounters, deck shuffles, enemy
+AI, rewards, ...), so consuming numbers in one system never shifts
+another, and a run can be reproduced from its exported seed.
+"""
+
+import hashlib
+import random
+import secrets
+
+# Streams used by the game; other names can be requested through stream()
+STREAMS = ("map", "encounters", "shuffle", "ai", "rewards")
+
+SEED_BITS = 64
+_SEED_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+def derive_seed(seed, *path):
+    """Derive an independent 64-bit seed for a named sub-stream.
+
+    The derivation is a keyed hash, so sibling streams and spawned child
+    runs don't collide even for consecutive parent seeds.
+    """
+    key = "/".join(str(part) for part in (seed,) + path).encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+def seed_to_string(seed):
+    """Format a seed as a short base-36 code for sharing"""
+    if seed == 0:
+        return "0"
+    digits = []
+    while seed:
+        seed, remainder = divmod(seed, 36)
+        digits.append(_SEED_ALPHABET[remainder])
+    return "".join(reversed(digits))
+
+def seed_from_string(text):
+    """Parse a seed code produced by seed_to_string"""
+    return int(text.strip().replace("-", ""), 36)
+
+class RunRng:
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = secrets.randbits(SEED_BITS)
+        self.seed = seed
+        self._streams = {}
+
+    @classmethod
+    def from_seed_string(cls, text):
+        """Create the RNG for a run from an exported seed code"""
+        return cls(seed_from_string(text))
+
+    def export_seed(self):
+        """Seed code that reproduces this run"""
+        return seed_to_string(self.seed)
+
+    def stream(self, name):
+        """Get (creating on first use) the named sub-stream"""
+        stream = self._streams.get(name)
+        if stream is None:
+            stream = random.Random(derive_seed(self.seed, name))
+            self._streams[name] = stream
+        return stream
+
+    def stream_name(self, stream):
+        """Name of a cached stream object, or None if it isn't one of ours"""
+        for name, candidate in self._streams.items():
+            if candidate is stream:
+                return name
+        return None
+
+    def substream(self, *path):
+        """Create a fresh, uncached stream for a sub-path (e.g. "map", 2)"""
+        return random.Random(derive_seed(self.seed, *path))
+
+    def spawn(self, index):
+        """Child RunRng for sharding, e.g. one per simulated fight"""
+        return RunRng(derive_seed(self.seed, "spawn", index))
+
+    @property
+    def map(self):
+        return self.stream("map")
+
+    @property
+    def encounters(self):
+        return self.stream("encounters")
+
+    @property
+    def shuffle(self):
+        return self.stream("shuffle")
+
+    @property
+    def ai(self):
+        return self.stream("ai")
+
+    @property
+    def rewards(self):
+        return self.stream("rewards")
+
+    def getstate(self):
+        """Snapshot of the seed and every stream created so far"""
+        return self.seed, {name: stream.getstate() for name, stream in self._streams.items()}
+
+    def setstate(self, state):
+        """Restore a snapshot taken with getstate.
+
+        Existing stream objects are rewound in place, so decks and enemies
+        holding them stay in sync.
+        """
+        self.seed, stream_states = state
+        for name in list(self._streams):
+            if name not in stream_states:
+                del self._streams[name]
+        for name, stream_state in stream_states.items():
+            stream = self._streams.get(name)
+            if stream is None:
+                stream = random.Random()
+                self._streams[name] = stream
+            stream.setstate(stream_state)
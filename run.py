@@ -0,0 +1,133 @@
+"""Headless runs and input recording.
+
+A run is fully determined by its seed code and the player's inputs: the
+node picked on each map floor and, for every combat beat, the row slot
+of the card played and the predicted enemy slot. RunRecording captures
+exactly that; Run drives the same systems the game uses (MapSystem,
+CombatEngine, the starting deck and enemy factory) without pygame, so a
+recording can be re-executed far faster than real time (see replay.py).
+"""
+
+import json
+from combat_engine import CombatEngine
+from enemies import create_enemy
+from map_system import MapSystem, NodeType
+from player_cards import create_starting_deck
+from rng import RunRng
+
+RECORDING_VERSION = 3  # 3: branching maps (older seeds lay out differently)
+
+# Input kinds
+NODE = "node"  # (NODE, node_index)
+BEAT = "beat"  # (BEAT, card_slot, prediction_slot)
+
+# Map nodes that start a fight, as create_enemy (elite, boss) flags
+COMBAT_NODES = {
+    NodeType.COMBAT: (False, False),
+    NodeType.ELITE: (True, False),
+    NodeType.BOSS: (False, True),
+}
+
+class RunRecording:
+    """A run as its seed code plus the player's inputs, in order.
+
+    Also a CombatEngine listener, so the game can record beats by
+    attaching it to each fight.
+    """
+
+    def __init__(self, seed, inputs=None):
+        self.seed = seed
+        self.inputs = inputs if inputs is not None else []
+
+    def node(self, node_index):
+        self.inputs.append((NODE, node_index))
+
+    def beat(self, card_slot, prediction_slot):
+        self.inputs.append((BEAT, card_slot, prediction_slot))
+
+    def on_beat_resolved(self, engine):
+        self.beat(engine.player_selected_slot, engine.player_prediction_slot)
+
+    def on_beat_end(self, engine):
+        pass
+
+    def beat_count(self):
+        return sum(1 for entry in self.inputs if entry[0] == BEAT)
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump({"version": RECORDING_VERSION, "seed": self.seed,
+                       "inputs": [list(entry) for entry in self.inputs]}, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("version") != RECORDING_VERSION:
+            raise ValueError(f"{path}: unsupported recording version {data.get('version')}")
+        return cls(data["seed"], [tuple(entry) for entry in data["inputs"]])
+
+class Run:
+    """One run of the game, played headlessly through its inputs"""
+
+    def __init__(self, seed=None):
+        # seed is an exported seed code, as accepted by main.py --seed
+        self.rng = RunRng.from_seed_string(seed) if seed else RunRng()
+        self.player_deck = create_starting_deck(self.rng)
+        self.map_system = MapSystem(self.rng)
+        self.engine = None  # Current fight, if any
+        self.beats_played = 0
+        self.fights_won = 0
+        self.fights_lost = 0
+        self.recording = RunRecording(self.rng.export_seed())
+
+    def in_combat(self):
+        return self.engine is not None
+
+    def is_complete(self):
+        return self.map_system.is_run_complete()
+
+    def choose_node(self, node_index):
+        """Pick a node on the current floor, starting its fight if it has one"""
+        if self.engine is not None:
+            raise ValueError("can't leave a fight in progress")
+        if not 0 <= node_index < len(self.map_system.get_current_choices()):
+            return None
+        self.recording.node(node_index)
+        node = self.map_system.choose_node(node_index)
+        if node is None:
+            return None  # That was the last floor of the run
+
+        if node.type in COMBAT_NODES:
+            elite, boss = COMBAT_NODES[node.type]
+            # Same act lookup as Game._start_combat (after the map advanced)
+            enemy = create_enemy(self.map_system.current_act, elite, boss, self.rng)
+            self.engine = CombatEngine(self.player_deck, enemy)
+        return node
+
+    def play_beat(self, card_slot, prediction_slot):
+        """Play the card in row slot card_slot and predict enemy slot prediction_slot.
+
+        Returns the fight outcome, or None while the fight continues.
+        """
+        engine = self.engine
+        if engine is None:
+            raise ValueError("not in a fight")
+        outcome = engine.step(engine.player_deck.hand[card_slot], prediction_slot)
+        self.recording.beat(card_slot, prediction_slot)
+        self.beats_played += 1
+        if outcome:
+            if outcome == "victory":
+                self.fights_won += 1
+            else:
+                self.fights_lost += 1
+            self.engine = None
+        return outcome
+
+    def apply(self, entry):
+        """Replay one recorded input"""
+        if entry[0] == NODE:
+            return self.choose_node(entry[1])
+        if entry[0] == BEAT:
+            return self.play_beat(entry[1], entry[2])
+        raise ValueError(f"unknown input {entry!r}")
@@ -0,0 +1,235 @@
+"""Monte Carlo batch fight simulator.
+
+Plays many headless fights of a player deck against one enemy template
+and reports win rate, beats-to-kill and HP-loss distributions. Fights
+are split into chunks and spread over a process pool, so throughput
+scales with the number of cores.
+
+Example:
+    python simulate.py --enemy "Brawler Pup" --fights 100000 --policy greedy
+"""
+
+import argparse
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from combat_engine import CombatEngine
+from deck import Deck
+from enemies import create_enemy_from_template, find_template, template_act
+from player_cards import create_starting_deck
+from rng import RunRng
+from telemetry import BeatLogWriter
+
+MAX_BEATS = 200  # Safety cap; fights this long are counted as stalled
+
+# Player AI policies. Each takes (engine, rng) and returns
+# (card, prediction_slot) for the current beat. They must be module-level
+# functions so worker processes can unpickle them.
+
+def random_policy(engine, rng):
+    """Play a random card and predict a random enemy slot"""
+    card = rng.choice(engine.player_deck.hand)
+    slot = rng.randrange(len(engine.enemy.deck.hand))
+    return card, slot
+
+def greedy_policy(engine, rng):
+    """Play the hardest-hitting card and predict the foe's hardest hitter"""
+    hand = engine.player_deck.hand
+    card = max(hand, key=lambda c: (c.get_effective_damage(), c.get_effective_speed()))
+    enemy_hand = engine.enemy.deck.hand
+    slot = max(range(len(enemy_hand)), key=lambda i: enemy_hand[i].get_effective_damage())
+    return card, slot
+
+POLICIES = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+}
+
+class SimulationResult:
+    """Aggregated outcome of a batch of fights"""
+
+    def __init__(self):
+        self.fights = 0
+        self.wins = 0
+        self.losses = 0
+        self.stalls = 0
+        self.beats_to_kill = Counter()  # beats -> number of won fights
+        self.hp_loss = Counter()        # player HP lost -> number of fights
+
+    @property
+    def win_rate(self):
+        return self.wins / self.fights if self.fights else 0.0
+
+    def record(self, outcome, beats, hp_lost):
+        """Add one finished fight"""
+        self.fights += 1
+        if outcome == "victory":
+            self.wins += 1
+            self.beats_to_kill[beats] += 1
+        elif outcome == "defeat":
+            self.losses += 1
+        else:
+            self.stalls += 1
+        self.hp_loss[hp_lost] += 1
+
+    def merge(self, other):
+        """Fold another result (e.g. from a worker) into this one"""
+        self.fights += other.fights
+        self.wins += other.wins
+        self.losses += other.losses
+        self.stalls += other.stalls
+        self.beats_to_kill.update(other.beats_to_kill)
+        self.hp_loss.update(other.hp_loss)
+        return self
+
+    def summary(self):
+        """Human-readable report"""
+        lines = [
+            f"Fights: {self.fights}  Wins: {self.wins}  Losses: {self.losses}  Stalls: {self.stalls}",
+            f"Win rate: {self.win_rate:.1%}",
+            f"Beats to kill: mean {_mean(self.beats_to_kill):.2f}, "
+            f"p50 {_percentile(self.beats_to_kill, 0.5)}, p90 {_percentile(self.beats_to_kill, 0.9)}",
+            f"HP lost: mean {_mean(self.hp_loss):.2f}, "
+            f"p50 {_percentile(self.hp_loss, 0.5)}, p90 {_percentile(self.hp_loss, 0.9)}",
+        ]
+        return "\n".join(lines)
+
+def _mean(histogram):
+    total = sum(histogram.values())
+    if not total:
+        return 0.0
+    return sum(value * count for value, count in histogram.items()) / total
+
+def _percentile(histogram, fraction):
+    total = sum(histogram.values())
+    if not total:
+        return None
+    threshold = fraction * total
+    running = 0
+    for value in sorted(histogram):
+        running += histogram[value]
+        if running >= threshold:
+            return value
+    return max(histogram)
+
+def run_fight(deck_cards, template, policy, rng, max_beats=MAX_BEATS, opponent=None, telemetry=None):
+    """Play one headless fight. Returns (outcome, beats, player HP lost).
+
+    rng is a RunRng owned by this fight; the policy draws from its
+    "policy" stream, so fights never share random state. opponent
+    overrides the enemy's AI strategy (e.g. "nash" for an optimal-opponent
+    baseline); None keeps the template's tier default. telemetry is an
+    optional BeatLogWriter that records every beat.
+    """
+    deck = Deck([card.copy() for card in deck_cards], rng=rng.shuffle)
+    deck.shuffle()
+    enemy = create_enemy_from_template(template, rng)
+    if opponent is not None:
+        enemy.strategy = opponent
+    engine = CombatEngine(deck, enemy)
+    if telemetry is not None:
+        telemetry.act = template_act(template)
+        telemetry.attach(engine)
+    policy_rng = rng.stream("policy")
+
+    outcome = None
+    while engine.beat_number <= max_beats:
+        # Burned-out rows can't continue the fight
+        if not deck.hand or not enemy.deck.hand:
+            break
+        card, slot = policy(engine, policy_rng)
+        outcome = engine.step(card, slot)
+        if outcome:
+            break
+
+    hp_lost = engine.player_max_hp - max(0, engine.player_hp)
+    return outcome, engine.beat_number, hp_lost
+
+def _run_chunk(deck_cards, template, policy, seed, start, count, opponent=None, telemetry=None):
+    """Worker entry point: play fights start..start+count of a batch.
+
+    Fight i always gets RunRng(seed).spawn(i), so results don't depend on
+    how fights were split across workers. With a telemetry path prefix
+    the chunk writes its beats to PREFIX-<start>.beats.
+    """
+    batch_rng = RunRng(seed)
+    result = SimulationResult()
+    writer = BeatLogWriter(f"{telemetry}-{start:09d}.beats") if telemetry else None
+    try:
+        for index in range(start, start + count):
+            result.record(*run_fight(deck_cards, template, policy, batch_rng.spawn(index),
+                                     opponent=opponent, telemetry=writer))
+    finally:
+        if writer:
+            writer.close()
+    return result
+
+def simulate(deck_cards, template, policy, fights, workers=None, seed=None, chunk_size=None,
+             opponent=None, telemetry=None):
+    """Simulate `fights` fights of a deck against an enemy template.
+
+    deck_cards: list of Card (e.g. create_starting_deck().get_all_cards())
+    template: an entry from enemies.ENEMY_TEMPLATES
+    policy: player AI callable, see POLICIES
+    workers: process count (default: all cores); 1 runs in-process
+    opponent: enemy strategy override ("level_k" or "nash"), see run_fight
+    telemetry: beat log path prefix; each chunk writes its own log
+    """
+    workers = workers or os.cpu_count() or 1
+    if seed is None:
+        seed = RunRng().seed
+    if chunk_size is None:
+        # A few chunks per worker keeps the pool balanced without much IPC
+        chunk_size = max(1, min(5000, -(-fights // (workers * 4))))
+
+    chunks = [(start, min(chunk_size, fights - start)) for start in range(0, fights, chunk_size)]
+
+    result = SimulationResult()
+    if workers == 1:
+        for start, count in chunks:
+            result.merge(_run_chunk(deck_cards, template, policy, seed, start, count, opponent,
+                                    telemetry))
+        return result
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_run_chunk, deck_cards, template, policy, seed, start, count, opponent,
+                               telemetry)
+                   for start, count in chunks]
+        for future in futures:
+            result.merge(future.result())
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch-simulate fights against one enemy")
+    parser.add_argument("--enemy", default="Brawler Pup", help="enemy template name")
+    parser.add_argument("--act", type=int, default=None, help="restrict template lookup to an act")
+    parser.add_argument("--fights", type=int, default=10000)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="random")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--opponent", choices=["level_k", "nash"], default=None,
+                        help="override the enemy AI strategy (nash: optimal-opponent baseline)")
+    parser.add_argument("--telemetry", metavar="PREFIX",
+                        help="write per-beat records to PREFIX-<chunk>.beats logs")
+    args = parser.parse_args()
+
+    template = find_template(args.enemy, args.act)
+    if template is None:
+        parser.error(f"unknown enemy template: {args.enemy}")
+
+    deck_cards = create_starting_deck().get_all_cards()
+    start = time.perf_counter()
+    result = simulate(deck_cards, template, POLICIES[args.policy], args.fights,
+                      workers=args.workers, seed=args.seed, opponent=args.opponent,
+                      telemetry=args.telemetry)
+    elapsed = time.perf_counter() - start
+
+    opponent = f", {args.opponent} opponent" if args.opponent else ""
+    print(f"{args.enemy} vs starting deck ({args.policy} policy{opponent})")
+    print(result.summary())
+    print(f"Elapsed: {elapsed:.2f}s ({result.fights / elapsed:.0f} fights/s)")
+
+if __name__ == "__main__":
+    main()
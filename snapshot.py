@@ -0,0 +1,406 @@
+"""Compact binary snapshots of run state.
+
+A snapshot captures everything needed to resume a run exactly: the RNG
+streams, the player's deck, the map, the current fight (engine and
+enemy) and the run's input recording. Cards are stored as indices into
+a small definition table written with the snapshot, so snapshots don't
+depend on the CardDef ids of the process that wrote them. Cards
+referenced from combat state (selected card, enemy's last card) are
+stored as deck handles.
+
+Layout: magic, version, the definition table, then the sections in a
+fixed order. All integers are little-endian.
+"""
+
+import random
+import struct
+import sys
+from array import array
+from collections import namedtuple
+
+from card import Card, CardType, define_card
+from combat_engine import CombatEngine, CombatPhase
+from deck import Deck, Zone
+from enemy import Enemy
+from map_system import ACT_COUNT, Act, MapSystem, NodeType
+from rng import RunRng
+from status import STATUSES, StatusEffects
+from run import Run, RunRecording
+
+MAGIC = b"NTOVSNAP"
+VERSION = 5  # 5: one status slot (bleed)
+
+_CARD_TYPES = list(CardType)
+_NODE_TYPES = list(NodeType)
+_PHASES = list(CombatPhase)
+_ORDERS = [None, "player", "enemy", "clash"]
+_INPUT_KINDS = ["node", "beat"]
+
+# Deck entry: def index, speed/damage/stability modifiers, flags, zone, slot
+_CARD = struct.Struct("<HhhhBBh")
+_CARD_STUNNED = 1
+_CARD_READ_TRIGGERED = 2
+_ZONES = list(Zone)
+_DEF = struct.Struct("<Biii")
+_DEF_FIELD_SEPARATOR = "\x1f"  # Joins a definition's name, effect, read and clash text
+_MT_STATE_WORDS = 625  # random.Random internal state: 624 words plus the index
+_SWAP_WORDS = sys.byteorder != "little"
+_STATUS = struct.Struct(f"<{len(STATUSES)}h{len(STATUSES)}H")
+
+_structs = {}
+
+def _struct(fmt):
+    compiled = _structs.get(fmt)
+    if compiled is None:
+        compiled = _structs[fmt] = struct.Struct(fmt)
+    return compiled
+
+RunState = namedtuple("RunState", "rng player_deck map_system engine counters recording screen")
+
+class _Writer:
+    def __init__(self):
+        self.buf = bytearray()
+        self.definitions = []
+        self._def_index = {}
+
+    def pack(self, fmt, *values):
+        self.buf += _struct(fmt).pack(*values)
+
+    def string(self, text):
+        data = text.encode("utf-8")
+        self.pack("<H", len(data))
+        self.buf += data
+
+    def optional(self, value):
+        self.pack("<i", -1 if value is None else value)
+
+    def card(self, card, zone, slot):
+        definition = card.definition
+        index = self._def_index.get(definition)
+        if index is None:
+            index = len(self.definitions)
+            self.definitions.append(definition)
+            self._def_index[definition] = index
+        flags = (_CARD_STUNNED if card.stunned else 0) | (_CARD_READ_TRIGGERED if card.read_triggered else 0)
+        self.buf += _CARD.pack(index, card.speed_modifier, card.damage_modifier,
+                               card.stability_modifier, flags, zone, slot)
+
+class _Reader:
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+        self.definitions = []
+
+    def unpack(self, fmt):
+        compiled = _struct(fmt)
+        values = compiled.unpack_from(self.data, self.offset)
+        self.offset += compiled.size
+        return values
+
+    def take(self, size):
+        data = self.data[self.offset:self.offset + size]
+        self.offset += size
+        return data
+
+    def one(self, fmt):
+        return self.unpack(fmt)[0]
+
+    def string(self):
+        length = self.one("<H")
+        text = bytes(self.data[self.offset:self.offset + length]).decode("utf-8")
+        self.offset += length
+        return text
+
+    def optional(self):
+        value = self.one("<i")
+        return None if value < 0 else value
+
+    def card(self):
+        """Returns (card, zone, slot)"""
+        index, speed, damage, stability, flags, zone, slot = _CARD.unpack_from(self.data, self.offset)
+        self.offset += _CARD.size
+        card = Card.from_def(self.definitions[index])
+        card.speed_modifier = speed
+        card.damage_modifier = damage
+        card.stability_modifier = stability
+        card.stunned = bool(flags & _CARD_STUNNED)
+        card.read_triggered = bool(flags & _CARD_READ_TRIGGERED)
+        return card, _ZONES[zone], slot
+
+# RNG
+
+def _write_rng(w, rng):
+    seed, streams = rng.getstate()
+    w.pack("<QH", seed, len(streams))
+    for name, (version, internal, gauss_next) in streams.items():
+        w.string(name)
+        w.pack("<B", version)
+        words = array("I", internal)
+        if _SWAP_WORDS:
+            words.byteswap()
+        w.buf += words.tobytes()
+        w.pack("<?d", gauss_next is not None, gauss_next or 0.0)
+
+def _read_rng(r):
+    seed, count = r.unpack("<QH")
+    streams = {}
+    for _ in range(count):
+        name = r.string()
+        version = r.one("<B")
+        words = array("I", r.take(4 * _MT_STATE_WORDS))
+        if _SWAP_WORDS:
+            words.byteswap()
+        internal = tuple(words)
+        has_gauss, gauss_next = r.unpack("<?d")
+        streams[name] = (version, internal, gauss_next if has_gauss else None)
+    rng = RunRng(seed)
+    rng.setstate((seed, streams))
+    return rng
+
+def _write_stream_ref(w, rng, source):
+    """Record which run stream a deck or enemy draws from ("" = global random)"""
+    if source is random:
+        w.string("")
+        return
+    name = rng.stream_name(source)
+    if name is None:
+        raise ValueError("can only snapshot objects that draw from the run's RNG streams")
+    w.string(name)
+
+def _read_stream_ref(r, rng):
+    name = r.string()
+    return rng.stream(name) if name else random
+
+# Decks, enemies and combat
+
+def _write_status(w, effects):
+    # (amount, beats left) per Status slot
+    w.pack(_STATUS.format, *effects.amount, *effects.duration)
+
+def _read_status(r):
+    values = r.unpack(_STATUS.format)
+    effects = StatusEffects()
+    effects.amount = list(values[:len(STATUSES)])
+    effects.duration = list(values[len(STATUSES):])
+    return effects
+
+def _write_deck(w, deck, rng):
+    _write_stream_ref(w, rng, deck.rng)
+    cards, zones, slots = deck.export_zones()
+    w.pack("<H", len(cards))
+    for card, zone, slot in zip(cards, zones, slots):
+        w.card(card, zone, slot)
+
+def _read_deck(r, rng):
+    source = _read_stream_ref(r, rng)
+    cards, zones, slots = [], [], []
+    for _ in range(r.one("<H")):
+        card, zone, slot = r.card()
+        cards.append(card)
+        zones.append(zone)
+        slots.append(slot)
+    return Deck.from_zones(cards, zones, slots, rng=source)
+
+def _handle(card):
+    return None if card is None else card.handle
+
+def _card_at(deck, handle):
+    return None if handle is None else deck.card_at(handle)
+
+def _write_enemy(w, enemy, rng):
+    w.string(enemy.name)
+    w.string(enemy.archetype)
+    w.pack("<iiddBB", enemy.max_hp, enemy.hp, enemy.temperature, enemy.anti_repeat_penalty,
+           enemy.use_vector_ai, enemy.level_k)
+    w.string(enemy.strategy)
+    w.pack("<iiB", enemy.focus, enemy.guard_amount, enemy.stunned)
+    _write_stream_ref(w, rng, enemy.rng)
+    _write_status(w, enemy.status_effects)
+    _write_deck(w, enemy.deck, rng)
+    w.optional(_handle(enemy.last_played_card))
+
+def _read_enemy(r, rng):
+    name = r.string()
+    archetype = r.string()
+    max_hp, hp, temperature, penalty, use_vector_ai, level_k = r.unpack("<iiddBB")
+    strategy = r.string()
+    focus, guard, stunned = r.unpack("<iiB")
+    source = _read_stream_ref(r, rng)
+    status = _read_status(r)
+    deck = _read_deck(r, rng)
+    enemy = Enemy(name, max_hp, deck, archetype, rng=source)
+    enemy.hp = hp
+    enemy.temperature = temperature
+    enemy.anti_repeat_penalty = penalty
+    enemy.use_vector_ai = bool(use_vector_ai)
+    enemy.level_k = level_k
+    enemy.strategy = strategy
+    enemy.focus = focus
+    enemy.guard_amount = guard
+    enemy.stunned = bool(stunned)
+    enemy.status_effects = status
+    enemy.last_played_card = _card_at(deck, r.optional())
+    return enemy
+
+def _write_engine(w, engine, rng):
+    _write_enemy(w, engine.enemy, rng)
+    w.pack("<BiiiiI", _PHASES.index(engine.phase), engine.player_hp, engine.player_max_hp,
+           engine.player_focus, engine.player_guard, engine.beat_number)
+    _write_status(w, engine.player_status_effects)
+    w.optional(_handle(engine.player_selected_card))
+    w.optional(engine.player_selected_slot)
+    w.optional(engine.player_prediction_slot)
+    w.optional(_handle(engine.enemy_chosen_card))
+    w.optional(engine.enemy_chosen_slot)
+    w.pack("<BBBii", engine.read_correct, _ORDERS.index(engine.resolution_order),
+           engine.player_stunned, *engine.beat_start_hp)
+    w.pack("<H", len(engine.resolution_log))
+    for line in engine.resolution_log:
+        w.string(line)
+
+def _read_engine(r, rng, player_deck):
+    enemy = _read_enemy(r, rng)
+    engine = CombatEngine.__new__(CombatEngine)  # Restored, not started: no rows are drawn
+    engine.player_deck = player_deck
+    engine.enemy = enemy
+    phase, engine.player_hp, engine.player_max_hp, engine.player_focus, engine.player_guard, \
+        engine.beat_number = r.unpack("<BiiiiI")
+    engine.phase = _PHASES[phase]
+    engine.player_status_effects = _read_status(r)
+    engine.player_selected_card = _card_at(player_deck, r.optional())
+    engine.player_selected_slot = r.optional()
+    engine.player_prediction_slot = r.optional()
+    engine.enemy_chosen_card = _card_at(enemy.deck, r.optional())
+    engine.enemy_chosen_slot = r.optional()
+    read_correct, order, player_stunned, player_start, enemy_start = r.unpack("<BBBii")
+    engine.read_correct = bool(read_correct)
+    engine.resolution_order = _ORDERS[order]
+    engine.player_stunned = bool(player_stunned)
+    engine.beat_start_hp = (player_start, enemy_start)
+    engine.resolution_log = [r.string() for _ in range(r.one("<H"))]
+    engine.listeners = []
+    return engine
+
+# Map
+
+def _write_map(w, map_system):
+    # Only the act in progress exists; its graph is regenerated from the seed
+    act = map_system.get_current_act()
+    floors_per_act, current_floor, column = 0, 0, 0
+    if act:
+        floors_per_act, current_floor = act.floors_per_act, act.current_floor
+        column = act.position.column if act.position is not None else 0
+    w.pack("<BiBBBH", map_system.current_act, map_system.gold, floors_per_act, current_floor, column,
+           len(map_system.player_path))
+    # (act, floor, column, node type) per visited node
+    w.buf += bytes(value for act_number, floor, choice, node_type in map_system.player_path
+                   for value in (act_number, floor, choice, _NODE_TYPES.index(node_type)))
+
+def _read_map(r, rng):
+    map_system = MapSystem.__new__(MapSystem)  # Restored, not generated
+    map_system.rng = rng
+    (map_system.current_act, map_system.gold, floors_per_act, current_floor, column,
+     steps) = r.unpack("<BiBBBH")
+    packed = r.take(4 * steps)
+    map_system.player_path = [(packed[i], packed[i + 1], packed[i + 2], _NODE_TYPES[packed[i + 3]])
+                              for i in range(0, 4 * steps, 4)]
+    map_system._act = None
+    if map_system.current_act <= ACT_COUNT:
+        act = Act(map_system.current_act, floors_per_act, rng)
+        act.resume(current_floor, column)
+        map_system._act = act
+    return map_system
+
+# Recording
+
+def _write_recording(w, recording):
+    w.string(recording.seed)
+    w.pack("<I", len(recording.inputs))
+    packed = []
+    for entry in recording.inputs:
+        packed += (_INPUT_KINDS.index(entry[0]), entry[1], entry[2] if len(entry) > 2 else 0)
+    w.buf += array("b", packed).tobytes()
+
+def _read_recording(r):
+    seed = r.string()
+    count = r.one("<I")
+    packed = array("b", r.take(3 * count))
+    inputs = []
+    for i in range(0, 3 * count, 3):
+        kind, first, second = packed[i], packed[i + 1], packed[i + 2]
+        inputs.append((_INPUT_KINDS[kind], first) if kind == 0 else (_INPUT_KINDS[kind], first, second))
+    return RunRecording(seed, inputs)
+
+# Top level
+
+def save_state(rng, player_deck, map_system, engine=None, counters=(0, 0, 0), recording=None, screen=0):
+    """Serialize run state to bytes.
+
+    counters: (beats played, fights won, fights lost); screen: an opaque
+    small int for the front end (Game stores its GameState here).
+    """
+    body = _Writer()
+    _write_rng(body, rng)
+    _write_deck(body, player_deck, rng)
+    _write_map(body, map_system)
+    body.pack("<?", engine is not None)
+    if engine is not None:
+        _write_engine(body, engine, rng)
+    body.pack("<IHHB", *counters, screen)
+    body.pack("<?", recording is not None)
+    if recording is not None:
+        _write_recording(body, recording)
+
+    out = _Writer()
+    out.buf += MAGIC
+    out.pack("<HH", VERSION, len(body.definitions))
+    for definition in body.definitions:
+        out.buf += _DEF.pack(_CARD_TYPES.index(definition.type), definition.speed,
+                             definition.damage, definition.stability)
+    texts = _DEF_FIELD_SEPARATOR.join(
+        text for definition in body.definitions
+        for text in (definition.name, definition.effect, definition.read, definition.clash)).encode("utf-8")
+    out.pack("<I", len(texts))
+    out.buf += texts
+    return bytes(out.buf + body.buf)
+
+def load_state(data):
+    """Deserialize bytes from save_state into a RunState"""
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("not a run snapshot")
+    r = _Reader(data)
+    r.offset = len(MAGIC)
+    version, def_count = r.unpack("<HH")
+    if version != VERSION:
+        raise ValueError(f"unsupported snapshot version {version}")
+    stats = [r.unpack("<Biii") for _ in range(def_count)]
+    texts = bytes(r.take(r.one("<I"))).decode("utf-8").split(_DEF_FIELD_SEPARATOR)
+    for i, (card_type, speed, damage, stability) in enumerate(stats):
+        name, effect, read, clash = texts[4 * i:4 * i + 4]
+        r.definitions.append(define_card(name, _CARD_TYPES[card_type], speed, damage, stability,
+                                         effect, read, clash))
+
+    rng = _read_rng(r)
+    player_deck = _read_deck(r, rng)
+    map_system = _read_map(r, rng)
+    engine = _read_engine(r, rng, player_deck) if r.one("<?") else None
+    *counters, screen = r.unpack("<IHHB")
+    recording = _read_recording(r) if r.one("<?") else None
+    return RunState(rng, player_deck, map_system, engine, tuple(counters), recording, screen)
+
+def save_run(run):
+    """Snapshot a headless run.Run"""
+    return save_state(run.rng, run.player_deck, run.map_system, run.engine,
+                      (run.beats_played, run.fights_won, run.fights_lost), run.recording)
+
+def load_run(data):
+    """Restore a run.Run from save_run output"""
+    state = load_state(data)
+    run = Run.__new__(Run)
+    run.rng = state.rng
+    run.player_deck = state.player_deck
+    run.map_system = state.map_system
+    run.engine = state.engine
+    run.beats_played, run.fights_won, run.fights_lost = state.counters
+    run.recording = state.recording
+    return run
@@ -0,0 +1,92 @@
+"""Startup timing for main.py --profile-startup.
+
+StartupProfile records how long each boot phase takes (importing pygame
+and the game modules, opening the window, building the game, presenting
+the first frame). While an ImportTimer is installed, the self time of
+every import is also added up per top-level package, so a slow
+dependency shows up by name instead of hiding inside "import game".
+
+Only the standard library is used here, so profiling can start before
+pygame is imported.
+"""
+
+import builtins
+import sys
+import time
+from contextlib import contextmanager
+
+class ImportTimer:
+    """Self time of imports per top-level package, via builtins.__import__"""
+
+    def __init__(self):
+        self.times = {}  # package -> seconds spent executing its modules
+        self._stack = []  # time spent in nested imports, per active import
+        self._original = None
+
+    def install(self):
+        self._original = builtins.__import__
+        builtins.__import__ = self._import
+
+    def uninstall(self):
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level == 0 and name in sys.modules and not fromlist:
+            return self._original(name, globals, locals, fromlist, level)
+        if level == 0:
+            package = name.partition(".")[0]
+        else:
+            package = ((globals or {}).get("__package__") or "?").partition(".")[0]
+        start = time.perf_counter()
+        self._stack.append(0.0)
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            self.times[package] = self.times.get(package, 0.0) + elapsed - nested
+
+    def slowest(self, count=10):
+        """(package, seconds) for the packages that took longest"""
+        return sorted(self.times.items(), key=lambda item: item[1], reverse=True)[:count]
+
+class StartupProfile:
+    def __init__(self, imports=False):
+        self.started = time.perf_counter()
+        self.phases = []  # (name, seconds) in the order they ran
+        self.total = None  # Seconds from start to finish()
+        self.imports = ImportTimer() if imports else None
+        if self.imports:
+            self.imports.install()
+
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block as one boot phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def finish(self):
+        """Stop timing imports; returns the seconds since the profile started"""
+        if self.imports:
+            self.imports.uninstall()
+        self.total = time.perf_counter() - self.started
+        return self.total
+
+    def report(self):
+        """Multi-line human-readable breakdown"""
+        total = self.total if self.total is not None else self.finish()
+        lines = [f"Startup: {total * 1000:.1f} ms to first frame"]
+        for name, seconds in self.phases:
+            lines.append(f"  {name:<16} {seconds * 1000:8.1f} ms")
+        if self.imports:
+            lines.append("Slowest imports (self time per package):")
+            for package, seconds in self.imports.slowest():
+                lines.append(f"  {package:<16} {seconds * 1000:8.1f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,70 @@
+"""Status effects shared by the player and enemies.
+
+Each status has a fixed slot holding an amount and the beats it has
+left, so applying and ticking statuses is plain list indexing with no
+string keys. A status only gets a slot once some card applies it.
+See batch_status.py for the NumPy variant used to tick many fights at
+once.
+"""
+
+from enum import IntEnum
+
+class Status(IntEnum):
+    BLEED = 0  # Take amount damage at the end of each beat
+
+STATUSES = tuple(Status)
+
+class StatusEffects:
+    """A combatant's statuses: one (amount, beats left) slot per Status"""
+
+    __slots__ = ("amount", "duration")
+
+    def __init__(self):
+        self.amount = [0] * len(STATUSES)
+        self.duration = [0] * len(STATUSES)
+
+    def copy(self):
+        effects = StatusEffects.__new__(StatusEffects)
+        effects.amount = self.amount[:]
+        effects.duration = self.duration[:]
+        return effects
+
+    def add(self, status, amount, duration=2):
+        """Apply a status, replacing any active one of the same kind"""
+        self.amount[status] = amount
+        self.duration[status] = duration
+
+    def get(self, status):
+        """Amount of a status, 0 if it isn't active"""
+        return self.amount[status] if self.duration[status] > 0 else 0
+
+    def clear(self):
+        self.amount = [0] * len(STATUSES)
+        self.duration = [0] * len(STATUSES)
+
+    def tick(self):
+        """End of beat: count every active status down one beat.
+
+        Returns the damage to take this beat (bleed).
+        """
+        duration = self.duration
+        amount = self.amount
+        damage = amount[Status.BLEED] if duration[Status.BLEED] > 0 else 0
+        for slot in range(len(duration)):
+            if duration[slot] > 0:
+                duration[slot] -= 1
+                if duration[slot] == 0:
+                    amount[slot] = 0
+        return damage
+
+    def active(self):
+        """(status, amount, beats left) for each active status"""
+        return [(status, self.amount[status], self.duration[status])
+                for status in STATUSES if self.duration[status] > 0]
+
+    def describe(self):
+        """Display string, e.g. "Bleed: 2 | Slow: 1" """
+        return " | ".join(f"{status.name.title()}: {amount}" for status, amount, _ in self.active())
+
+    def __bool__(self):
+        return any(self.duration)
@@ -0,0 +1,261 @@
+"""Per-beat combat telemetry (featurelist.md §14).
+
+BeatLogWriter listens to a CombatEngine and appends one fixed-width
+binary record per beat: both rows, the chosen cards and slots, the
+prediction and whether it landed, speed order, stuns, HP and net damage.
+Card and enemy names are stored as small integer codes; the code tables
+live in a JSON sidecar next to the log (PATH.names), so records stay
+compact and logs from different processes never depend on in-memory
+CardDef ids.
+
+BeatLogReader memory-maps a log and streams records without loading the
+file, so logs larger than RAM can be scanned.
+
+File layout: a 16-byte header (magic, version, record size) followed by
+RECORD_SIZE-byte records.
+"""
+
+import json
+import mmap
+import os
+import struct
+from collections import namedtuple
+
+MAGIC = b"BEATLOG\0"
+VERSION = 1
+HEADER = struct.Struct("<8sHH4x")
+
+# fight, beat, act, flags, enemy, player row x4, enemy row x4, player slot,
+# enemy slot, prediction, outcome, player damage taken, enemy damage taken,
+# player hp, enemy hp
+RECORD = struct.Struct("<IHBBH4H4HbbbBhhhh2x")
+RECORD_SIZE = RECORD.size
+ROW_WIDTH = 4
+EMPTY = 0xFFFF  # Card code for an empty row slot
+
+# flags bits
+READ_CORRECT = 1
+PLAYER_FIRST = 2
+ENEMY_FIRST = 4
+CLASH = 8
+PLAYER_STUNNED = 16
+ENEMY_STUNNED = 32
+
+_ORDER_FLAGS = {"player": PLAYER_FIRST, "enemy": ENEMY_FIRST, "clash": CLASH}
+OUTCOMES = {None: 0, "victory": 1, "defeat": 2}
+
+BeatRecord = namedtuple("BeatRecord", [
+    "fight", "beat", "act", "flags", "enemy", "player_row", "enemy_row",
+    "player_slot", "enemy_slot", "prediction", "outcome",
+    "player_damage", "enemy_damage", "player_hp", "enemy_hp",
+])
+
+def names_path(path):
+    return path + ".names"
+
+def _load_names(path):
+    try:
+        with open(names_path(path)) as f:
+            names = json.load(f)
+    except FileNotFoundError:
+        return [], []
+    return names["cards"], names["enemies"]
+
+def _check_header(data, path):
+    magic, version, record_size = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a beat log")
+    if version != VERSION or record_size != RECORD_SIZE:
+        raise ValueError(f"{path}: unsupported beat log version {version} (record size {record_size})")
+
+class BeatLogWriter:
+    """Append-only beat log; attach it to each CombatEngine to record"""
+
+    def __init__(self, path, act=0, flush_every=4096):
+        self.path = path
+        self.act = act  # Current act, stamped on every record
+        self.flush_every = flush_every
+        self._buffer = bytearray()
+        self._buffered = 0
+        self._pending = None  # Fields captured at reveal, completed at beat end
+        self._engine = None
+        self.records_written = 0
+
+        self.card_names, self.enemy_names = _load_names(path)
+        self._card_codes = {name: code for code, name in enumerate(self.card_names)}
+        self._enemy_codes = {name: code for code, name in enumerate(self.enemy_names)}
+        self._names_dirty = False
+
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(HEADER.pack(MAGIC, VERSION, RECORD_SIZE))
+            self._fight = 0
+        else:
+            with open(path, "rb") as f:
+                _check_header(f.read(HEADER.size), path)
+                # Continue fight numbering after the last complete record
+                count = (self._file.tell() - HEADER.size) // RECORD_SIZE
+                self._fight = 0
+                if count:
+                    f.seek(HEADER.size + (count - 1) * RECORD_SIZE)
+                    self._fight = RECORD.unpack(f.read(RECORD_SIZE))[0] + 1
+
+    def attach(self, engine):
+        """Start recording a fight"""
+        if engine is not self._engine:
+            self._write_pending()
+        engine.add_listener(self)
+
+    def _write_pending(self):
+        """Write a beat whose fight ended without cleanup (e.g. the game quit in REVEAL)"""
+        if self._pending is not None:
+            self.on_beat_end(self._engine)
+
+    def _card_code(self, name):
+        code = self._card_codes.get(name)
+        if code is None:
+            code = len(self.card_names)
+            self.card_names.append(name)
+            self._card_codes[name] = code
+            self._names_dirty = True
+        return code
+
+    def _enemy_code(self, name):
+        code = self._enemy_codes.get(name)
+        if code is None:
+            code = len(self.enemy_names)
+            self.enemy_names.append(name)
+            self._enemy_codes[name] = code
+            self._names_dirty = True
+        return code
+
+    def _row(self, cards):
+        row = [self._card_code(card.name) for card in cards[:ROW_WIDTH]]
+        return row + [EMPTY] * (ROW_WIDTH - len(row))
+
+    def on_beat_resolved(self, engine):
+        """Capture rows and choices while they are still on the table"""
+        if engine is not self._engine:
+            if self._engine is not None:
+                self._fight += 1
+            self._engine = engine
+
+        player_slot = engine.player_selected_slot
+        flags = _ORDER_FLAGS.get(engine.resolution_order, 0)
+        if engine.read_correct:
+            flags |= READ_CORRECT
+        if engine.player_stunned:
+            flags |= PLAYER_STUNNED
+        if engine.enemy.stunned:
+            flags |= ENEMY_STUNNED
+
+        prediction = engine.player_prediction_slot
+        enemy_slot = engine.enemy_chosen_slot
+        self._pending = (
+            self._fight, engine.beat_number, self.act, flags, self._enemy_code(engine.enemy.name),
+            self._row(engine.player_deck.hand), self._row(engine.enemy.deck.hand),
+            -1 if player_slot is None else player_slot,
+            -1 if enemy_slot is None else enemy_slot,
+            -1 if prediction is None else prediction,
+        )
+
+    def on_beat_end(self, engine):
+        """Complete the beat with end-of-beat HP and write it"""
+        if self._pending is None:
+            return
+        (fight, beat, act, flags, enemy, player_row, enemy_row,
+         player_slot, enemy_slot, prediction) = self._pending
+        self._pending = None
+
+        player_start, enemy_start = engine.beat_start_hp
+        player_hp = max(0, engine.player_hp)
+        enemy_hp = max(0, engine.enemy.hp)
+        self._buffer += RECORD.pack(
+            fight, beat, act, flags, enemy, *player_row, *enemy_row,
+            player_slot, enemy_slot, prediction, OUTCOMES[engine.outcome],
+            player_start - player_hp, enemy_start - enemy_hp, player_hp, enemy_hp)
+        self._buffered += 1
+        self.records_written += 1
+        if self._buffered >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """Write buffered records and any new names"""
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer = bytearray()
+            self._buffered = 0
+        self._file.flush()
+        if self._names_dirty:
+            tmp = names_path(self.path) + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump({"cards": self.card_names, "enemies": self.enemy_names}, f)
+            os.replace(tmp, names_path(self.path))
+            self._names_dirty = False
+
+    def close(self):
+        if not self._file.closed:
+            self._write_pending()
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class BeatLogReader:
+    """Memory-mapped, streaming view of a beat log"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        _check_header(self._map, path)
+        # A partially written trailing record is ignored
+        self.count = (len(self._map) - HEADER.size) // RECORD_SIZE
+        self.card_names, self.enemy_names = _load_names(path)
+
+    def __len__(self):
+        return self.count
+
+    def raw_chunks(self, records_per_chunk=65536):
+        """Yield (first record index, bytes of whole records) chunks.
+
+        Only one chunk is paged in and copied at a time.
+        """
+        for start in range(0, self.count, records_per_chunk):
+            stop = min(self.count, start + records_per_chunk)
+            yield start, self._map[HEADER.size + start * RECORD_SIZE:HEADER.size + stop * RECORD_SIZE]
+
+    def __iter__(self):
+        for _, chunk in self.raw_chunks():
+            for fields in RECORD.iter_unpack(chunk):
+                yield self._record(fields)
+
+    def record(self, index):
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return self._record(RECORD.unpack_from(self._map, HEADER.size + index * RECORD_SIZE))
+
+    @staticmethod
+    def _record(fields):
+        return BeatRecord(*fields[:5], fields[5:5 + ROW_WIDTH], fields[5 + ROW_WIDTH:5 + 2 * ROW_WIDTH],
+                          *fields[5 + 2 * ROW_WIDTH:])
+
+    def card_name(self, code):
+        return None if code == EMPTY else self.card_names[code]
+
+    def enemy_name(self, code):
+        return self.enemy_names[code]
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,234 @@
+"""Offline analysis of beat telemetry logs (featurelist.md §14).
+
+Loads beat logs (see telemetry.py) chunk by chunk into NumPy structured
+arrays and accumulates, in one streaming pass:
+
+- pick/skip rates per player card name
+- the foe AI's pick distribution per enemy template
+- lengths of correct and incorrect Read streaks within a fight
+- net damage per beat (damage dealt minus taken) by act
+
+Only one chunk is in memory at a time, so logs larger than RAM work.
+Card and enemy codes are remapped through each log's names sidecar, so
+logs written by different processes can be combined.
+
+Example:
+    python telemetry_analysis.py sims/run-*.beats
+"""
+
+import argparse
+from collections import Counter
+
+import numpy as np
+
+from telemetry import BeatLogReader, EMPTY, READ_CORRECT, RECORD_SIZE, ROW_WIDTH
+
+BEAT_DTYPE = np.dtype({
+    "names": ["fight", "beat", "act", "flags", "enemy", "player_row", "enemy_row",
+              "player_slot", "enemy_slot", "prediction", "outcome",
+              "player_damage", "enemy_damage", "player_hp", "enemy_hp"],
+    "formats": ["<u4", "<u2", "u1", "u1", "<u2", ("<u2", ROW_WIDTH), ("<u2", ROW_WIDTH),
+                "i1", "i1", "i1", "u1", "<i2", "<i2", "<i2", "<i2"],
+    "offsets": [0, 4, 6, 7, 8, 10, 18, 26, 27, 28, 29, 30, 32, 34, 36],
+    "itemsize": RECORD_SIZE,
+})
+
+MAX_ACTS = 256
+
+def _grow(array, size, axis=0):
+    """Zero-pad array along axis to at least size"""
+    missing = size - array.shape[axis]
+    if missing <= 0:
+        return array
+    pad = [(0, 0)] * array.ndim
+    pad[axis] = (0, missing)
+    return np.pad(array, pad)
+
+class TelemetryStats:
+    """Running §14 metrics over any number of beat logs"""
+
+    def __init__(self):
+        self.card_names = []
+        self.enemy_names = []
+        self._card_index = {}
+        self._enemy_index = {}
+
+        self.beats = 0
+        self.card_offered = np.zeros(0, dtype=np.int64)
+        self.card_picked = np.zeros(0, dtype=np.int64)
+        self.foe_offered = np.zeros((0, 0), dtype=np.int64)  # [enemy, card]
+        self.foe_picked = np.zeros((0, 0), dtype=np.int64)
+        self.act_beats = np.zeros(MAX_ACTS, dtype=np.int64)
+        self.act_net_damage = np.zeros(MAX_ACTS, dtype=np.int64)
+        self.correct_streaks = Counter()    # streak length -> count
+        self.incorrect_streaks = Counter()
+
+        self._streak = None  # (fight, correct, length) of the run still open
+
+    def _remap(self, names, index, registry):
+        """Lookup array from a log's codes to global indices (EMPTY maps to -1)"""
+        lookup = np.full(len(names) + 1, -1, dtype=np.int64)
+        for code, name in enumerate(names):
+            global_index = index.get(name)
+            if global_index is None:
+                global_index = len(registry)
+                registry.append(name)
+                index[name] = global_index
+            lookup[code] = global_index
+        return lookup
+
+    def add_log(self, path, records_per_chunk=1 << 20):
+        """Stream one log into the running totals"""
+        with BeatLogReader(path) as reader:
+            card_lookup = self._remap(reader.card_names, self._card_index, self.card_names)
+            enemy_lookup = self._remap(reader.enemy_names, self._enemy_index, self.enemy_names)
+            cards = len(self.card_names)
+            enemies = len(self.enemy_names)
+            self.card_offered = _grow(self.card_offered, cards)
+            self.card_picked = _grow(self.card_picked, cards)
+            self.foe_offered = _grow(_grow(self.foe_offered, enemies, 0), cards, 1)
+            self.foe_picked = _grow(_grow(self.foe_picked, enemies, 0), cards, 1)
+
+            empty_code = len(reader.card_names)
+            for _, chunk in reader.raw_chunks(records_per_chunk):
+                records = np.frombuffer(chunk, dtype=BEAT_DTYPE)
+                player_rows = card_lookup[np.where(records["player_row"] == EMPTY, empty_code,
+                                                   records["player_row"])]
+                enemy_rows = card_lookup[np.where(records["enemy_row"] == EMPTY, empty_code,
+                                                  records["enemy_row"])]
+                self._add_chunk(records, player_rows, enemy_rows, enemy_lookup[records["enemy"]])
+        self._close_streak()
+
+    def _add_chunk(self, records, player_rows, enemy_rows, enemy_ids):
+        self.beats += len(records)
+        cards = len(self.card_names)
+
+        # Player pick/skip: every card shown in the row vs the one played
+        shown = player_rows[player_rows >= 0]
+        self.card_offered += np.bincount(shown, minlength=cards)
+        played = records["player_slot"] >= 0
+        picks = player_rows[played, records["player_slot"][played]]
+        self.card_picked += np.bincount(picks[picks >= 0], minlength=cards)
+
+        # Foe AI: which card each template picked out of its row
+        flat = enemy_ids[:, None] * cards + enemy_rows
+        offered = flat[enemy_rows >= 0]
+        self.foe_offered += np.bincount(offered, minlength=self.foe_offered.size).reshape(self.foe_offered.shape)
+        chosen = records["enemy_slot"] >= 0
+        foe_cards = enemy_rows[chosen, records["enemy_slot"][chosen]]
+        foe_flat = enemy_ids[chosen] * cards + foe_cards
+        self.foe_picked += np.bincount(foe_flat[foe_cards >= 0],
+                                       minlength=self.foe_picked.size).reshape(self.foe_picked.shape)
+
+        # Net damage per beat by act
+        net = records["enemy_damage"].astype(np.int64) - records["player_damage"]
+        self.act_beats += np.bincount(records["act"], minlength=MAX_ACTS)
+        self.act_net_damage += np.bincount(records["act"], weights=net, minlength=MAX_ACTS).astype(np.int64)
+
+        self._add_streaks(records)
+
+    def _add_streaks(self, records):
+        """Run-length encode Read correctness per fight, carrying the open run across chunks"""
+        predicted = records[records["prediction"] >= 0]
+        if not len(predicted):
+            return
+        correct = (predicted["flags"] & READ_CORRECT) != 0
+        fight = predicted["fight"]
+
+        boundary = np.empty(len(predicted), dtype=bool)
+        boundary[0] = True
+        boundary[1:] = (correct[1:] != correct[:-1]) | (fight[1:] != fight[:-1])
+        starts = np.flatnonzero(boundary)
+        lengths = np.diff(np.append(starts, len(predicted)))
+        values = correct[starts]
+        fights = fight[starts]
+
+        if self._streak is not None:
+            open_fight, open_correct, open_length = self._streak
+            if open_fight == fights[0] and open_correct == values[0]:
+                lengths[0] += open_length
+            else:
+                self._record_streak(open_correct, open_length)
+
+        # Everything but the last run is closed
+        for value, streaks in ((True, self.correct_streaks), (False, self.incorrect_streaks)):
+            closed = lengths[:-1][values[:-1] == value]
+            if len(closed):
+                unique, counts = np.unique(closed, return_counts=True)
+                streaks.update(dict(zip(unique.tolist(), counts.tolist())))
+        self._streak = (int(fights[-1]), bool(values[-1]), int(lengths[-1]))
+
+    def _record_streak(self, correct, length):
+        (self.correct_streaks if correct else self.incorrect_streaks)[length] += 1
+
+    def _close_streak(self):
+        """Fight numbers restart per log, so runs never continue into the next one"""
+        if self._streak is not None:
+            self._record_streak(self._streak[1], self._streak[2])
+            self._streak = None
+
+    def card_pick_rates(self):
+        """{card name: (times offered, times picked, pick rate)}; skip rate is 1 - pick rate"""
+        rates = {}
+        for index, name in enumerate(self.card_names):
+            offered = int(self.card_offered[index])
+            if offered:
+                picked = int(self.card_picked[index])
+                rates[name] = (offered, picked, picked / offered)
+        return rates
+
+    def foe_pick_distribution(self):
+        """{enemy name: {card name: share of that enemy's picks}}"""
+        distribution = {}
+        for enemy_index, enemy_name in enumerate(self.enemy_names):
+            picks = self.foe_picked[enemy_index]
+            total = picks.sum()
+            if total:
+                distribution[enemy_name] = {self.card_names[i]: picks[i] / total
+                                            for i in np.flatnonzero(picks)}
+        return distribution
+
+    def net_damage_by_act(self):
+        """{act: mean net damage per beat}"""
+        return {act: self.act_net_damage[act] / self.act_beats[act]
+                for act in np.flatnonzero(self.act_beats).tolist()}
+
+    def summary(self):
+        """Human-readable report"""
+        lines = [f"Beats: {self.beats}", "", "Card pick rates (offered / picked / rate):"]
+        for name, (offered, picked, rate) in sorted(self.card_pick_rates().items(),
+                                                    key=lambda item: -item[1][2]):
+            lines.append(f"  {name:<20} {offered:>10} {picked:>10} {rate:>7.1%}")
+
+        lines += ["", "Foe pick distribution:"]
+        for enemy_name, shares in self.foe_pick_distribution().items():
+            lines.append(f"  {enemy_name}")
+            for card_name, share in sorted(shares.items(), key=lambda item: -item[1]):
+                lines.append(f"    {card_name:<20} {share:>7.1%}")
+
+        lines += ["", "Read streaks (length: count):"]
+        for label, streaks in (("correct", self.correct_streaks), ("incorrect", self.incorrect_streaks)):
+            runs = ", ".join(f"{length}: {count}" for length, count in sorted(streaks.items()))
+            lines.append(f"  {label}: {runs or '-'}")
+
+        lines += ["", "Net damage per beat by act:"]
+        for act, net in self.net_damage_by_act().items():
+            lines.append(f"  act {act}: {net:+.2f} over {self.act_beats[act]} beats")
+        return "\n".join(lines)
+
+def analyze(paths, records_per_chunk=1 << 20):
+    """One streaming pass over beat logs; returns TelemetryStats"""
+    stats = TelemetryStats()
+    for path in paths:
+        stats.add_log(path, records_per_chunk)
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize beat telemetry logs")
+    parser.add_argument("logs", nargs="+", help="beat log files")
+    parser.add_argument("--chunk", type=int, default=1 << 20, help="records per chunk")
+    args = parser.parse_args()
+    print(analyze(args.logs, args.chunk).summary())
+
+if __name__ == "__main__":
+    main()
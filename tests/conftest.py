@@ -0,0 +1,17 @@
+import os
+import sys
+
+# Headless pygame: no window or audio device is needed for the game tests
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+@pytest.fixture(scope="session")
+def screen():
+    # Kept open for the whole session: the shared text renderer caches fonts
+    import pygame
+    pygame.display.init()
+    pygame.font.init()
+    return pygame.display.set_mode((1200, 800))
@@ -0,0 +1,78 @@
+"""Helpers for driving and comparing headless runs and fights in tests"""
+
+import random
+
+from enemies import ENEMY_TEMPLATES, create_enemy_from_template
+from player_cards import create_starting_deck
+from rng import RunRng
+from run import Run
+
+def _names(cards):
+    return [card.name for card in cards]
+
+def _deck(deck):
+    return _names(deck.cards), _names(deck.hand), _names(deck.discard_pile), _names(deck.burned_pile)
+
+def run_state(run):
+    """Everything that decides how a run continues"""
+    engine = run.engine
+    fight = None
+    if engine is not None:
+        fight = (engine.player_hp, engine.enemy.name, engine.enemy.hp, engine.beat_number,
+                 engine.phase, _deck(engine.enemy.deck), engine.enemy.focus,
+                 engine.player_status_effects.amount, engine.player_status_effects.duration,
+                 engine.enemy.status_effects.amount, engine.enemy.status_effects.duration)
+    return (run.rng.getstate(), _deck(run.player_deck), run.map_system.get_act_progress(),
+            run.map_system.player_path, run.map_system.gold,
+            (run.beats_played, run.fights_won, run.fights_lost), run.recording.inputs, fight)
+
+def random_input(run, choices):
+    if run.in_combat():
+        return ("beat", choices.randrange(len(run.engine.player_deck.hand)), choices.randrange(4))
+    return ("node", choices.randrange(len(run.map_system.get_current_choices())))
+
+def outcome(result):
+    """Comparable form of Run.apply's result (a MapNode, fight outcome or None)"""
+    if hasattr(result, "floor"):
+        return result.type, result.floor, result.column
+    return result
+
+def can_continue(run):
+    if run.is_complete():
+        return False
+    engine = run.engine
+    return engine is None or bool(engine.player_deck.hand and engine.enemy.deck.hand)
+
+def play_random(seed, max_inputs=400):
+    """A Run driven by seeded random inputs until it ends or stalls"""
+    choices = random.Random(seed)
+    run = Run(seed)
+    for _ in range(max_inputs):
+        if not can_continue(run):
+            break
+        run.apply(random_input(run, choices))
+    return run
+
+_TEMPLATES = [template for act in ENEMY_TEMPLATES.values() for tier in act.values() for template in tier]
+
+def random_enemy_state(seed, strategy="level_k", level=0):
+    """An enemy mid-fight plus a player row, fully determined by seed"""
+    draws = random.Random(seed)
+    rng = RunRng(seed)
+    enemy = create_enemy_from_template(draws.choice(_TEMPLATES), rng)
+    enemy.strategy = strategy
+    enemy.level_k = level
+    enemy.deck.shuffle()
+    enemy.deck.draw(draws.randint(1, 4))
+    enemy.hp = draws.randint(1, enemy.max_hp)
+    if draws.random() < 0.5:
+        enemy.last_played_card = draws.choice(enemy.deck.hand)
+    enemy.temperature = draws.choice([0.5, 0.8, 1.2])
+
+    player_deck = create_starting_deck(rng)
+    player_deck.shuffle()
+    hand = player_deck.draw(draws.randint(1, 4))
+    for card in hand:
+        card.speed_modifier = draws.randint(0, 1)
+        card.damage_modifier = draws.randint(0, 1)
+    return enemy, hand
@@ -0,0 +1,58 @@
+"""BatchDeck against B independent Decks"""
+
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from batch_deck import BatchDeck
+from card import Card
+from deck import Deck
+from player_cards import create_starting_deck
+
+def _counts(deck):
+    return [len(deck.cards), len(deck.hand), len(deck.discard_pile), len(deck.burned_pile)]
+
+def _masked(draws, size):
+    return np.array([draws.random() < 0.7 for _ in range(size)])
+
+def _selected(decks, mask):
+    return [deck for deck, selected in zip(decks, mask) if selected]
+
+@pytest.mark.parametrize("seed", range(5))
+def test_zone_counts_match_scalar_decks(seed):
+    draws = random.Random(seed)
+    size = 12
+    decks = []
+    for b in range(size):
+        source = create_starting_deck().get_all_cards()
+        draws.shuffle(source)
+        decks.append(Deck([Card.from_def(card.definition) for card in source[:14]], rng=random.Random(b)))
+    batch = BatchDeck.from_decks(decks, rng=np.random.default_rng(seed))
+    assert batch.zone_counts().tolist() == [_counts(deck) for deck in decks]
+
+    for _ in range(80):
+        op = draws.randrange(3)
+        mask = _masked(draws, size)
+        if op == 0:
+            batch.draw_row(4, mask)
+            for deck in _selected(decks, mask):
+                deck.draw_row(4)
+        elif op == 1:
+            slots = np.array([draws.randrange(-1, 5) for _ in range(size)])
+            batch.discard_from_hand(slots)
+            for slot, deck in zip(slots.tolist(), decks):
+                if 0 <= slot < len(deck.hand):
+                    deck.discard(deck.hand[slot])
+        else:
+            count = draws.randint(1, 3)
+            batch.draw(count, mask)
+            for deck in _selected(decks, mask):
+                deck.draw(min(count, batch.max_hand - len(deck.hand)))  # BatchDeck caps the hand
+        assert batch.zone_counts().tolist() == [_counts(deck) for deck in decks]
+        # The rows hold cards of the right definitions, whatever the shuffle order
+        for b, deck in enumerate(decks):
+            ids = batch.hand_def_ids()[b]
+            assert len(ids[ids >= 0]) == len(deck.hand)
+            assert set(ids[ids >= 0].tolist()) <= {card.definition.id for card in deck._by_handle}
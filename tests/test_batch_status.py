@@ -0,0 +1,53 @@
+"""BatchStatusEffects against B independent StatusEffects"""
+
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from batch_status import BatchStatusEffects
+from status import STATUSES, StatusEffects
+
+def _rows(batch):
+    return [(batch.amount[row].tolist(), batch.duration[row].tolist()) for row in range(batch.batch)]
+
+def _scalar(effects):
+    return [(single.amount, single.duration) for single in effects]
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_add_and_tick_match_scalar(seed):
+    draws = random.Random(seed)
+    size = 16
+    effects = [StatusEffects() for _ in range(size)]
+    for single in effects:
+        single.add(draws.choice(STATUSES), draws.randint(0, 3), draws.randint(0, 3))
+    batch = BatchStatusEffects.from_effects(effects)
+    assert _rows(batch) == _scalar(effects)
+
+    for _ in range(60):
+        if draws.random() < 0.5:
+            status = draws.choice(STATUSES)
+            amounts = np.array([draws.randint(1, 5) for _ in range(size)])
+            durations = np.array([draws.randint(1, 4) for _ in range(size)])
+            mask = np.array([draws.random() < 0.5 for _ in range(size)])
+            batch.add(status, amounts, durations, mask)
+            for row in np.flatnonzero(mask):
+                effects[row].add(status, int(amounts[row]), int(durations[row]))
+        else:
+            damage = batch.tick()
+            assert damage.tolist() == [single.tick() for single in effects]
+        for status in STATUSES:
+            assert batch.get(status).tolist() == [single.get(status) for single in effects]
+        assert _rows(batch) == _scalar(effects)
+
+    for row, single in enumerate(effects):
+        copy = batch.row(row)
+        assert (copy.amount, copy.duration) == (single.amount, single.duration)
+
+def test_add_without_mask_applies_everywhere():
+    batch = BatchStatusEffects(4)
+    batch.add(STATUSES[0], 2, 3)
+    single = StatusEffects()
+    single.add(STATUSES[0], 2, 3)
+    assert _rows(batch) == _scalar([single] * 4)
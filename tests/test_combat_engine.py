@@ -0,0 +1,62 @@
+"""Beat resolution rules in CombatEngine"""
+
+import random
+
+from card import Card, CardType
+from combat_engine import CombatEngine
+from deck import Deck
+from enemy import Enemy
+from status import Status
+
+IGNITE = ("Ignite", CardType.SKILL, 3, 1, 2, "Deal 1; Bleed 1 (2 beats)", "Read: +Bleed 1", "")
+GUARD = ("Guard", CardType.GUARD, 1, 0, 4, "Prevent 3", "", "")
+
+def engine_with(player_spec, enemy_spec, enemy_hp=30):
+    """A fight with 4 copies of one card per side; the enemy always plays its first card"""
+    player_deck = Deck([Card(*player_spec) for _ in range(4)], rng=random.Random(1))
+    enemy = Enemy("Dummy", enemy_hp, Deck([Card(*enemy_spec) for _ in range(4)], rng=random.Random(2)))
+    enemy.choose_card = lambda player_hand: enemy.deck.hand[0]
+    return CombatEngine(player_deck, enemy)
+
+def play(engine, prediction_slot):
+    engine.select_card(engine.player_deck.hand[0])
+    engine.predict(prediction_slot)
+    engine.commit()
+
+def test_read_bleed_raises_the_cards_bleed():
+    engine = engine_with(IGNITE, GUARD)
+    play(engine, 0)
+    assert engine.read_correct
+    assert engine.enemy.status_effects.get(Status.BLEED) == 2
+    assert engine.enemy.status_effects.duration[Status.BLEED] == 2
+
+def test_no_read_bleed_without_a_correct_read():
+    engine = engine_with(IGNITE, GUARD)
+    play(engine, 1)
+    assert not engine.read_correct
+    assert engine.enemy.status_effects.get(Status.BLEED) == 1
+
+def test_read_bleed_without_own_bleed_uses_default_length():
+    spec = ("Cut", CardType.ATTACK, 3, 1, 2, "Deal 1", "Read: +Bleed 2", "")
+    engine = engine_with(spec, GUARD)
+    play(engine, 0)
+    assert engine.enemy.status_effects.get(Status.BLEED) == 2
+    assert engine.enemy.status_effects.duration[Status.BLEED] == 2
+
+def test_stunned_player_card_does_not_resolve():
+    heavy = ("Haymaker", CardType.ATTACK, 4, 5, 2, "Deal 5", "", "")
+    jab = ("Jab", CardType.ATTACK, 2, 3, 2, "Deal 3", "", "")
+    engine = engine_with(jab, heavy)
+    play(engine, 1)
+    assert engine.resolution_order == "enemy"
+    assert engine.player_stunned
+    assert engine.player_hp == engine.beat_start_hp[0] - 5
+    assert engine.enemy.hp == 30
+
+def test_player_acts_when_not_stunned():
+    light = ("Tap", CardType.ATTACK, 4, 1, 2, "Deal 1", "", "")
+    jab = ("Jab", CardType.ATTACK, 2, 3, 2, "Deal 3", "", "")
+    engine = engine_with(jab, light)
+    play(engine, 1)
+    assert not engine.player_stunned
+    assert engine.enemy.hp == 27
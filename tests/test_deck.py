@@ -0,0 +1,80 @@
+"""Deck zone bookkeeping"""
+
+import random
+
+from card import Card, CardType
+from deck import Deck, Zone
+
+def _cards(names):
+    return [Card(name, CardType.ATTACK, 3, 2, 2, "Deal 2") for name in names]
+
+def _check_slots(deck):
+    for zone, pile in deck._zones.items():
+        for slot, card in enumerate(pile):
+            assert deck.zone_of(card) == zone
+            assert deck._slot[card.handle] == slot
+
+def test_burn_from_draw_pile_keeps_order():
+    deck = Deck(_cards("ABCDEF"))
+    deck.burn(deck.cards[1])
+    assert [card.name for card in deck.cards] == list("ACDEF")
+    assert [card.name for card in deck.burned_pile] == ["B"]
+    _check_slots(deck)
+
+def test_remove_card_matches_list_remove():
+    names = list("ABACBA")
+    deck = Deck(_cards(names))
+    expected = list(names)
+    for name in "ABA":
+        assert deck.remove_card(name)
+        expected.remove(name)
+        assert [card.name for card in deck.cards] == expected
+        _check_slots(deck)
+    assert not deck.remove_card("Z")
+
+def test_draw_order_survives_mixed_moves():
+    deck = Deck(_cards("ABCDEFGHIJ"), rng=random.Random(5))
+    deck.shuffle()
+    reference = [card.name for card in deck.cards]
+    deck.draw_row(4)
+    reference = reference[:-4]
+    deck.burn(deck.cards[2])
+    del reference[2]
+    deck.discard(deck.hand[1])
+    deck.remove_card(reference[0])
+    del reference[0]
+    assert [card.name for card in deck.cards] == reference
+    assert deck.zone_of(deck.discard_pile[0]) == Zone.DISCARD
+    _check_slots(deck)
+    assert [card.name for card in deck.draw(len(reference))] == reference[::-1]
+
+def test_discard_pile_keeps_order():
+    deck = Deck(_cards("ABCDEFGH"), rng=random.Random(2))
+    deck.draw_row(4)
+    for card in list(deck.hand):
+        deck.discard(card)
+    expected = [card.name for card in deck.discard_pile]
+    deck.burn(deck.discard_pile[1])
+    del expected[1]
+    assert [card.name for card in deck.discard_pile] == expected
+    assert deck.remove_card(expected[0])
+    del expected[0]
+    assert [card.name for card in deck.discard_pile] == expected
+    _check_slots(deck)
+
+def test_reshuffle_matches_list_based_deck():
+    """A seed gives the same draws as plain lists with list.remove"""
+    deck = Deck(_cards("ABCDEFGHIJKL"), rng=random.Random(9))
+    pile = [card.name for card in deck.cards]
+    hand = deck.draw(8)
+    discard = [pile.pop() for _ in range(8)]
+    for card in hand:
+        deck.discard(card)
+    deck.burn(deck.discard_pile[2])
+    discard.remove(discard[2])
+    deck.draw(len(pile))
+
+    drawn = [card.name for card in deck.draw(1)]  # Reshuffles the discard pile
+    random.Random(9).shuffle(discard)
+    assert drawn == [discard.pop()]
+    assert [card.name for card in deck.cards] == discard
@@ -0,0 +1,25 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def _run(code):
+    """Run code in a fresh interpreter, so the card registry starts empty"""
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True,
+                            text=True, check=True)
+    return result.stdout.strip()
+
+def test_import_defines_no_cards():
+    assert _run("import card, enemies; print(len(card.CARD_DEFS))") == "0"
+
+def test_template_card_ids_ignore_first_use():
+    """Template cards take the lowest ids whichever card is defined first"""
+    listing = "import card; print([d.key() for d in card.CARD_DEFS])"
+    enemy_first = _run("import enemies, player_cards\n"
+                       "enemies.create_enemy(2)\n"
+                       "player_cards.create_starting_deck()\n" + listing)
+    player_first = _run("import enemies, player_cards\n"
+                        "player_cards.create_starting_deck()\n"
+                        "enemies.create_enemy(1, boss=True)\n" + listing)
+    assert enemy_first == player_first
@@ -0,0 +1,73 @@
+"""CombatEngine.fork isolation"""
+
+import random
+
+import pytest
+
+from run import Run
+
+def _deck(deck):
+    cards = [(card.name, card.speed_modifier, card.damage_modifier, card.read_triggered)
+             for card in deck._by_handle]
+    return cards, list(deck._zone), list(deck._slot)
+
+def engine_state(engine):
+    return (engine.player_hp, engine.enemy.hp, engine.beat_number, engine.phase,
+            _deck(engine.player_deck), _deck(engine.enemy.deck),
+            engine.enemy.status_effects.amount, engine.enemy.status_effects.duration,
+            engine.player_status_effects.amount, engine.player_status_effects.duration,
+            engine.enemy.rng.getstate(), engine.player_deck.rng.getstate(),
+            list(engine.resolution_log))
+
+def play(engine, moves):
+    results = []
+    for card, prediction in moves:
+        if engine.is_over() or not engine.player_deck.hand or not engine.enemy.deck.hand:
+            break
+        outcome = engine.step(engine.player_deck.hand[card % len(engine.player_deck.hand)], prediction)
+        results.append((engine.player_hp, engine.enemy.hp, outcome))
+    return results
+
+def fights(seed, count):
+    """Engines at random points of a run's fights"""
+    choices = random.Random(seed)
+    run = Run(f"FORK{seed}")
+    while count and not run.is_complete():
+        if not run.in_combat():
+            run.choose_node(choices.randrange(len(run.map_system.get_current_choices())))
+            continue
+        engine = run.engine
+        if not engine.player_deck.hand or not engine.enemy.deck.hand:
+            break
+        if choices.random() < 0.3:
+            count -= 1
+            yield engine, [(choices.randrange(4), choices.randrange(4)) for _ in range(12)]
+            if engine.is_over():
+                run.engine = None
+                continue
+        run.play_beat(choices.randrange(len(engine.player_deck.hand)), choices.randrange(4))
+
+@pytest.mark.parametrize("seed", range(6))
+def test_fork_is_isolated_and_faithful(seed):
+    for engine, moves in fights(seed, 8):
+        before = engine_state(engine)
+        fork = engine.fork()
+        fork_of_fork = fork.fork()
+        assert engine_state(fork) == before
+
+        forked = play(fork, moves)
+        assert engine_state(engine) == before, "playing the fork changed the original"
+        after_fork = engine_state(fork)
+
+        assert play(fork_of_fork, moves) == forked
+        assert play(engine, moves) == forked
+        assert engine_state(fork) == after_fork, "playing the original changed the fork"
+
+def test_fork_with_rng_leaves_original_streams():
+    engine = next(fights(1, 1))[0]
+    before = engine_state(engine)
+    fork = engine.fork(random.Random(7))
+    assert fork.listeners == []
+    assert fork.enemy.rng is fork.player_deck.rng is fork.enemy.deck.rng
+    play(fork, [(0, 0)] * 12)
+    assert engine_state(engine) == before
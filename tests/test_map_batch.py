@@ -0,0 +1,53 @@
+"""Vectorized map generation against the scalar Act"""
+
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import map_batch
+from map_system import ACT_COUNT, ADVICE_TYPES, Act
+from rng import RunRng
+
+SEEDS = list(range(200)) + [2**32 - 1, 2**32, 2**63 + 12345, 2**64 - 1]
+
+def test_random_doubles_match_random():
+    seeds = np.array(SEEDS, dtype=np.uint64)
+    doubles = map_batch._random_doubles(map_batch._seed_states(seeds), 50)
+    for row, seed in enumerate(SEEDS):
+        stream = random.Random(seed)
+        assert doubles[:, row].tolist() == [stream.random() for _ in range(50)]
+
+@pytest.mark.parametrize("weights", [[40, 25, 15, 10, 10], [40, 25, 0, 10, 10], [50, 0, 20, 10, 0]])
+def test_weighted_pick_matches_choices(weights):
+    draws = random.Random(3)
+    r = np.array([draws.random() for _ in range(500)] + [0.0, 0.999999999, 40 / sum(weights)])
+    picks = map_batch._weighted_pick(r, np.array([weights] * len(r)))
+    for value, pick in zip(r.tolist(), picks.tolist()):
+        stream = random.Random()
+        stream.random = lambda value=value: value  # choices() then makes exactly this draw
+        assert pick == stream.choices(range(len(weights)), weights=weights)[0]
+
+@pytest.mark.parametrize("act_number", range(1, ACT_COUNT + 1))
+def test_generate_matches_act(act_number):
+    types, edges = map_batch.generate(SEEDS, act_number)
+    fewest, most = {}, {}
+    for node_type in ADVICE_TYPES:
+        fewest[node_type], most[node_type] = map_batch.path_extremes(types, edges, node_type)
+
+    for row, seed in enumerate(SEEDS):
+        floors = Act(act_number, rng=RunRng(seed))._generate_act()
+        for index, nodes in enumerate(floors):
+            width = len(nodes)
+            assert types[row, index, :width].tolist() == [map_batch.NODE_TYPES.index(node.type) for node in nodes]
+            assert (types[row, index, width:] == map_batch.EMPTY).all()
+            assert edges[row, index, :width].tolist() == [sum(1 << column for column in node.edges)
+                                                          for node in nodes]
+        for node_type in ADVICE_TYPES:
+            stats = [node.path_stats(node_type) for node in floors[0]]
+            assert fewest[node_type][row] == min(low for low, _, _ in stats)
+            assert most[node_type][row] == max(high for _, high, _ in stats)
+
+def test_verify_accepts_matching_seeds():
+    map_batch.verify(range(20))
@@ -0,0 +1,70 @@
+"""Zero-sum solver on games with known equilibria"""
+
+import random
+
+import pytest
+
+from nash import NashSolver, solve_zero_sum
+
+def _assert_equilibrium(matrix, row_mix, column_mix, value):
+    """Each mix guarantees the value against every reply"""
+    assert sum(row_mix) == pytest.approx(1)
+    assert sum(column_mix) == pytest.approx(1)
+    assert min(row_mix) >= 0 and min(column_mix) >= 0
+    for j in range(len(matrix[0])):
+        assert sum(p * row[j] for p, row in zip(row_mix, matrix)) >= value - 1e-7
+    for row in matrix:
+        assert sum(q * payoff for q, payoff in zip(column_mix, row)) <= value + 1e-7
+
+@pytest.mark.parametrize("matrix, row_mix, column_mix, value", [
+    # Matching pennies
+    ([[1, -1], [-1, 1]], [0.5, 0.5], [0.5, 0.5], 0),
+    # Rock, paper, scissors
+    ([[0, -1, 1], [1, 0, -1], [-1, 1, 0]], [1 / 3] * 3, [1 / 3] * 3, 0),
+    # Saddle point: row 2 dominates, column 2 is the best reply
+    ([[3, 1], [4, 2]], [0, 1], [0, 1], 2),
+    # 2x2 without a saddle point: p = 3/4, q = 1/2, value 5/2
+    ([[2, 3], [4, 1]], [0.75, 0.25], [0.5, 0.5], 2.5),
+    # 2x3: the third column is dominated
+    ([[3, -1, 4], [-2, 1, 5]], [3 / 7, 4 / 7], [2 / 7, 5 / 7, 0], 1 / 7),
+    # Constant game: any mix, value is the constant
+    ([[-5, -5], [-5, -5]], None, None, -5),
+])
+def test_known_games(matrix, row_mix, column_mix, value):
+    rows, columns, found = solve_zero_sum(matrix)
+    assert found == pytest.approx(value)
+    if row_mix is not None:
+        assert rows == pytest.approx(row_mix)
+        assert columns == pytest.approx(column_mix)
+    _assert_equilibrium(matrix, rows, columns, found)
+
+def test_random_games_are_equilibria():
+    draws = random.Random(14)
+    for _ in range(300):
+        shape = draws.randint(1, 6), draws.randint(1, 6)
+        matrix = [[draws.randint(-6, 6) for _ in range(shape[1])] for _ in range(shape[0])]
+        _assert_equilibrium(matrix, *solve_zero_sum(matrix))
+
+def test_strategy_follows_row_order():
+    from enemies import create_enemy_from_template, find_template
+    from player_cards import create_starting_deck
+    from rng import RunRng
+
+    rng = RunRng.from_seed_string("NASH")
+    enemy = create_enemy_from_template(find_template("Brawler Pup"), rng)
+    enemy_row = enemy.deck.draw(4)
+    player_row = create_starting_deck(rng).draw(4)
+    solver = NashSolver()
+
+    def by_name(row, mix):
+        # Identical copies are interchangeable, so compare the mass per card
+        totals = {}
+        for card, p in zip(row, mix):
+            totals[card.name] = totals.get(card.name, 0) + p
+        return totals
+
+    mix = solver.strategy(enemy, enemy_row, player_row)
+    assert sum(mix) == pytest.approx(1)
+    reversed_mix = solver.strategy(enemy, enemy_row[::-1], player_row[::-1])
+    assert by_name(enemy_row[::-1], reversed_mix) == pytest.approx(by_name(enemy_row, mix))
+    assert solver.stats()["hits"] == 1
@@ -0,0 +1,69 @@
+"""Level-k enemy strategies and their memoization"""
+
+import math
+
+import pytest
+
+from opponent_model import MAX_LEVEL, LevelKSolver
+from runs import random_enemy_state as random_state
+
+def uniform_average(enemy, enemy_row, player_row):
+    """The pre-level-k AI: softmax of the average payoff against the player's row"""
+    last_name = enemy.last_played_card.name if enemy.last_played_card else None
+    values = []
+    for mine in enemy_row:
+        value = sum(enemy._calculate_payoff(mine, theirs) for theirs in player_row) / len(player_row)
+        if mine.name == last_name:
+            value -= enemy.anti_repeat_penalty
+        values.append(value)
+    top = max(values)
+    weights = [math.exp((value - top) / enemy.temperature) for value in values]
+    return [weight / sum(weights) for weight in weights]
+
+def test_level_zero_is_the_uniform_average():
+    solver = LevelKSolver()
+    for seed in range(200):
+        enemy, hand = random_state(seed)
+        mix = solver.strategy(enemy, enemy.deck.hand, hand, 0)
+        assert list(mix) == pytest.approx(uniform_average(enemy, enemy.deck.hand, hand), abs=1e-12)
+
+@pytest.mark.parametrize("level", range(MAX_LEVEL + 1))
+def test_strategies_are_distributions(level):
+    solver = LevelKSolver()
+    for seed in range(50):
+        enemy, hand = random_state(seed)
+        mix = solver.strategy(enemy, enemy.deck.hand, hand, level)
+        assert len(mix) == len(enemy.deck.hand)
+        assert sum(mix) == pytest.approx(1)
+        assert min(mix) >= 0
+
+def test_repeated_state_hits_the_cache():
+    solver = LevelKSolver()
+    enemy, hand = random_state(3)
+    first = solver.strategy(enemy, enemy.deck.hand, hand, 2)
+    assert solver.stats()["misses"] == 1
+    # The same state again, with the player's row in another order
+    assert solver.strategy(enemy, enemy.deck.hand, hand[::-1], 2) is first
+    assert solver.stats()["hits"] == 1
+
+    # Any input the strategy depends on makes a new entry
+    for change in ("level", "hp", "last", "modifier"):
+        if change == "level":
+            solver.strategy(enemy, enemy.deck.hand, hand, 1)
+        elif change == "hp":
+            enemy.hp = 1
+            solver.strategy(enemy, enemy.deck.hand, hand, 2)
+        elif change == "last":
+            enemy.last_played_card = enemy.deck.hand[-1] if enemy.last_played_card is None else None
+            solver.strategy(enemy, enemy.deck.hand, hand, 2)
+        else:
+            hand[0].damage_modifier += 1
+            solver.strategy(enemy, enemy.deck.hand, hand, 2)
+    assert solver.stats()["hits"] == 1
+    assert solver.stats()["misses"] == 5
+
+def test_level_above_max_is_clamped():
+    solver = LevelKSolver()
+    enemy, hand = random_state(7)
+    assert solver.strategy(enemy, enemy.deck.hand, hand, MAX_LEVEL + 5) is \
+        solver.strategy(enemy, enemy.deck.hand, hand, MAX_LEVEL)
@@ -0,0 +1,52 @@
+"""Payoff table lookups against the original per-pair formula"""
+
+import random
+
+import enemies  # noqa: F401 - registers every enemy card
+import player_cards  # noqa: F401
+from card import CARD_DEFS, Card
+from payoff_table import PayoffTable
+
+def original_payoff(my_card, opponent_card, low_hp):
+    """Enemy._calculate_payoff as it was before the table"""
+    payoff = 0
+    if my_card.get_effective_damage() > 0:
+        payoff += my_card.get_effective_damage()
+    if my_card.get_effective_speed() > opponent_card.get_effective_speed():
+        payoff += 1
+    if my_card.can_counter(opponent_card):
+        payoff += 2
+    if opponent_card.type.value in ["Attack", "Grapple"] and my_card.type.value == "Guard":
+        payoff += 1
+    if opponent_card.get_effective_damage() >= my_card.get_effective_stability():
+        payoff -= 2
+    if low_hp and my_card.type.value in ["Guard", "Dodge"]:
+        payoff += 1
+    return payoff
+
+def _cards():
+    player_cards.create_starting_deck()  # Player cards are defined on first use
+    return [Card.from_def(definition) for definition in CARD_DEFS]
+
+def test_unmodified_pairs():
+    table = PayoffTable()
+    cards = _cards()
+    assert len(cards) > 50
+    for mine in cards:
+        for theirs in cards:
+            for low_hp in (False, True):
+                assert table.payoff(mine, theirs, low_hp) == original_payoff(mine, theirs, low_hp)
+
+def test_modified_pairs():
+    draws = random.Random(15)
+    table = PayoffTable(maxsize=64)  # Small, so evictions are exercised too
+    cards = _cards()
+    for _ in range(5000):
+        mine, theirs = Card.from_def(draws.choice(cards).definition), Card.from_def(draws.choice(cards).definition)
+        for card in (mine, theirs):
+            if draws.random() < 0.7:
+                card.speed_modifier = draws.randint(-6, 3)
+                card.damage_modifier = draws.randint(-6, 3)
+                card.stability_modifier = draws.randint(-6, 3)
+        low_hp = draws.random() < 0.5
+        assert table.payoff(mine, theirs, low_hp) == original_payoff(mine, theirs, low_hp)
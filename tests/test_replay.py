@@ -0,0 +1,77 @@
+"""Live play through Game against a replay of its recording"""
+
+import random
+
+import pygame
+import pytest
+
+from game import Game, GameState
+from replay import Replayer
+from run import BEAT, Run
+from runs import play_random, run_state
+
+def _click(game, card):
+    game.handle_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=card.rect.center))
+
+def _key(game, key):
+    game.handle_event(pygame.event.Event(pygame.KEYDOWN, key=key))
+
+def play_game(screen, seed, fights, press_enter_on_last, choices_seed=1):
+    """Play a game through its input events; returns it mid-run"""
+    choices = random.Random(choices_seed)
+    game = Game(screen, 1200, 800, seed=seed)
+    while fights and not game.map_system.is_run_complete():
+        game.draw()
+        game._choose_node(choices.randrange(len(game.map_system.get_current_choices())))
+        if game.state != GameState.COMBAT:
+            _key(game, pygame.K_ESCAPE)  # Leave shops, events and camps untouched
+            continue
+        fights -= 1
+        combat = game.combat
+        while not combat.engine.is_over():
+            game.draw()
+            _click(game, choices.choice(combat.player_deck.hand))
+            _click(game, choices.choice(combat.enemy.deck.hand))
+            _key(game, pygame.K_SPACE)
+            if not combat.engine.is_over() or press_enter_on_last:
+                _key(game, pygame.K_RETURN)
+        # The game returns to the map on its own after a short delay
+        game.update(0.1)
+        game.update(3.0)
+        assert game.state == GameState.MAP
+    return game
+
+def _zones(deck):
+    return ([card.name for card in deck.cards], [card.name for card in deck.hand],
+            [card.name for card in deck.discard_pile], [card.name for card in deck.burned_pile])
+
+@pytest.mark.parametrize("press_enter_on_last", [False, True])
+def test_replay_matches_live_game(screen, press_enter_on_last):
+    game = play_game(screen, "ABC", fights=4, press_enter_on_last=press_enter_on_last)
+    run = Replayer(game.recording).play()
+
+    assert run.engine is None
+    assert run.recording.inputs == game.recording.inputs
+    assert run.map_system.get_act_progress() == game.map_system.get_act_progress()
+    assert run.map_system.player_path == game.map_system.player_path
+    assert _zones(run.player_deck) == _zones(game.player_deck)
+    assert run.rng.getstate() == game.rng.getstate()
+
+def _replay_inputs(recording, beats):
+    """A fresh Run after the recording's first `beats` beats"""
+    run = Run(recording.seed)
+    for entry in recording.inputs:
+        if run.beats_played >= beats:
+            break
+        run.apply(entry)
+    return run
+
+def test_seek_matches_straight_replay():
+    recording = play_random("SEEK").recording
+    total = sum(1 for entry in recording.inputs if entry[0] == BEAT)
+    replayer = Replayer(recording, snapshot_every=16)
+    replayer.play()
+    for beat in (0, 1, 15, 16, 17, 40, total // 2, total - 1, total):
+        assert run_state(replayer.seek(beat)) == run_state(_replay_inputs(recording, beat))
+    # Seeking again from the cached snapshots gives the same result
+    assert run_state(replayer.seek(40)) == run_state(_replay_inputs(recording, 40))
@@ -0,0 +1,34 @@
+"""Snapshot save/load round trips"""
+
+import random
+
+import pytest
+
+from run import Run
+from runs import can_continue, outcome, random_input, run_state
+from snapshot import MAGIC, load_run, save_run
+
+@pytest.mark.parametrize("seed", ["SNAP1", "q1w2"])
+def test_round_trip_at_every_input(seed):
+    choices = random.Random(seed)
+    run = Run(seed)
+    for _ in range(400):
+        if not can_continue(run):
+            break
+        blob = save_run(run)
+        assert blob.startswith(MAGIC)
+        clone = load_run(blob)
+        assert save_run(clone) == blob
+        assert run_state(clone) == run_state(run)
+
+        entry = random_input(run, choices)
+        assert outcome(run.apply(entry)) == outcome(clone.apply(entry))
+        assert run_state(clone) == run_state(run)
+
+def test_rejects_other_data():
+    with pytest.raises(ValueError):
+        load_run(b"not a snapshot")
+    blob = bytearray(save_run(Run("SNAP1")))
+    blob[len(MAGIC)] ^= 0xFF  # Version
+    with pytest.raises(ValueError):
+        load_run(bytes(blob))
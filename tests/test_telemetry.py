@@ -0,0 +1,76 @@
+"""Beat log layout and recording"""
+
+from combat_engine import CombatEngine
+from enemies import create_enemy_from_template, find_template
+from player_cards import create_starting_deck
+from rng import RunRng
+from telemetry import EMPTY, HEADER, OUTCOMES, RECORD_SIZE, BeatLogReader, BeatLogWriter
+
+def _engine(seed="telemetry", enemy="Brawler Pup"):
+    rng = RunRng.from_seed_string(seed)
+    return CombatEngine(create_starting_deck(rng), create_enemy_from_template(find_template(enemy), rng))
+
+def _play(engine, max_beats=60):
+    """Play the first card in hand predicting slot 0; returns the rows seen per beat"""
+    rows = []
+    while not engine.is_over() and engine.beat_number <= max_beats and engine.player_deck.hand:
+        rows.append(([card.name for card in engine.player_deck.hand],
+                     [card.name for card in engine.enemy.deck.hand]))
+        engine.step(engine.player_deck.hand[0], 0)
+    return rows
+
+def test_records_round_trip(tmp_path):
+    path = str(tmp_path / "fight.beats")
+    engine = _engine()
+    with BeatLogWriter(path, act=2) as writer:
+        writer.attach(engine)
+        rows = _play(engine)
+
+    assert (tmp_path / "fight.beats").stat().st_size == HEADER.size + len(rows) * RECORD_SIZE
+    with BeatLogReader(path) as reader:
+        records = list(reader)
+        assert len(records) == len(rows)
+        for number, (record, (player_row, enemy_row)) in enumerate(zip(records, rows), 1):
+            assert record.fight == 0
+            assert record.beat == number
+            assert record.act == 2
+            assert reader.enemy_name(record.enemy) == "Brawler Pup"
+            assert [reader.card_name(code) for code in record.player_row if code != EMPTY] == player_row
+            assert [reader.card_name(code) for code in record.enemy_row if code != EMPTY] == enemy_row
+        last = records[-1]
+        assert last.outcome == OUTCOMES[engine.outcome]
+        assert (last.player_hp, last.enemy_hp) == (max(0, engine.player_hp), max(0, engine.enemy.hp))
+        assert all(record.outcome == 0 for record in records[:-1])
+
+def test_beat_left_in_reveal_is_written(tmp_path):
+    """A fight that ends without cleanup still logs its last beat"""
+    path = str(tmp_path / "reveal.beats")
+    first = _engine("first")
+    writer = BeatLogWriter(path)
+    writer.attach(first)
+    first.select_card(first.player_deck.hand[0])
+    first.predict(0)
+    first.commit()  # No cleanup: the game was left in REVEAL
+
+    second = _engine("second")
+    writer.attach(second)
+    second.step(second.player_deck.hand[0], 0)
+    second.select_card(second.player_deck.hand[0])
+    second.predict(0)
+    second.commit()
+    writer.close()
+
+    with BeatLogReader(path) as reader:
+        assert [(record.fight, record.beat) for record in reader] == [(0, 1), (1, 1), (1, 2)]
+
+def test_simulated_beats_log_the_template_act(tmp_path):
+    from simulate import POLICIES, run_fight
+
+    template = find_template("Frost Mage")
+    path = str(tmp_path / "sim.beats")
+    with BeatLogWriter(path) as writer:
+        run_fight(create_starting_deck().get_all_cards(), template, POLICIES["random"],
+                  RunRng.from_seed_string("sim"), telemetry=writer)
+    with BeatLogReader(path) as reader:
+        assert len(reader) > 0
+        assert {record.act for record in reader} == {2}
@@ -0,0 +1,75 @@
+"""Columnar telemetry aggregates against a naive per-record count"""
+
+from collections import Counter, defaultdict
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from enemies import find_template
+from player_cards import create_starting_deck
+from rng import RunRng
+from simulate import POLICIES, run_fight
+from telemetry import EMPTY, READ_CORRECT, BeatLogReader, BeatLogWriter
+from telemetry_analysis import analyze
+
+def _write_log(path, enemy, fights, seed):
+    deck_cards = create_starting_deck().get_all_cards()
+    template = find_template(enemy)
+    with BeatLogWriter(path) as writer:
+        for index in range(fights):
+            run_fight(deck_cards, template, POLICIES["random"], RunRng(seed).spawn(index), telemetry=writer)
+
+def _naive(paths):
+    offered, picked = Counter(), Counter()
+    foe_picked = defaultdict(Counter)
+    act_beats, act_net = Counter(), Counter()
+    streaks = {True: Counter(), False: Counter()}
+    beats = 0
+    for path in paths:
+        with BeatLogReader(path) as reader:
+            run = None  # [fight, correct, length]
+            for record in reader:
+                beats += 1
+                row = [reader.card_name(code) for code in record.player_row]
+                offered.update(name for name in row if name is not None)
+                if record.player_slot >= 0 and row[record.player_slot] is not None:
+                    picked[row[record.player_slot]] += 1
+                if record.enemy_slot >= 0 and record.enemy_row[record.enemy_slot] != EMPTY:
+                    foe_picked[reader.enemy_name(record.enemy)][
+                        reader.card_name(record.enemy_row[record.enemy_slot])] += 1
+                act_beats[record.act] += 1
+                act_net[record.act] += record.enemy_damage - record.player_damage
+                if record.prediction >= 0:
+                    correct = bool(record.flags & READ_CORRECT)
+                    if run and run[0] == record.fight and run[1] == correct:
+                        run[2] += 1
+                    else:
+                        if run:
+                            streaks[run[1]][run[2]] += 1
+                        run = [record.fight, correct, 1]
+            if run:
+                streaks[run[1]][run[2]] += 1
+    return beats, offered, picked, foe_picked, act_beats, act_net, streaks
+
+def test_analysis_matches_naive_count(tmp_path):
+    paths = [str(tmp_path / "pup.beats"), str(tmp_path / "mage.beats")]
+    _write_log(paths[0], "Brawler Pup", 6, 1)
+    _write_log(paths[1], "Frost Mage", 4, 2)
+    beats, offered, picked, foe_picked, act_beats, act_net, streaks = _naive(paths)
+    assert beats > 50
+
+    stats = analyze(paths, records_per_chunk=7)  # Chunks end mid-fight
+    assert stats.beats == beats
+    assert {name: (o, p) for name, (o, p, _) in stats.card_pick_rates().items()} == \
+        {name: (offered[name], picked[name]) for name in offered}
+    distribution = stats.foe_pick_distribution()
+    assert set(distribution) == set(foe_picked)
+    for enemy, counts in foe_picked.items():
+        total = sum(counts.values())
+        assert distribution[enemy] == pytest.approx({card: count / total for card, count in counts.items()})
+    assert stats.net_damage_by_act() == pytest.approx({act: act_net[act] / act_beats[act] for act in act_beats})
+    assert set(stats.net_damage_by_act()) == {1, 2}
+    assert stats.correct_streaks == streaks[True]
+    assert stats.incorrect_streaks == streaks[False]
+    assert "Beats: " in stats.summary()
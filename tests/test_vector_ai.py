@@ -0,0 +1,33 @@
+"""Vectorized enemy AI against Enemy.choose_card"""
+
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from runs import random_enemy_state as random_state
+from vector_ai import choose_cards_batch
+
+def test_batch_matches_scalar_level_zero():
+    seeds = range(300)
+    scalar = []
+    for seed in seeds:
+        enemy, hand = random_state(seed)
+        scalar.append((enemy.deck.hand_slot(enemy.choose_card(hand)), enemy.rng.random()))
+
+    states = [random_state(seed) for seed in seeds]
+    chosen = choose_cards_batch([enemy for enemy, _ in states], [hand for _, hand in states])
+    batch = [(enemy.deck.hand_slot(card), enemy.rng.random()) for card, (enemy, _) in zip(chosen, states)]
+    assert batch == scalar
+    assert all(enemy.last_played_card is card for card, (enemy, _) in zip(chosen, states))
+
+@pytest.mark.parametrize("strategy, level", [("level_k", 0), ("level_k", 2), ("nash", 0)])
+def test_use_vector_ai_keeps_choices(strategy, level):
+    """The flag switches level 0 to the NumPy path; other strategies stay scalar"""
+    for seed in range(100):
+        enemy, hand = random_state(seed, strategy, level)
+        expected = enemy.deck.hand_slot(enemy.choose_card(hand))
+        enemy, hand = random_state(seed, strategy, level)
+        enemy.use_vector_ai = True
+        assert enemy.deck.hand_slot(enemy.choose_card(hand)) == expected
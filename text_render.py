@@ -0,0 +1,92 @@
+"""Shared text rendering service.
+
+Fonts are cached by size and rendered text surfaces by (string, font,
+color), so static labels are rendered once instead of every frame. Word
+widths and wrapped lines are cached too. Caches are bounded LRUs with
+hit/miss counters for profiling.
+"""
+
+from cache import LRUCache
+
+class TextRenderer:
+    def __init__(self, max_surfaces=512, max_measurements=4096):
+        self._fonts = {}
+        self._surfaces = LRUCache(max_surfaces)
+        self._widths = LRUCache(max_measurements)
+        self._wrapped = LRUCache(max_measurements // 8)
+
+    def font(self, size):
+        """Get the default font at a pixel size (fonts are never evicted)"""
+        font = self._fonts.get(size)
+        if font is None:
+            import pygame
+            font = pygame.font.Font(None, size)
+            self._fonts[size] = font
+        return font
+
+    def render(self, text, font, color, antialias=True):
+        """Render text, reusing the surface from earlier identical requests"""
+        key = (text, font, color, antialias)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = font.render(text, antialias, color)
+            self._surfaces.put(key, surface)
+        return surface
+
+    def text_width(self, text, font):
+        """Pixel width of text in font"""
+        key = (text, font)
+        width = self._widths.get(key)
+        if width is None:
+            width = font.size(text)[0]
+            self._widths.put(key, width)
+        return width
+
+    def wrap(self, text, font, max_width):
+        """Split text into lines no wider than max_width (cached per text)"""
+        key = (text, font, max_width)
+        lines = self._wrapped.get(key)
+        if lines is not None:
+            return lines
+
+        lines = []
+        current_line = ""
+        for word in text.split():
+            test_line = current_line + (" " if current_line else "") + word
+            if self.text_width(test_line, font) <= max_width:
+                current_line = test_line
+            else:
+                if current_line:
+                    lines.append(current_line)
+                current_line = word
+
+        if current_line:
+            lines.append(current_line)
+
+        lines = tuple(lines)
+        self._wrapped.put(key, lines)
+        return lines
+
+    def clear(self):
+        """Drop cached surfaces and measurements (fonts are kept)"""
+        self._surfaces.clear()
+        self._widths.clear()
+        self._wrapped.clear()
+
+    def stats(self):
+        """Cache counters, e.g. for a debug overlay"""
+        return {
+            "fonts": len(self._fonts),
+            "surfaces": self._surfaces.stats(),
+            "widths": self._widths.stats(),
+            "wrapped": self._wrapped.stats(),
+        }
+
+_renderer = None
+
+def get_text_renderer():
+    """The process-wide TextRenderer, created on first use"""
+    global _renderer
+    if _renderer is None:
+        _renderer = TextRenderer()
+    return _renderer
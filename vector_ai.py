@@ -0,0 +1,139 @@
+"""NumPy implementation of the enemy card-choice AI.
+
+Mirrors Enemy.choose_card (payoff matrix, uniform player belief,
+anti-repeat penalty, softmax, sampling) as array operations over stacked
+card stat vectors. Every function accepts arbitrary leading batch
+dimensions, so one call can pick cards for thousands of fights at once.
+
+NumPy is only needed when this module is used; the scalar AI in enemy.py
+has no such dependency.
+"""
+
+import numpy as np
+from card import CardType
+
+# Columns of a card stat vector
+SPEED, DAMAGE, STABILITY, TYPE = range(4)
+STAT_COLUMNS = 4
+
+TYPE_CODES = {card_type: code for code, card_type in enumerate(CardType)}
+_ATTACK = TYPE_CODES[CardType.ATTACK]
+_GRAPPLE = TYPE_CODES[CardType.GRAPPLE]
+_GUARD = TYPE_CODES[CardType.GUARD]
+_COUNTER = TYPE_CODES[CardType.COUNTER]
+_DODGE = TYPE_CODES[CardType.DODGE]
+
+def card_stats(cards, width=None):
+    """Stack cards into an (width, 4) int array plus a validity mask.
+
+    Rows shorter than width are padded with zeros and masked out.
+    """
+    width = len(cards) if width is None else width
+    stats = np.zeros((width, STAT_COLUMNS), dtype=np.int16)
+    mask = np.zeros(width, dtype=bool)
+    for i, card in enumerate(cards[:width]):
+        stats[i] = (card.get_effective_speed(), card.get_effective_damage(),
+                    card.get_effective_stability(), TYPE_CODES[card.type])
+        mask[i] = True
+    return stats, mask
+
+def payoff_matrix(enemy_stats, player_stats, low_hp):
+    """Enemy payoff for every (enemy card, player card) pair.
+
+    enemy_stats: (..., E, 4), player_stats: (..., P, 4), low_hp: (...,) bool.
+    Returns (..., E, P) float. Matches Enemy._calculate_payoff cell by cell.
+    """
+    e = enemy_stats[..., :, None, :]
+    p = player_stats[..., None, :, :]
+    e_type = e[..., TYPE]
+    p_type = p[..., TYPE]
+    p_hits = (p_type == _ATTACK) | (p_type == _GRAPPLE)
+
+    payoff = e[..., DAMAGE].astype(np.float64)
+    payoff = payoff + (e[..., SPEED] > p[..., SPEED])
+    counters = ((e_type == _COUNTER) & (p_type == _ATTACK)) | ((e_type == _DODGE) & p_hits)
+    payoff = payoff + 2 * counters
+    payoff = payoff + (p_hits & (e_type == _GUARD))
+    payoff = payoff - 2 * (p[..., DAMAGE] >= e[..., STABILITY])
+
+    defensive = (e_type == _GUARD) | (e_type == _DODGE)
+    low_hp = np.asarray(low_hp, dtype=bool)[..., None, None]
+    payoff = payoff + (low_hp & defensive)
+    return payoff
+
+def choice_probabilities(enemy_stats, player_stats, low_hp, repeat_mask, temperature, penalty,
+                         enemy_mask=None, player_mask=None):
+    """Mixed strategy over enemy cards, shape (..., E).
+
+    repeat_mask marks enemy cards matching last beat's card; masks mark
+    valid (non-padding) cards in ragged batches.
+    """
+    payoff = payoff_matrix(enemy_stats, player_stats, low_hp)
+    if player_mask is None:
+        expected = payoff.mean(axis=-1)
+    else:
+        weights = player_mask[..., None, :].astype(np.float64)
+        expected = (payoff * weights).sum(axis=-1) / np.maximum(weights.sum(axis=-1), 1)
+
+    expected = expected - np.asarray(penalty, dtype=np.float64)[..., None] * repeat_mask
+    if enemy_mask is not None:
+        expected = np.where(enemy_mask, expected, -np.inf)
+
+    temperature = np.asarray(temperature, dtype=np.float64)[..., None]
+    scaled = (expected - expected.max(axis=-1, keepdims=True)) / temperature
+    exp_values = np.exp(scaled)
+    return exp_values / exp_values.sum(axis=-1, keepdims=True)
+
+def sample(probabilities, uniforms):
+    """Pick one index per row: the first whose cumulative mass reaches u"""
+    cumulative = np.cumsum(probabilities, axis=-1)
+    hits = np.asarray(uniforms)[..., None] <= cumulative
+    last = probabilities.shape[-1] - 1
+    return np.where(hits.any(axis=-1), hits.argmax(axis=-1), last)
+
+def choose_cards_batch(enemies, player_hands, width=4):
+    """Pick a card for each (enemy, player hand) pair in one vectorized pass.
+
+    Draws one uniform per fight from each enemy's own AI stream and
+    updates last_played_card, exactly like Enemy.choose_card. Returns the
+    chosen cards (None for empty rows).
+    """
+    batch = len(enemies)
+    enemy_stats = np.zeros((batch, width, STAT_COLUMNS), dtype=np.int16)
+    player_stats = np.zeros((batch, width, STAT_COLUMNS), dtype=np.int16)
+    enemy_mask = np.zeros((batch, width), dtype=bool)
+    player_mask = np.zeros((batch, width), dtype=bool)
+    repeat_mask = np.zeros((batch, width), dtype=bool)
+    low_hp = np.zeros(batch, dtype=bool)
+    temperature = np.ones(batch)
+    penalty = np.zeros(batch)
+
+    for b, (enemy, hand) in enumerate(zip(enemies, player_hands)):
+        enemy_stats[b], enemy_mask[b] = card_stats(enemy.deck.hand, width)
+        player_stats[b], player_mask[b] = card_stats(hand, width)
+        if enemy.last_played_card:
+            last_name = enemy.last_played_card.name
+            for i, card in enumerate(enemy.deck.hand[:width]):
+                repeat_mask[b, i] = card.name == last_name
+        low_hp[b] = enemy.hp < enemy.max_hp * 0.3
+        temperature[b] = enemy.temperature
+        penalty[b] = enemy.anti_repeat_penalty
+
+    # Fights with no enemy row get a dummy row so the math stays finite
+    empty = ~enemy_mask.any(axis=-1)
+    enemy_mask[empty, 0] = True
+    probabilities = choice_probabilities(enemy_stats, player_stats, low_hp, repeat_mask,
+                                         temperature, penalty, enemy_mask, player_mask)
+    uniforms = np.array([enemy.rng.random() if not empty[b] else 0.0
+                         for b, enemy in enumerate(enemies)])
+    indices = sample(probabilities, uniforms)
+
+    chosen = []
+    for b, enemy in enumerate(enemies):
+        if empty[b]:
+            chosen.append(None)
+            continue
+        card = enemy.deck.hand[indices[b]]
+        enemy.last_played_card = card
+        chosen.append(card)
+    return chosen